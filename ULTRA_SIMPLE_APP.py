@@ -1,20 +1,47 @@
 import gradio as gr
 import subprocess
 import os
+import stat
+import time
+import uuid
 from pathlib import Path
-from datetime import datetime
 
 # Fixed paths for reliability
 OUTPUT_DIR = Path("outputs")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Finished files stay long enough for the UI to serve them, then get reaped
+OUTPUT_MAX_FILES = int(os.getenv("OUTPUT_MAX_FILES", "200"))
+OUTPUT_MAX_AGE_SECONDS = int(os.getenv("OUTPUT_MAX_AGE_SECONDS", "3600"))
+
+VIDEO_SIZE = "1080x1920"
+VIDEO_FPS = 30
+KEYFRAME_SECONDS = 10  # The picture never changes, so keyframes are only there for seeking
+
+def reap_outputs():
+    """Delete outputs past the age limit, then the oldest ones past the file cap"""
+    files = []
+    for f in OUTPUT_DIR.iterdir():
+        try:
+            info = f.stat()
+        except FileNotFoundError:
+            continue  # Reaped by a concurrent request
+        if stat.S_ISREG(info.st_mode):
+            files.append((info.st_mtime, f))
+    files.sort(reverse=True)
+
+    now = time.time()
+    for index, (mtime, f) in enumerate(files):
+        if index >= OUTPUT_MAX_FILES or now - mtime > OUTPUT_MAX_AGE_SECONDS:
+            f.unlink(missing_ok=True)
+
 def analyze_verse_for_script(verse_text: str):
     """Returns consistent-length script to prevent audio duration variance"""
     return f"HOOK: {verse_text} inspires! VERSE: {verse_text}. MEANING: Divine love. APPLICATION: Reflect today. CTA: Share! #Bible"
 
-def generate_audio(text: str) -> str:
+def generate_audio(text: str, request_id: str) -> str:
     """Generates sync-safe WAV audio with consistent sample rate"""
-    audio_path = OUTPUT_DIR / f"audio_{datetime.now().timestamp()}.wav"
+    audio_path = OUTPUT_DIR / f"audio_{request_id}.wav"
     
     # Use espeak for deterministic audio length (or edge-tts if preferred)
     subprocess.run([
@@ -36,12 +63,27 @@ def generate_audio(text: str) -> str:
         "-y",
         str(normalized_path)
     ], check=True)
+    audio_path.unlink(missing_ok=True)
     
     return str(normalized_path)
 
-def render_video(audio_path: str, script: str) -> str:
-    """Generates perfectly synced video using frame-exact FFmpeg"""
-    video_path = OUTPUT_DIR / f"video_{datetime.now().timestamp()}.mp4"
+def render_text_card(script: str, request_id: str) -> Path:
+    """Rasterizes the text-on-black frame once"""
+    card_path = OUTPUT_DIR / f"card_{request_id}.png"
+    subprocess.run([
+        "ffmpeg",
+        "-f", "lavfi",
+        "-i", f"color=color=black:size={VIDEO_SIZE}",
+        "-vf", f"drawtext=text='{script}':fontsize=40:x=(w-text_w)/2:y=(h-text_h)/2:fontcolor=white",
+        "-frames:v", "1",
+        "-y",
+        str(card_path)
+    ], check=True)
+    return card_path
+
+def render_video(audio_path: str, script: str, request_id: str) -> str:
+    """Generates perfectly synced video from a single looped still frame"""
+    video_path = OUTPUT_DIR / f"video_{request_id}.mp4"
     
     # 1. Get EXACT audio duration
     duration = float(subprocess.check_output([
@@ -52,29 +94,40 @@ def render_video(audio_path: str, script: str) -> str:
         "-of", "csv=p=0"
     ]).decode().strip())
     
-    # 2. Generate video (1080x1920 @ 30fps)
-    subprocess.run([
-        "ffmpeg",
-        "-f", "lavfi",
-        "-i", f"color=color=black:size=1080x1920:duration={duration}",
-        "-i", audio_path,
-        "-vf", f"drawtext=text='{script}':fontsize=40:x=(w-text_w)/2:y=(h-text_h)/2:fontcolor=white",
-        "-c:v", "libx264",
-        "-preset", "fast",
-        "-r", "30",
-        "-c:a", "copy",
-        "-shortest",
-        "-y",
-        str(video_path)
-    ], check=True)
+    # 2. Draw the text once instead of on every frame
+    card_path = render_text_card(script, request_id)
+    
+    # 3. Loop the still frame (1080x1920 @ 30fps); repeated frames encode as near-free skip blocks
+    try:
+        subprocess.run([
+            "ffmpeg",
+            "-loop", "1",
+            "-framerate", str(VIDEO_FPS),
+            "-t", str(duration),
+            "-i", str(card_path),
+            "-i", audio_path,
+            "-c:v", "libx264",
+            "-preset", "ultrafast",
+            "-tune", "stillimage",
+            "-g", str(VIDEO_FPS * KEYFRAME_SECONDS),
+            "-pix_fmt", "yuv420p",
+            "-c:a", "copy",
+            "-shortest",
+            "-y",
+            str(video_path)
+        ], check=True)
+    finally:
+        card_path.unlink(missing_ok=True)
     
     return str(video_path)
 
 def process_verse(verse_text: str):
     """End-to-end sync-safe pipeline"""
+    reap_outputs()
+    request_id = uuid.uuid4().hex  # Concurrent requests never share a file name
     script = analyze_verse_for_script(verse_text)
-    audio_path = generate_audio(script)
-    video_path = render_video(audio_path, script)
+    audio_path = generate_audio(script, request_id)
+    video_path = render_video(audio_path, script, request_id)
     return script, audio_path, video_path
 
 # Bulletproof interface
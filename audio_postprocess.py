@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Audio Post-Process - Single-pass NumPy cleanup of synthesized narration
+Trims leading/trailing silence, normalizes loudness toward a target LUFS,
+applies fades and resamples while the PCM buffer is still in memory,
+then writes one final 16-bit mono WAV
+"""
+
+import argparse
+import json
+import os
+import sys
+import wave
+
+import numpy as np
+
+TARGET_LUFS = float(os.getenv("AUDIO_TARGET_LUFS", "-14"))
+SILENCE_THRESHOLD_DB = float(os.getenv("AUDIO_SILENCE_THRESHOLD_DB", "-50"))
+OUTPUT_SAMPLE_RATE = int(os.getenv("AUDIO_SAMPLE_RATE", "24000"))
+PEAK_CEILING_DB = -1.0
+FADE_IN_SECONDS = 0.5  # Same fade renderVideo.mjs used to apply during the final encode
+FADE_OUT_SECONDS = 0.5
+TRIM_FRAME_SECONDS = 0.01  # Silence detection resolution
+TRIM_PAD_SECONDS = 0.02  # Kept around speech so word onsets are not clipped
+
+# ITU-R BS.1770 K-weighting: high shelf + high pass
+_SHELF = (1681.974450955533, 3.999843853973347, 0.7071752369554196)  # f0, gain dB, Q
+_HIGH_PASS = (38.13547087602444, 0.5003270373238773)  # f0, Q
+
+
+def _db(value):
+    return 20 * float(np.log10(max(value, 1e-12)))
+
+
+def find_speech_bounds(samples, sample_rate, threshold_db=SILENCE_THRESHOLD_DB, detection="peak"):
+    """
+    Sample range [start, end) between the first and last frame above the threshold
+    Frames are TRIM_FRAME_SECONDS long; detection is "peak" or "rms"
+    """
+    frame = max(1, int(sample_rate * TRIM_FRAME_SECONDS))
+    count = len(samples) // frame
+    if count == 0:
+        return 0, len(samples)
+
+    frames = np.abs(samples[:count * frame]).reshape(count, frame)
+    level = frames.max(axis=1) if detection == "peak" else np.sqrt((frames ** 2).mean(axis=1))
+    loud = np.flatnonzero(level > 10 ** (threshold_db / 20))
+    if loud.size == 0:
+        return 0, len(samples)
+
+    pad = int(sample_rate * TRIM_PAD_SECONDS)
+    start = max(0, int(loud[0]) * frame - pad)
+    end = len(samples) if loud[-1] == count - 1 else min(len(samples), (int(loud[-1]) + 1) * frame + pad)
+    return start, end
+
+
+def _k_weighting_response(freqs, sample_rate):
+    """Magnitude response of the BS.1770 K-weighting filter at the given frequencies"""
+    z = np.exp(-1j * 2 * np.pi * freqs / sample_rate)  # z^-1
+
+    f0, gain, q = _SHELF
+    a = 10 ** (gain / 40)
+    w0 = 2 * np.pi * f0 / sample_rate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    shelf_b = (a * ((a + 1) + (a - 1) * cos_w0 + 2 * np.sqrt(a) * alpha),
+               -2 * a * ((a - 1) + (a + 1) * cos_w0),
+               a * ((a + 1) + (a - 1) * cos_w0 - 2 * np.sqrt(a) * alpha))
+    shelf_a = ((a + 1) - (a - 1) * cos_w0 + 2 * np.sqrt(a) * alpha,
+               2 * ((a - 1) - (a + 1) * cos_w0),
+               (a + 1) - (a - 1) * cos_w0 - 2 * np.sqrt(a) * alpha)
+
+    f0, q = _HIGH_PASS
+    w0 = 2 * np.pi * f0 / sample_rate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    pass_b = ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2)
+    pass_a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+
+    def biquad(b, a):
+        return (b[0] + b[1] * z + b[2] * z ** 2) / (a[0] + a[1] * z + a[2] * z ** 2)
+
+    return np.abs(biquad(shelf_b, shelf_a) * biquad(pass_b, pass_a))
+
+
+def integrated_loudness(samples, sample_rate):
+    """
+    Integrated loudness (LUFS) of a mono buffer per BS.1770: K-weighting applied
+    in the frequency domain, 400 ms blocks with 75% overlap, absolute and relative gates
+    """
+    block = int(0.4 * sample_rate)
+    hop = int(0.1 * sample_rate)
+    if len(samples) < block:
+        return None
+
+    spectrum = np.fft.rfft(samples)
+    spectrum *= _k_weighting_response(np.fft.rfftfreq(len(samples), 1 / sample_rate), sample_rate)
+    weighted = np.fft.irfft(spectrum, n=len(samples))
+
+    # Mean square of every block from one cumulative sum
+    energy = np.concatenate(([0.0], np.cumsum(weighted ** 2)))
+    starts = np.arange(0, len(samples) - block + 1, hop)
+    power = (energy[starts + block] - energy[starts]) / block
+
+    power = power[power > 10 ** ((-70 + 0.691) / 10)]  # Absolute gate: -70 LUFS
+    if power.size == 0:
+        return None
+    relative_gate = -0.691 + 10 * np.log10(power.mean()) - 10
+    power = power[power > 10 ** ((relative_gate + 0.691) / 10)]
+    return float(-0.691 + 10 * np.log10(power.mean()))
+
+
+def resample(samples, from_rate, to_rate):
+    """Band-limited resampling through the FFT"""
+    if from_rate == to_rate or len(samples) == 0:
+        return samples
+    length = int(round(len(samples) * to_rate / from_rate))
+    spectrum = np.fft.rfft(samples)
+    bins = length // 2 + 1
+    if bins <= len(spectrum):
+        spectrum = spectrum[:bins]
+    else:
+        spectrum = np.concatenate((spectrum, np.zeros(bins - len(spectrum), dtype=spectrum.dtype)))
+    return np.fft.irfft(spectrum, n=length) * (length / len(samples))
+
+
+def postprocess(samples, sample_rate, target_lufs=TARGET_LUFS, output_rate=OUTPUT_SAMPLE_RATE):
+    """
+    Trim, normalize, fade and resample a mono float buffer in one pass
+    Returns (samples, sample_rate, report)
+    """
+    samples = np.asarray(samples, dtype=np.float64).reshape(-1)
+    input_duration = len(samples) / sample_rate
+
+    start, end = find_speech_bounds(samples, sample_rate)
+    samples = samples[start:end]
+
+    loudness = integrated_loudness(samples, sample_rate)
+    gain_db = target_lufs - loudness if loudness is not None else 0.0
+    peak = float(np.abs(samples).max()) if len(samples) else 0.0
+    if peak > 0:
+        gain_db = min(gain_db, PEAK_CEILING_DB - _db(peak))  # Never push peaks past the ceiling
+    samples = samples * 10 ** (gain_db / 20)
+
+    envelope = np.ones(len(samples))
+    fade_in = min(len(samples), int(FADE_IN_SECONDS * sample_rate))
+    fade_out = min(len(samples), int(FADE_OUT_SECONDS * sample_rate))
+    envelope[:fade_in] *= np.linspace(0.0, 1.0, fade_in, endpoint=False)
+    envelope[len(samples) - fade_out:] *= np.linspace(1.0, 0.0, fade_out)
+    samples = resample(samples * envelope, sample_rate, output_rate)
+
+    return samples, output_rate, {
+        "trim_start": round(start / sample_rate, 3),
+        "trim_end": round(input_duration - end / sample_rate, 3),
+        "input_duration": round(input_duration, 3),
+        "duration": round(len(samples) / output_rate, 3),
+        "loudness_before": round(loudness, 2) if loudness is not None else None,
+        "gain_db": round(gain_db, 2),
+        "sample_rate": output_rate,
+        "fades": [FADE_IN_SECONDS, FADE_OUT_SECONDS]
+    }
+
+
+def read_wav(path):
+    """Mono float buffer and sample rate of a PCM or IEEE float WAV"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError(f"Not a WAV file: {path}")
+
+    offset = 12
+    fmt = None
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        size = int.from_bytes(data[offset + 4:offset + 8], "little")
+        body = data[offset + 8:offset + 8 + size]
+
+        if chunk_id == b"fmt ":
+            code = int.from_bytes(body[0:2], "little")
+            if code == 0xFFFE:  # WAVE_FORMAT_EXTENSIBLE: real format in the sub-format GUID
+                code = int.from_bytes(body[24:26], "little")
+            fmt = {
+                "code": code,
+                "channels": int.from_bytes(body[2:4], "little"),
+                "rate": int.from_bytes(body[4:8], "little"),
+                "bits": int.from_bytes(body[14:16], "little"),
+            }
+        elif chunk_id == b"data" and fmt:
+            if fmt["code"] == 3:
+                samples = np.frombuffer(body, dtype=np.float32 if fmt["bits"] == 32 else np.float64)
+            elif fmt["bits"] == 16:
+                samples = np.frombuffer(body[:len(body) // 2 * 2], dtype="<i2") / 32768.0
+            elif fmt["bits"] == 32:
+                samples = np.frombuffer(body[:len(body) // 4 * 4], dtype="<i4") / 2147483648.0
+            else:
+                raise ValueError(f"Unsupported WAV format: {fmt['bits']}-bit code {fmt['code']}")
+            samples = samples[:len(samples) // fmt["channels"] * fmt["channels"]]
+            return samples.reshape(-1, fmt["channels"]).mean(axis=1), fmt["rate"]
+
+        offset += 8 + size + (size % 2)
+
+    raise ValueError(f"WAV file has no audio data: {path}")
+
+
+def write_wav(path, samples, sample_rate):
+    """Write a mono float buffer as 16-bit PCM (write-then-rename)"""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    temp_path = path + ".tmp"
+    with wave.open(temp_path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+    os.replace(temp_path, path)
+
+
+def postprocess_to_file(samples, sample_rate, output_path):
+    """Post-process a buffer and write the final WAV; prints the report line the pipeline reads"""
+    samples, sample_rate, report = postprocess(samples, sample_rate)
+    write_wav(output_path, samples, sample_rate)
+    print(f"POSTPROCESS:{json.dumps(report)}", flush=True)
+    return sample_rate, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trim, normalize and fade a narration WAV")
+    parser.add_argument("--input", required=True)
+    parser.add_argument("--output", default=None, help="Defaults to overwriting the input")
+    args = parser.parse_args()
+
+    try:
+        samples, sample_rate = read_wav(args.input)
+        sample_rate, report = postprocess_to_file(samples, sample_rate, args.output or args.input)
+        print(f"SUCCESS:{sample_rate}:{report['duration']:.2f}")
+    except Exception as e:
+        print(f"ERROR:{str(e)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
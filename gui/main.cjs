@@ -176,41 +176,30 @@ function runScript(scriptName, args = []) {
 }
 
 // File Management Functions
+let artifactStore = null;
+
+async function getArtifactStore() {
+  // Manifest-backed view of output/ (shared with the pipeline)
+  if (!artifactStore) {
+    const { ArtifactStore } = await import('../utils/artifactStore.mjs');
+    artifactStore = new ArtifactStore(path.join(__dirname, '..'));
+  }
+  return artifactStore;
+}
+
 async function getStorageStats() {
   try {
-    const outputDir = path.join(__dirname, '..', 'output');
-    const files = fs.readdirSync(outputDir);
-    
-    let totalSize = 0;
-    let videoCount = 0;
-    let audioCount = 0;
-    let stockCount = 0;
-    let scriptCount = 0;
-    
-    for (const file of files) {
-      const filePath = path.join(outputDir, file);
-      const stats = fs.statSync(filePath);
-      totalSize += stats.size;
-      
-      if (file.startsWith('final_video_') && file.endsWith('.mp4')) {
-        videoCount++;
-      } else if (file.startsWith('narration_') && file.endsWith('.wav')) {
-        audioCount++;
-      } else if (file.startsWith('stock_') && file.endsWith('.mp4')) {
-        stockCount++;
-      } else if (file.startsWith('script_') && file.endsWith('.txt')) {
-        scriptCount++;
-      }
-    }
+    const store = await getArtifactStore();
+    const stats = await store.getStats();
     
     return {
       success: true,
-      totalSize: Math.round(totalSize / (1024 * 1024)), // MB
-      videoCount,
-      audioCount,
-      stockCount,
-      scriptCount,
-      totalFiles: files.length
+      totalSize: Math.round(stats.totalBytes / (1024 * 1024)), // MB
+      videoCount: stats.videoCount,
+      audioCount: stats.audioCount,
+      stockCount: stats.stockCount,
+      scriptCount: stats.scriptCount,
+      totalFiles: stats.totalFiles
     };
   } catch (error) {
     return { success: false, error: error.message };
@@ -291,6 +280,8 @@ async function organizeFilesByDate() {
       }
     }
     
+    await (await getArtifactStore()).reconcile();
+    
     return { success: true, movedCount };
   } catch (error) {
     return { success: false, error: error.message };
@@ -299,31 +290,11 @@ async function organizeFilesByDate() {
 
 async function cleanOldFiles() {
   try {
-    const outputDir = path.join(__dirname, '..', 'output');
-    const files = fs.readdirSync(outputDir);
-    
-    const threeDaysAgo = new Date();
-    threeDaysAgo.setDate(threeDaysAgo.getDate() - 3);
-    
-    let deletedCount = 0;
-    
-    for (const file of files) {
-      const filePath = path.join(outputDir, file);
-      const stats = fs.statSync(filePath);
-      
-      if (stats.isFile() && stats.birthtime < threeDaysAgo) {
-        // Keep at least 2 of each type
-        const prefix = file.split('_')[0];
-        const sameTypeFiles = files.filter(f => f.startsWith(prefix + '_'));
-        
-        if (sameTypeFiles.length > 2) {
-          await fs.promises.unlink(filePath);
-          deletedCount++;
-        }
-      }
-    }
+    // Least recently used artifacts go first; anything in the retry or ready queue is kept
+    const store = await getArtifactStore();
+    const { deletedCount, freedBytes } = await store.evict();
     
-    return { success: true, deletedCount };
+    return { success: true, deletedCount, freedMB: Math.round(freedBytes / (1024 * 1024)) };
   } catch (error) {
     return { success: false, error: error.message };
   }
@@ -350,6 +321,8 @@ async function archiveWeekFiles() {
       }
     }
     
+    await (await getArtifactStore()).reconcile();
+    
     return { success: true, archivedCount };
   } catch (error) {
     return { success: false, error: error.message };
@@ -358,7 +331,8 @@ async function archiveWeekFiles() {
 
 async function deleteFile(filePath) {
   try {
-    await fs.promises.unlink(filePath);
+    const store = await getArtifactStore();
+    await store.remove(filePath);
     return { success: true };
   } catch (error) {
     return { success: false, error: error.message };
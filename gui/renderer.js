@@ -377,18 +377,23 @@ async function loadStatisticsData() {
                     <span>Videos Generated:</span>
                     <span>${stats.videosGenerated}</span>
                 </div>
+                <div class="usage-stat">
+                    <span>Videos Possible:</span>
+                    <span>${stats.videosPossible ?? 'Unlimited'}</span>
+                </div>
                 <div class="usage-stat ${stats.canUsePixabay ? 'success' : 'warning'}">
                     <span>Status:</span>
                     <span>${stats.canUsePixabay ? 'Can use Pixabay' : 'Using existing videos'}</span>
                 </div>
             `;
             
-            document.getElementById('api-usage').innerHTML = `
-                <div class="usage-stat">
-                    <span>Pixabay Remaining:</span>
-                    <span>${stats.pixabayRemaining} calls</span>
-                </div>
-            `;
+            document.getElementById('api-usage').innerHTML = Object.values(stats.quotas)
+                .map(quota => `
+                <div class="usage-stat ${quota.remaining > 0 ? 'success' : 'warning'}">
+                    <span>${quota.label}:</span>
+                    <span>${quota.remaining}/${quota.limit} left</span>
+                </div>`)
+                .join('');
         } else {
             document.getElementById('daily-usage').textContent = `Error: ${result.error}`;
         }
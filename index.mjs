@@ -5,7 +5,9 @@ import { generateScript } from "./tasks/generateScript.mjs";
 import { checkAndRefreshScripts } from "./script_refresher.mjs";
 import { generateVoice } from "./tasks/generateVoice.mjs";
 import { generateAssets } from "./tasks/generateAssets.mjs";
-import { renderVideo } from "./render/renderVideo.mjs";
+import { renderVideo, validateVideoOutput } from "./render/renderVideo.mjs";
+import { createIncrementalRenderer } from "./render/incrementalRender.mjs";
+import { createVerseOverlay } from "./render/textOverlay.mjs";
 import { uploadToYouTube } from "./tasks/uploadVideo.mjs";
 import { 
   detectMissedUploads, 
@@ -13,6 +15,11 @@ import {
   addToRetryQueue,
   cleanupOldRetries 
 } from "./systems/uploadRecovery.mjs";
+import { fillReadyQueue, takeReadyVideo, getReadyQueueStatus, showReadyQueueStats } from "./systems/renderAhead.mjs";
+import { enforceDiskBudget, reconcileArtifacts, getArtifactStats } from "./utils/artifactStore.mjs";
+import { planDay, logPlan, getQuotaStatus, getUsageHistory, flushQuotas, quotaBudgetName } from "./utils/quotaService.mjs";
+import { loadChannels } from "./utils/channels.mjs";
+import { planChannels, FairShareScheduler } from "./systems/channelScheduler.mjs";
 import fs from 'fs-extra';
 import path from 'path';
 import dotenv from "dotenv";
@@ -27,6 +34,7 @@ const CONFIG = {
   dryRun: process.argv.includes('--dry-run'),
   singleVideo: process.argv.includes('--single'),
   skipUpload: process.argv.includes('--skip-upload'),
+  incrementalRender: process.argv.includes('--incremental') || process.env.INCREMENTAL_RENDER === 'true',
   verbose: process.argv.includes('--verbose')
 };
 
@@ -83,37 +91,22 @@ export async function runPipelineCore() {
     console.log('📋 Checking script supply...');
     await checkAndRefreshScripts();
     
-    // Determine how many videos to create
-    const videoCount = CONFIG.singleVideo ? 1 : CONFIG.dailyVideoCount;
+    // Determine how many videos to create, then trim to what the remaining API quotas allow
+    const requestedCount = CONFIG.singleVideo ? 1 : CONFIG.dailyVideoCount;
+    const uploading = !CONFIG.skipUpload && !CONFIG.dryRun;
     
-    console.log(`🎬 Creating ${videoCount} video(s)...`);
+    const plan = await planDay(requestedCount, {
+      upload: uploading,
+      stockAvailable: (await getArtifactStats()).stockCount,
+      readyVideos: uploading ? (await getReadyQueueStatus()).ready : 0
+    });
+    logPlan(plan);
     
-    for (let i = 0; i < videoCount; i++) {
-      console.log(`\n📹 === VIDEO ${i + 1} OF ${videoCount} ===`);
-      
-      try {
-        await createSingleVideo(i + 1);
-        pipelineStats.successfulUploads++;
-      } catch (error) {
-        console.error(`❌ Video ${i + 1} failed:`, error.message);
-        pipelineStats.errors.push({
-          videoNumber: i + 1,
-          error: error.message,
-          timestamp: new Date()
-        });
-        
-        // Continue with next video unless it's a critical error
-        if (error.message.includes('CRITICAL')) {
-          throw error;
-        }
-      }
-      
-      // Small delay between videos to respect API limits
-      if (i < videoCount - 1) {
-        console.log('⏳ Waiting 30 seconds before next video...');
-        await sleep(30000);
-      }
-    }
+    await runVideoJobs(plan.videos);
+    
+    // Keep output/ within the disk budget (queued videos are never evicted)
+    await enforceDiskBudget();
+    await flushQuotas();
     
     // Pipeline completed
     pipelineStats.endTime = new Date();
@@ -127,38 +120,64 @@ export async function runPipelineCore() {
   }
 }
 
-async function createSingleVideo(videoNumber) {
-  const videoStartTime = new Date();
-  console.log(`⏰ Video ${videoNumber} started at ${videoStartTime.toLocaleTimeString()}`);
+/**
+ * Create planned videos one after another
+ * @param {Array} jobs - Planned videos (see planDay), with a channel in multi-channel mode
+ */
+async function runVideoJobs(jobs) {
+  const videoCount = jobs.length;
+  console.log(`🎬 Creating ${videoCount} video(s)...`);
   
-  try {
-    // Step 1: Generate script (using local database - no planning needed)
-    console.log('✍️ Step 1: Generating script...');
-    const scriptData = await generateScript(); // No contentIdea needed - using local scripts
+  for (let i = 0; i < videoCount; i++) {
+    const channel = jobs[i].channel;
+    console.log(`\n📹 === VIDEO ${i + 1} OF ${videoCount}${channel ? ` (${channel.name})` : ''} ===`);
     
-    if (CONFIG.verbose) {
-      console.log('📝 Script preview:', scriptData.script.substring(0, 100) + '...');
+    try {
+      await createSingleVideo(i + 1, jobs[i]);
+      pipelineStats.successfulUploads++;
+    } catch (error) {
+      console.error(`❌ Video ${i + 1} failed:`, error.message);
+      pipelineStats.errors.push({
+        videoNumber: i + 1,
+        channelId: channel?.id,
+        error: error.message,
+        timestamp: new Date()
+      });
+      
+      // Continue with next video unless it's a critical error
+      if (error.message.includes('CRITICAL')) {
+        throw error;
+      }
     }
     
-    // Step 2: Generate voice narration
-    console.log('🔊 Step 2: Generating voice narration...');
-    const voiceData = await generateVoice(scriptData);
-    
-    if (CONFIG.verbose) {
-      console.log('🎤 Voice file:', voiceData.audioPath);
+    // Small delay between videos to respect API limits
+    if (i < videoCount - 1) {
+      console.log('⏳ Waiting 30 seconds before next video...');
+      await sleep(30000);
     }
+  }
+}
+
+/**
+ * @param {Object} job - Planned footage/voice for this video (see planDay), plus its channel in multi-channel mode
+ */
+async function createSingleVideo(videoNumber, job = {}) {
+  const videoStartTime = new Date();
+  const { channel = null } = job;
+  const logsDir = channel?.logsDir || './logs';
+  console.log(`⏰ Video ${videoNumber} started at ${videoStartTime.toLocaleTimeString()}`);
+  
+  try {
+    // Upload slots take a pre-rendered video from the render-ahead buffer when one is ready
+    // (the buffer is rendered from the default inventory, so other channels always produce their own)
+    const useReadyQueue = !CONFIG.skipUpload && !CONFIG.dryRun && (!channel || channel.isDefault);
+    const readyVideo = useReadyQueue ? await takeReadyVideo() : null;
     
-    // Step 3: Get stock footage
-    console.log('🎬 Step 3: Downloading stock footage...');
-    const assetData = await generateAssets(scriptData.verse, scriptData);
-    
-    if (CONFIG.verbose) {
-      console.log('🎥 Video file:', assetData.videoPath);
+    if (readyVideo) {
+      console.log(`📦 Using pre-rendered video from ${new Date(readyVideo.renderedAt).toLocaleString()}`);
     }
     
-    // Step 4: Render final video
-    console.log('🎥 Step 4: Rendering final video...');
-    const videoResult = await renderVideo(scriptData, voiceData, assetData);
+    const { scriptData, voiceData, assetData, videoResult } = readyVideo || await produceVideo(job);
     
     console.log('✅ Video rendered:', videoResult.videoPath);
     console.log('📊 File size:', videoResult.fileSize);
@@ -168,7 +187,7 @@ async function createSingleVideo(videoNumber) {
       console.log('📤 Step 5: Uploading to YouTube...');
       
       try {
-        const uploadResult = await uploadToYouTube(videoResult, scriptData.verse, scriptData);
+        const uploadResult = await uploadToYouTube(videoResult, scriptData.verse, scriptData, { channel });
         
         console.log('🎉 Upload successful!');
         console.log('🔗 YouTube URL:', uploadResult.videoUrl);
@@ -181,7 +200,7 @@ async function createSingleVideo(videoNumber) {
           videoResult,
           uploadResult,
           processingTime: new Date() - videoStartTime
-        });
+        }, logsDir);
         
       } catch (uploadError) {
         console.error('❌ Upload failed:', uploadError.message);
@@ -189,6 +208,7 @@ async function createSingleVideo(videoNumber) {
         // Add to retry queue for later processing
         await addToRetryQueue({
           videoNumber,
+          channelId: channel?.id,
           scriptData,
           voiceData,
           assetData,
@@ -218,7 +238,7 @@ async function createSingleVideo(videoNumber) {
         assetData,
         videoResult,
         processingTime: new Date() - videoStartTime
-      });
+      }, logsDir);
     }
     
     const videoEndTime = new Date();
@@ -233,6 +253,85 @@ async function createSingleVideo(videoNumber) {
   }
 }
 
+/**
+ * Steps 1-4: script, narration, footage and render for one video
+ */
+async function produceVideo(job = {}) {
+  // Step 1: Generate script (using local database - no planning needed)
+  console.log('✍️ Step 1: Generating script...');
+  const scriptData = await generateScript(undefined, { channel: job.channel }); // No contentIdea needed - using local scripts
+  
+  if (CONFIG.verbose) {
+    console.log('📝 Script preview:', scriptData.script.substring(0, 100) + '...');
+  }
+  
+  let voiceData, assetData, videoResult;
+  
+  // Rasterize the verse overlay alongside narration and footage download
+  const overlayPromise = createVerseOverlay(scriptData.verse);
+  
+  if (CONFIG.incrementalRender) {
+    // Footage first, so video segments can be encoded while narration chunks are synthesized
+    ({ voiceData, assetData, videoResult } = await createVoiceAndVideoIncrementally(scriptData, job, overlayPromise));
+  } else {
+    // Step 2: Generate voice narration
+    console.log('🔊 Step 2: Generating voice narration...');
+    voiceData = await generateVoice(scriptData, { voice: job.voice });
+    
+    if (CONFIG.verbose) {
+      console.log('🎤 Voice file:', voiceData.audioPath);
+    }
+    
+    // Step 3: Get stock footage
+    console.log('🎬 Step 3: Downloading stock footage...');
+    assetData = await generateAssets(scriptData.verse, scriptData, { footage: job.footage });
+    
+    if (CONFIG.verbose) {
+      console.log('🎥 Video file:', assetData.videoPath);
+    }
+    
+    // Step 4: Render final video
+    console.log('🎥 Step 4: Rendering final video...');
+    videoResult = await renderVideo(scriptData, voiceData, assetData, { overlay: await overlayPromise });
+  }
+  
+  return { scriptData, voiceData, assetData, videoResult };
+}
+
+async function createVoiceAndVideoIncrementally(scriptData, job = {}, overlayPromise = null) {
+  console.log('🎬 Step 2: Downloading stock footage...');
+  const assetData = await generateAssets(scriptData.verse, scriptData, { footage: job.footage });
+  
+  if (CONFIG.verbose) {
+    console.log('🎥 Video file:', assetData.videoPath);
+  }
+  
+  console.log('🔊 Step 3: Generating voice narration with incremental render...');
+  const overlay = await overlayPromise;
+  const renderer = await createIncrementalRenderer(scriptData, assetData, { overlay });
+  const voiceData = await generateVoice(scriptData, {
+    voice: job.voice,
+    onChunk: (chunk) => renderer.addChunk(chunk)
+  });
+  
+  console.log('🎥 Step 4: Finishing incremental render...');
+  let videoResult = null;
+  try {
+    videoResult = await renderer.finish(voiceData);
+  } catch (error) {
+    console.log('⚠️  Incremental render failed:', error.message);
+    await renderer.abort();
+  }
+  
+  // Voice methods without chunk output (HTTP, ElevenLabs, placeholder) render the usual way
+  if (!videoResult) {
+    console.log('🎥 Rendering final video from full narration...');
+    videoResult = await renderVideo(scriptData, voiceData, assetData, { overlay });
+  }
+  
+  return { voiceData, assetData, videoResult };
+}
+
 async function setupDirectories() {
   const dirs = [
     CONFIG.outputDir,
@@ -248,19 +347,19 @@ async function setupDirectories() {
   console.log('📁 Directories setup complete');
 }
 
-async function saveUploadRecord(videoNumber, data) {
+async function saveUploadRecord(videoNumber, data, logsDir = './logs') {
   const record = {
     videoNumber,
     timestamp: new Date().toISOString(),
     ...data
   };
   
-  const logPath = path.join('./logs', `upload_${Date.now()}.json`);
+  const logPath = path.join(logsDir, `upload_${Date.now()}.json`);
   await fs.writeJson(logPath, record, { spaces: 2 });
   
   // Also append to daily log
   const today = new Date().toISOString().split('T')[0];
-  const dailyLogPath = path.join('./logs', `daily_${today}.json`);
+  const dailyLogPath = path.join(logsDir, `daily_${today}.json`);
   
   let dailyLog = [];
   if (await fs.pathExists(dailyLogPath)) {
@@ -271,7 +370,7 @@ async function saveUploadRecord(videoNumber, data) {
   await fs.writeJson(dailyLogPath, dailyLog, { spaces: 2 });
 }
 
-async function saveLocalRecord(videoNumber, data) {
+async function saveLocalRecord(videoNumber, data, logsDir = './logs') {
   const record = {
     videoNumber,
     timestamp: new Date().toISOString(),
@@ -279,7 +378,7 @@ async function saveLocalRecord(videoNumber, data) {
     ...data
   };
   
-  const logPath = path.join('./logs', `local_${Date.now()}.json`);
+  const logPath = path.join(logsDir, `local_${Date.now()}.json`);
   await fs.writeJson(logPath, record, { spaces: 2 });
 }
 
@@ -342,11 +441,95 @@ async function handleCLI() {
     case 'stats':
       await showStats();
       break;
+    case 'render-ahead':
+      await runRenderAhead();
+      break;
+    case 'channels':
+      await runChannels();
+      break;
     default:
       await runPipeline();
   }
 }
 
+async function runRenderAhead() {
+  console.log('📦 Render-ahead producer starting...');
+  await setupDirectories();
+  
+  // --now renders regardless of the off-peak window; --loop keeps the producer running in the background
+  const options = { ignoreWindow: process.argv.includes('--now') };
+  const loop = process.argv.includes('--loop');
+  const intervalMs = (parseInt(process.env.RENDER_AHEAD_INTERVAL_MINUTES) || 15) * 60 * 1000;
+  
+  do {
+    try {
+      await checkAndRefreshScripts();
+      const produced = await fillReadyQueue(produceVideo, validateVideoOutput, options);
+      console.log(`📦 Rendered ${produced} video(s) ahead`);
+    } catch (error) {
+      console.error('❌ Render-ahead failed:', error.message);
+    }
+    
+    await showReadyQueueStats();
+    
+    if (loop) {
+      await sleep(intervalMs);
+    }
+  } while (loop);
+}
+
+/**
+ * Multi-channel run: every channel in channels.json gets its own inventory, credentials,
+ * logs and YouTube quota, while one production lane (TTS pool, footage library,
+ * narration cache, renderer) serves them in fair-share order
+ */
+async function runChannels() {
+  console.log('📺 Multi-channel pipeline starting...');
+  
+  try {
+    await setupDirectories();
+    const channels = await loadChannels();
+    
+    for (const channel of channels) {
+      await fs.ensureDir(path.dirname(channel.scriptsFile));
+      await fs.ensureDir(channel.authDir);
+      await fs.ensureDir(channel.logsDir);
+      await checkAndRefreshScripts(channel);
+    }
+    
+    const uploading = !CONFIG.skipUpload && !CONFIG.dryRun;
+    const plans = await planChannels(channels, {
+      upload: uploading,
+      stockAvailable: (await getArtifactStats()).stockCount
+    });
+    
+    for (const { channel, plan } of plans) {
+      console.log(`\n📺 ${channel.name}:`);
+      logPlan(plan);
+    }
+    
+    const scheduler = new FairShareScheduler(plans);
+    const jobs = [];
+    for (let next = scheduler.next(); next; next = scheduler.next()) {
+      jobs.push({ ...next.job, channel: next.channel });
+    }
+    
+    await runVideoJobs(jobs);
+    
+    await enforceDiskBudget();
+    await flushQuotas();
+    
+    pipelineStats.endTime = new Date();
+    await logPipelineResults();
+    
+  } catch (error) {
+    console.error('💥 Multi-channel pipeline failed:', error);
+    pipelineStats.endTime = new Date();
+    await logPipelineResults();
+    process.exit(1);
+  }
+}
+
 async function testPipeline() {
   console.log('🧪 Testing pipeline components...');
   
@@ -374,6 +557,8 @@ async function cleanupFiles() {
     }
   }
   
+  await reconcileArtifacts();
+  
   console.log('🧹 Cleanup complete');
 }
 
@@ -397,6 +582,24 @@ async function showStats() {
     const date = logFile.replace('daily_', '').replace('.json', '');
     console.log(`📅 ${date}: ${logData.length} video(s) created`);
   }
+  
+  // Register per-channel YouTube budgets so they show up next to the shared ones
+  if (await fs.pathExists(process.env.CHANNELS_FILE || 'channels.json')) {
+    for (const channel of await loadChannels()) {
+      quotaBudgetName('youtube_units', channel);
+    }
+  }
+  
+  console.log('🎟️  API quotas:');
+  for (const quota of Object.values(await getQuotaStatus())) {
+    console.log(`   ${quota.label}: ${quota.used}/${quota.limit} used`);
+  }
+  
+  const history = await getUsageHistory();
+  for (const day of Object.keys(history).sort().slice(-7)) {
+    const totals = Object.entries(history[day]).map(([budget, amount]) => `${budget} ${amount}`).join(', ');
+    console.log(`📊 ${day} API usage: ${totals}`);
+  }
 }
 
 // CRON schedule suggestion (add to your system crontab):
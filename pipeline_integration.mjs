@@ -3,12 +3,54 @@
 
 import fs from 'fs-extra';
 import path from 'path';
+import { spawn } from 'child_process';
+import { channelEnv } from './utils/channels.mjs';
 
 const SCRIPTS_FILE = path.join(process.cwd(), 'data', 'bible_scripts.json');
 
+// The rotation schedule is planned by script_manager.py; top it up when this few slots remain
+const SCHEDULE_REFILL_THRESHOLD = 15;
+
+// script_service.py keeps the inventory in memory; the file is only read directly when it is not running
+const SCRIPT_SERVICE_URL = `http://127.0.0.1:${process.env.SCRIPT_SERVICE_PORT || 8765}`;
+const SCRIPT_SERVICE_TIMEOUT_MS = 2000;
+
 export class ScriptManager {
-  constructor() {
-    this.scriptsFile = SCRIPTS_FILE;
+  /**
+   * @param {Object} options - scriptsFile (another channel's inventory) and env for the Python helpers
+   */
+  constructor({ scriptsFile = SCRIPTS_FILE, env = {} } = {}) {
+    this.scriptsFile = scriptsFile;
+    this.env = env;
+  }
+  
+  /**
+   * Manager for a channel's own inventory (the default inventory without a channel)
+   */
+  static forChannel(channel) {
+    return channel ? new ScriptManager({ scriptsFile: channel.scriptsFile, env: channelEnv(channel) }) : new ScriptManager();
+  }
+  
+  /**
+   * JSON response from the script service, or null if it is not reachable
+   */
+  async serviceRequest(method, endpoint, body = null) {
+    // The service only holds the default inventory
+    if (path.resolve(this.scriptsFile) !== SCRIPTS_FILE) {
+      return null;
+    }
+    
+    try {
+      const response = await fetch(SCRIPT_SERVICE_URL + endpoint, {
+        method,
+        headers: { 'Content-Type': 'application/json' },
+        body: body ? JSON.stringify(body) : undefined,
+        signal: AbortSignal.timeout(SCRIPT_SERVICE_TIMEOUT_MS)
+      });
+      return response.ok ? await response.json() : null;
+    } catch {
+      return null;
+    }
   }
   
   async loadScripts() {
@@ -37,36 +79,117 @@ export class ScriptManager {
   }
   
   async getNextScript(markUsed = true) {
-    const data = await this.loadScripts();
-    const unusedScripts = data.scripts.filter(s => !s.used);
+    const claimed = await this.serviceRequest('POST', '/claim', { mark_used: markUsed });
+    if (claimed) {
+      if (markUsed) {
+        await this.checkScriptSupply(claimed.stats);
+      }
+      return claimed.script;
+    }
     
-    if (unusedScripts.length === 0) {
-      return null;
+    let data = await this.loadScripts();
+    
+    if (!data.rotation?.upcoming?.length) {
+      await this.refreshSchedule();
+      data = await this.loadScripts();
     }
     
-    // Get random unused script for variety
-    const randomIndex = Math.floor(Math.random() * unusedScripts.length);
-    const script = unusedScripts[randomIndex];
+    const byId = new Map(data.scripts.map(s => [s.id, s]));
+    const upcoming = data.rotation?.upcoming || [];
+    
+    // Next planned slot whose script is still unused (stale entries are dropped)
+    let script = null;
+    while (upcoming.length > 0 && !script) {
+      const candidate = byId.get(upcoming[0].id);
+      if (candidate && !candidate.used) {
+        script = candidate;
+      } else {
+        upcoming.shift();
+      }
+    }
+    
+    if (!script) {
+      // No schedule available (Python unavailable) - fall back to any unused script
+      const unusedScripts = data.scripts.filter(s => !s.used);
+      if (unusedScripts.length === 0) {
+        return null;
+      }
+      script = unusedScripts[Math.floor(Math.random() * unusedScripts.length)];
+    }
     
     if (markUsed) {
+      if (upcoming[0]?.id === script.id) {
+        upcoming.shift();
+      }
+      
       // Mark as used and add usage count
-      const scriptIndex = data.scripts.findIndex(s => s.id === script.id);
-      if (scriptIndex !== -1) {
-        data.scripts[scriptIndex].used = true;
-        data.scripts[scriptIndex].used_at = new Date().toISOString();
-        data.scripts[scriptIndex].usage_count = (data.scripts[scriptIndex].usage_count || 0) + 1;
-        await this.saveScripts(data);
-        
-        // Check if we need to alert about low script count
-        await this.checkScriptSupply();
+      script.used = true;
+      script.used_at = new Date().toISOString();
+      script.usage_count = (script.usage_count || 0) + 1;
+      await this.saveScripts(data);
+      
+      if (upcoming.length < SCHEDULE_REFILL_THRESHOLD) {
+        await this.refreshSchedule();
       }
+      
+      // Check if we need to alert about low script count
+      await this.checkScriptSupply();
     }
     
     return script;
   }
   
-  async checkScriptSupply() {
-    const stats = await this.getScriptStats();
+  /**
+   * Upcoming scripts in publishing order, straight from the rotation schedule
+   */
+  async previewNextScripts(count = 5) {
+    const preview = await this.serviceRequest('GET', `/preview?count=${count}`);
+    if (preview) {
+      return preview.upcoming;
+    }
+    
+    const data = await this.loadScripts();
+    const byId = new Map(data.scripts.map(s => [s.id, s]));
+    
+    return (data.rotation?.upcoming || [])
+      .filter(entry => byId.has(entry.id) && !byId.get(entry.id).used)
+      .slice(0, count)
+      .map(entry => ({ ...entry, script: byId.get(entry.id) }));
+  }
+  
+  /**
+   * Ask script_manager.py to extend the rotation schedule
+   */
+  refreshSchedule() {
+    return new Promise((resolve) => {
+      const pythonCmd = process.platform === 'win32' ? 'python' : 'python3';
+      const child = spawn(pythonCmd, ['script_manager.py', 'schedule'], {
+        cwd: process.cwd(),
+        env: { ...process.env, ...this.env },
+        stdio: ['ignore', 'pipe', 'pipe']
+      });
+      
+      let errorOutput = '';
+      child.stderr.on('data', (data) => {
+        errorOutput += data.toString();
+      });
+      
+      child.on('close', (code) => {
+        if (code !== 0) {
+          console.warn(`⚠️  Could not refresh rotation schedule: ${errorOutput.trim() || 'exit code ' + code}`);
+        }
+        resolve(code === 0);
+      });
+      
+      child.on('error', (error) => {
+        console.warn('⚠️  Could not refresh rotation schedule:', error.message);
+        resolve(false);
+      });
+    });
+  }
+  
+  async checkScriptSupply(stats = null) {
+    stats = stats || await this.getScriptStats();
     const LOW_SCRIPT_THRESHOLD = 20;
     const CRITICAL_SCRIPT_THRESHOLD = 10;
     
@@ -84,6 +207,11 @@ export class ScriptManager {
   }
   
   async getScriptStats() {
+    const serviceStats = await this.serviceRequest('GET', '/stats');
+    if (serviceStats) {
+      return serviceStats;
+    }
+    
     const data = await this.loadScripts();
     const total = data.scripts.length;
     const used = data.scripts.filter(s => s.used).length;
@@ -154,7 +282,7 @@ CTA: Share your testimony! #Bible #Faith #Trust #Inspiration`;
   }
   
   console.log(`✅ Retrieved script from local database (${stats.unused - 1} remaining)`);
-  return scriptData.script;
+  return scriptData.speech?.text || scriptData.script;
 }
 
 export async function checkScriptSupply() {
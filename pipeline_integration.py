@@ -11,19 +11,21 @@ from pathlib import Path
 # Add current directory to path for imports
 sys.path.append(str(Path(__file__).parent))
 
-from script_manager import get_script_for_pipeline, check_script_supply
+from script_client import claim_script
+from script_manager import check_script_supply, speech_text_for
 
 def analyze_verse_for_script(verse_text: str = ""):
     """
     Drop-in replacement for HuggingFace Space function
     Returns pre-generated script instead of calling API
     """
-    # Check script supply first
-    if not check_script_supply():
+    # One round trip (or one local load) returns the script and the supply stats
+    result = claim_script()
+    
+    if not check_script_supply(result["stats"]):
         print("⚠️  Warning: Low script supply! Generate more scripts soon.")
     
-    # Get pre-generated script
-    script = get_script_for_pipeline()
+    script = speech_text_for(result["script"])
     
     print(f"✅ Retrieved script from local database")
     return script
@@ -0,0 +1,210 @@
+// 🎞️ Incremental Video Renderer
+// Encodes one video-only segment per narration chunk while TTS is still running,
+// then joins the segments with the concat demuxer (no video re-encode) and encodes one audio track
+// from the final narration, so per-segment AAC priming and frame rounding never add up to drift
+
+import { exec } from 'child_process';
+import { promisify } from 'util';
+import fs from 'fs-extra';
+import path from 'path';
+import { getAudioDuration, getWavInfo } from '../utils/audioUtils.mjs';
+import { getFFmpegPath } from './renderVideo.mjs';
+import { logStyleUsage } from './visualEffects.mjs';
+import { createVerseOverlay, buildOverlayFilter } from './textOverlay.mjs';
+import { registerArtifact } from '../utils/artifactStore.mjs';
+
+const execAsync = promisify(exec);
+
+// Same timings as renderVideo: 0.5s fades and a 1.5s tail after the narration
+const FADE_DURATION = 0.5;
+const END_BUFFER = 1.5;
+const FPS = 30;
+
+/**
+ * Renders segments in chunk order as their audio becomes available
+ */
+export class IncrementalRenderer {
+  constructor({ ffmpegPath, videoPath, overlayPath = null, stockDuration, verse, style }) {
+    this.ffmpegPath = ffmpegPath;
+    this.videoPath = videoPath;
+    this.overlayPath = overlayPath;
+    this.stockDuration = stockDuration;
+    this.verse = verse;
+    this.style = style;
+
+    const timestamp = Date.now();
+    this.outputPath = path.join('./output', `bible_short_${timestamp}.mp4`);
+    this.segmentDir = path.join('./temp', `segments_${timestamp}`);
+
+    this.pendingChunks = new Map();
+    this.segments = [];
+    this.nextIndex = 0;
+    this.totalChunks = null;
+    this.elapsed = 0; // Narration seconds already rendered, also the stock clip offset
+    this.framesRendered = 0;
+    this.queue = Promise.resolve();
+    this.startTime = Date.now();
+  }
+
+  /**
+   * Register a finished narration chunk. Resolves once every chunk up to it (but the last) is encoded.
+   */
+  addChunk({ index, audioPath, total }) {
+    this.pendingChunks.set(index, audioPath);
+    this.totalChunks = total;
+    this.queue = this.queue.then(() => this.renderReadySegments());
+    return this.queue;
+  }
+
+  async renderReadySegments() {
+    await fs.ensureDir(this.segmentDir);
+
+    // The last segment waits for finish(): its fade and tail depend on the final narration length
+    while (this.pendingChunks.has(this.nextIndex) && this.nextIndex !== this.totalChunks - 1) {
+      const index = this.nextIndex;
+      const audioPath = this.pendingChunks.get(index);
+      this.pendingChunks.delete(index);
+
+      // Exact sample count of the chunk rather than a probed duration
+      const { duration } = await getWavInfo(audioPath);
+      await this.renderSegment(index, duration);
+      this.nextIndex++;
+    }
+  }
+
+  /**
+   * @param {number} duration - Seconds of the narration timeline this segment covers
+   * @param {number|null} narrationEnd - Last segment only: where the narration ends, relative to the segment start
+   */
+  async renderSegment(index, duration, narrationEnd = null) {
+    const isFirst = index === 0;
+    const isLast = narrationEnd !== null;
+
+    // Continue the looped stock clip exactly where the previous segment stopped
+    const stockOffset = this.stockDuration > 0 ? this.elapsed % this.stockDuration : 0;
+
+    // Whole frames up to this chunk's end on the narration timeline, so rounding never accumulates
+    const frames = Math.max(1, Math.round((this.elapsed + duration) * FPS) - this.framesRendered);
+
+    const baseFilters = ['scale=1080:1920:force_original_aspect_ratio=increase', 'crop=1080:1920', `fps=${FPS}`];
+    const videoFilters = [];
+
+    if (isFirst) {
+      videoFilters.push(`fade=t=in:st=0:d=${FADE_DURATION}`);
+    }
+
+    if (isLast) {
+      const fadeOutStart = Math.max(0, narrationEnd - FADE_DURATION);
+      videoFilters.push(`fade=t=out:st=${fadeOutStart}:d=${FADE_DURATION}`);
+    }
+
+    // Verse text fades in on the first segment and out before the last one fades to black
+    const videoChain = this.overlayPath
+      ? `[0:v]${baseFilters.join(',')}[base];` +
+        `${buildOverlayFilter('1:v', this.style, { fadeIn: isFirst, fadeOutEnd: isLast ? Math.max(0, narrationEnd - FADE_DURATION) : null })};` +
+        `[base][text]overlay=0:0${videoFilters.map(filter => ',' + filter).join('')}[v]`
+      : `[0:v]${[...baseFilters, ...videoFilters].join(',')}[v]`;
+    const overlayInput = this.overlayPath ? ` -loop 1 -i "${this.overlayPath}"` : '';
+    const segmentPath = path.join(this.segmentDir, `segment_${String(index).padStart(3, '0')}.mp4`);
+
+    // Every segment uses identical encoder settings so the concat demuxer can stream-copy them
+    const command = `"${this.ffmpegPath}" -y -stream_loop -1 -ss ${stockOffset.toFixed(6)} -i "${this.videoPath}"${overlayInput} -filter_complex "${videoChain}" -map "[v]" -frames:v ${frames} -an -c:v libx264 -preset medium -crf 23 -pix_fmt yuv420p "${segmentPath}"`;
+
+    console.log(`🎞️ Rendering segment ${index + 1}${this.totalChunks ? '/' + this.totalChunks : ''} (${duration.toFixed(2)}s)...`);
+    await execAsync(command);
+
+    this.segments.push(segmentPath);
+    this.elapsed += duration;
+    this.framesRendered += frames;
+  }
+
+  /**
+   * Wait for outstanding segments and join them into the final video.
+   * Segments are video only: the soundtrack is encoded once from the finished narration in voiceData
+   * (trimmed, normalized and faded by audio_postprocess.py when postProcess is set).
+   * The last segment is rendered here so the video fades and ends against that narration,
+   * which is shorter than the raw chunks by the trimmed silence
+   */
+  async finish(voiceData) {
+    await this.queue;
+
+    const lastIndex = this.totalChunks - 1;
+    if (this.totalChunks === null || this.nextIndex !== lastIndex || !this.pendingChunks.has(lastIndex)) {
+      await fs.remove(this.segmentDir);
+      return null;
+    }
+
+    const narrationDuration = voiceData.postProcess?.duration ?? await getAudioDuration(voiceData.audioPath);
+    const narrationEnd = Math.max(0, narrationDuration - this.elapsed);
+    await fs.ensureDir(this.segmentDir);
+    await this.renderSegment(lastIndex, narrationEnd + END_BUFFER, narrationEnd);
+    this.pendingChunks.delete(lastIndex);
+
+    const listPath = path.join(this.segmentDir, 'segments.txt');
+    const listContent = this.segments.map(segment => `file '${path.resolve(segment).replace(/\\/g, '/')}'`).join('\n');
+    await fs.writeFile(listPath, listContent);
+
+    // Raw narration gets the same fades renderVideo applies
+    let audioFilter = '';
+    if (!voiceData.postProcess) {
+      const fadeOutStart = Math.max(0, narrationDuration - FADE_DURATION);
+      audioFilter = ` -af "afade=t=in:st=0:d=${FADE_DURATION},afade=t=out:st=${fadeOutStart}:d=${FADE_DURATION}"`;
+    }
+
+    await fs.ensureDir('./output');
+    console.log(`🔗 Joining ${this.segments.length} segments...`);
+    await execAsync(`"${this.ffmpegPath}" -y -f concat -safe 0 -i "${listPath}" -i "${voiceData.audioPath}" -map 0:v -map 1:a -c:v copy${audioFilter} -c:a aac -b:a 128k -movflags +faststart "${this.outputPath}"`);
+
+    await fs.remove(this.segmentDir);
+    await registerArtifact(this.outputPath, 'video');
+
+    const renderTime = Math.round((Date.now() - this.startTime) / 1000);
+    const videoDuration = this.framesRendered / FPS;
+    const stats = await fs.stat(this.outputPath);
+    const fileSizeMB = (stats.size / (1024 * 1024)).toFixed(1);
+
+    console.log(`✅ Video rendered incrementally in ${renderTime}s`);
+    console.log(`📁 Output: ${this.outputPath}`);
+    console.log(`📊 File size: ${fileSizeMB} MB`);
+
+    await logStyleUsage(this.style, {
+      verse: this.verse,
+      duration: videoDuration,
+      fileSize: fileSizeMB,
+      renderTime: renderTime
+    });
+
+    return {
+      videoPath: this.outputPath,
+      duration: videoDuration,
+      fileSize: `${fileSizeMB} MB`,
+      renderTime: `${renderTime}s`,
+      style: this.style,
+      incremental: true
+    };
+  }
+
+  async abort() {
+    await this.queue.catch(() => {});
+    await fs.remove(this.segmentDir);
+  }
+}
+
+/**
+ * Create an incremental renderer for a script and its stock footage
+ * @param {Object} options - overlay: { style, overlayPath } from createVerseOverlay, when prepared ahead
+ */
+export async function createIncrementalRenderer(scriptData, assetData, { overlay = null } = {}) {
+  const ffmpegPath = await getFFmpegPath();
+  const { style, overlayPath } = overlay || await createVerseOverlay(scriptData.verse);
+  const stockDuration = await getAudioDuration(assetData.videoPath);
+
+  return new IncrementalRenderer({
+    ffmpegPath,
+    videoPath: assetData.videoPath,
+    overlayPath,
+    stockDuration,
+    verse: scriptData.verse,
+    style
+  });
+}
@@ -6,7 +6,9 @@ import { promisify } from 'util';
 import fs from 'fs-extra';
 import path from 'path';
 import { getAudioDuration } from '../utils/audioUtils.mjs';
-import { generateRandomStyle, logStyleUsage } from './visualEffects.mjs';
+import { logStyleUsage } from './visualEffects.mjs';
+import { createVerseOverlay, buildOverlayFilter } from './textOverlay.mjs';
+import { registerArtifact } from '../utils/artifactStore.mjs';
 
 const execAsync = promisify(exec);
 
@@ -17,7 +19,7 @@ const FFMPEG_PATHS = [
   `${process.env.LOCALAPPDATA}\\Microsoft\\WinGet\\Packages\\Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe\\ffmpeg-7.1.1-full_build\\bin\\ffmpeg.exe`
 ];
 
-async function getFFmpegPath() {
+export async function getFFmpegPath() {
   for (const ffmpegPath of FFMPEG_PATHS) {
     try {
       await execAsync(`"${ffmpegPath}" -version`);
@@ -32,20 +34,21 @@ async function getFFmpegPath() {
 
 /**
  * Main video rendering function with dynamic styling
+ * @param {Object} options - overlay: { style, overlayPath } from createVerseOverlay, when prepared ahead (e.g. during TTS)
  */
-export async function renderVideo(scriptData, voiceData, assetData) {
+export async function renderVideo(scriptData, voiceData, assetData, { overlay = null } = {}) {
   try {
     console.log('🎬 Starting video rendering with dynamic styling...');
     
     // Find FFmpeg executable
     const ffmpegPath = await getFFmpegPath();
     
-    // Generate unique style for this video
-    const style = await generateRandomStyle();
+    // Unique style for this video, with its verse text already rasterized
+    const { style, overlayPath } = overlay || await createVerseOverlay(scriptData.verse);
     console.log(`🎨 Generated style: ${style.fontFamily} font, ${style.textColor} text, ${style.position} position`);
     
-    // Get audio duration to set video length
-    const audioDuration = await getAudioDuration(voiceData.audioPath);
+    // Get audio duration to set video length (post-processed narration reports its exact length)
+    const audioDuration = voiceData.postProcess?.duration ?? await getAudioDuration(voiceData.audioPath);
     // Extend video duration more to allow audio to fade out gracefully without cutting content
     const videoDuration = audioDuration + 1.5; // Add 1.5 second buffer for graceful fade-out
     
@@ -62,16 +65,17 @@ export async function renderVideo(scriptData, voiceData, assetData) {
     const fadeOutStart = Math.max(0, audioDuration - 0.5); // Start fade 0.5s before audio ends
     
     // Build FFmpeg command with dynamic styling
-    const { command: ffmpegCommand, textFilePath } = buildFFmpegCommand({
+    const ffmpegCommand = buildFFmpegCommand({
       ffmpegPath: ffmpegPath,
       videoPath: assetData.videoPath,
       audioPath: voiceData.audioPath,
+      overlayPath: overlayPath,
       outputPath: outputPath,
       duration: videoDuration,
-      text: scriptData.verse,
       style: style,
       fadeInEnd: fadeInEnd,
-      fadeOutStart: fadeOutStart
+      fadeOutStart: fadeOutStart,
+      audioFaded: Boolean(voiceData.postProcess)
     });
     
     console.log('🔧 Rendering video with FFmpeg...');
@@ -81,18 +85,12 @@ export async function renderVideo(scriptData, voiceData, assetData) {
     
     const startTime = Date.now();
     
-    try {
-      await execAsync(ffmpegCommand);
-    } finally {
-      // Cleanup temporary text file
-      if (textFilePath && fs.existsSync(textFilePath)) {
-        fs.unlinkSync(textFilePath);
-        console.log(`🧹 Cleaned up text file: ${textFilePath}`);
-      }
-    }
+    await execAsync(ffmpegCommand);
     
     const renderTime = Math.round((Date.now() - startTime) / 1000);
     
+    await registerArtifact(outputPath, 'video');
+    
     // Get file stats
     const stats = await fs.stat(outputPath);
     const fileSizeMB = (stats.size / (1024 * 1024)).toFixed(1);
@@ -125,57 +123,25 @@ export async function renderVideo(scriptData, voiceData, assetData) {
 
 /**
  * Build FFmpeg command with dynamic styling
+ * The verse is a pre-rasterized PNG (render/textOverlay.mjs) composited with overlay, faded through its alpha
  */
-function buildFFmpegCommand({ ffmpegPath, videoPath, audioPath, outputPath, duration, text, style, fadeInEnd, fadeOutStart }) {
-  // Fallback: Use simple text overlay without textfile to avoid escaping issues
-  // Clean and shorten text for inline use
-  const cleanText = text
-    .replace(/['"]/g, '')           // Remove quotes
-    .replace(/[:;,]/g, ' ')         // Replace problematic chars with spaces
-    .replace(/\s+/g, ' ')           // Normalize spaces
-    .trim()
-    .substring(0, 100);             // Limit length to avoid command line issues
-  
-  console.log(`📝 Using inline text: ${cleanText}`);
-  
-  // Calculate dynamic font size based on text length
-  const baseFontSize = 48;
-  const textLength = text.length;
-  let fontSize = baseFontSize;
-  
-  if (textLength > 100) fontSize = 36;
-  else if (textLength > 80) fontSize = 40;
-  else if (textLength > 60) fontSize = 44;
-  
-  // Position calculations for 9:16 aspect ratio (1080x1920)
-  const positions = {
-    'center': 'x=(w-text_w)/2:y=(h-text_h)/2',
-    'upper-center': 'x=(w-text_w)/2:y=h*0.25',
-    'lower-center': 'x=(w-text_w)/2:y=h*0.75',
-    'upper-left': 'x=w*0.1:y=h*0.25',
-    'lower-right': 'x=w*0.6:y=h*0.75'
-  };
-  
-  const textPosition = positions[style.position] || positions['center'];
-  
-  // TEMPORARY: Remove text overlay entirely to test basic video rendering
-  // This will help us isolate whether the issue is with text rendering or FFmpeg command structure
-  console.log('🚧 TESTING: Rendering video WITHOUT text overlay');
-  
+function buildFFmpegCommand({ ffmpegPath, videoPath, audioPath, overlayPath, outputPath, duration, style, fadeInEnd, fadeOutStart, audioFaded = false }) {
   // Video fade effects - use audio duration for fade timing to ensure full audio is captured
   const videoFade = `fade=t=in:st=0:d=${fadeInEnd},fade=t=out:st=${fadeOutStart}:d=0.5`;
   
-  // Audio fade effects - match the video fade timing
-  const audioFade = `afade=t=in:st=0:d=${fadeInEnd},afade=t=out:st=${fadeOutStart}:d=0.5`;
+  // Audio fade effects - match the video fade timing (already applied by audio_postprocess.py for Chatterbox narration)
+  const audioFade = audioFaded ? 'anull' : `afade=t=in:st=0:d=${fadeInEnd},afade=t=out:st=${fadeOutStart}:d=0.5`;
   
-  // Enhanced filter complex WITH video looping to match audio duration
-  // Loop the video, then apply scaling, cropping, and fades
-  const filterComplex = `[0:v]loop=loop=-1:size=32767:start=0[looped];[looped]scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920,${videoFade}[v];[1:a]${audioFade}[a]`;
+  // Loop the video, then apply scaling and cropping; text goes on before the fades so it fades with the picture
+  const base = '[0:v]loop=loop=-1:size=32767:start=0[looped];[looped]scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920';
+  const videoChain = overlayPath
+    ? `${base}[base];${buildOverlayFilter('2:v', style, { fadeOutEnd: fadeOutStart })};[base][text]overlay=0:0,${videoFade}[v]`
+    : `${base},${videoFade}[v]`;
+  const filterComplex = `${videoChain};[1:a]${audioFade}[a]`;
+  const overlayInput = overlayPath ? ` -loop 1 -i "${overlayPath}"` : '';
   
   // Use exact duration to ensure we capture full audio
-  const command = `"${ffmpegPath}" -y -i "${videoPath}" -i "${audioPath}" -filter_complex "${filterComplex}" -map "[v]" -map "[a]" -t ${duration} -c:v libx264 -preset medium -crf 23 -c:a aac -b:a 128k "${outputPath}"`;
-  
-  return { command, textFilePath: null };
+  return `"${ffmpegPath}" -y -i "${videoPath}" -i "${audioPath}"${overlayInput} -filter_complex "${filterComplex}" -map "[v]" -map "[a]" -t ${duration} -c:v libx264 -preset medium -crf 23 -c:a aac -b:a 128k "${outputPath}"`;
 }
 
 /**
@@ -190,7 +156,7 @@ export async function validateVideoOutput(videoPath) {
     
     // Quick FFprobe check with dynamic path
     const ffmpegPath = await getFFmpegPath();
-    const ffprobePath = ffmpegPath.replace('ffmpeg.exe', 'ffprobe.exe');
+    const ffprobePath = ffmpegPath.replace(/ffmpeg(\.exe)?$/, 'ffprobe$1');
     
     const probeCommand = `"${ffprobePath}" -v quiet -print_format json -show_format -show_streams "${videoPath}"`;
     const { stdout } = await execAsync(probeCommand);
@@ -0,0 +1,139 @@
+// 🔤 Text Overlay Cache - Verse text rasterized once into transparent PNGs
+// Renders composite the cached image with a cheap overlay filter instead of shaping text on every frame
+
+import { exec } from 'child_process';
+import { promisify } from 'util';
+import crypto from 'crypto';
+import fs from 'fs-extra';
+import path from 'path';
+import { getFFmpegPath } from './renderVideo.mjs';
+import { generateRandomStyle, buildDrawTextFilter } from './visualEffects.mjs';
+import { registerArtifact, touchArtifact } from '../utils/artifactStore.mjs';
+
+const execAsync = promisify(exec);
+
+const OVERLAY_DIR = 'output';
+const FRAME_SIZE = '1080x1920';
+const MAX_LINE_CHARS = 22; // Keeps the widest fonts inside the 1080px frame
+
+/**
+ * Font size for the text: the style's size, smaller for long text
+ */
+export function overlayFontSize(text, style) {
+  let fontSize = style.fontSize;
+  if (text.length > 100) fontSize = Math.min(fontSize, 36);
+  else if (text.length > 80) fontSize = Math.min(fontSize, 40);
+  else if (text.length > 60) fontSize = Math.min(fontSize, 44);
+  return fontSize;
+}
+
+/**
+ * Break text into lines of at most maxChars (words longer than that get their own line)
+ */
+function wrapText(text, maxChars = MAX_LINE_CHARS) {
+  const lines = [];
+  let line = '';
+  for (const word of text.split(' ')) {
+    if (line && line.length + 1 + word.length > maxChars) {
+      lines.push(line);
+      line = word;
+    } else {
+      line = line ? `${line} ${word}` : word;
+    }
+  }
+  if (line) lines.push(line);
+  return lines.join('\n');
+}
+
+/**
+ * Cache key: everything that changes the rasterized image
+ */
+export function overlayKey(text, style) {
+  return crypto.createHash('sha1')
+    .update(JSON.stringify({
+      text,
+      font: style.fontPath,
+      size: overlayFontSize(text, style),
+      color: style.textColor,
+      position: style.position,
+      stroke: [style.strokeColor, style.strokeWidth]
+    }))
+    .digest('hex');
+}
+
+/**
+ * Transparent full-frame PNG with the text drawn in place, from the cache when it exists
+ * @returns {string} Overlay image path
+ */
+export async function prepareTextOverlay(text, style, ffmpegPath = null) {
+  const cleanText = text.replace(/\s+/g, ' ').trim();
+  const key = overlayKey(cleanText, style);
+  const overlayPath = path.join(OVERLAY_DIR, `overlay_${key}.png`);
+
+  if (await fs.pathExists(overlayPath)) {
+    await touchArtifact(overlayPath);
+    return overlayPath;
+  }
+
+  ffmpegPath = ffmpegPath || await getFFmpegPath();
+  await fs.ensureDir(OVERLAY_DIR);
+  await fs.ensureDir('./temp');
+
+  // Text goes through a file, so quotes and colons in verses need no escaping
+  const textFilePath = path.join('temp', `overlay_${key}_${process.pid}.txt`);
+  const tempPath = path.join(OVERLAY_DIR, `overlay_${key}_${process.pid}.tmp.png`);
+  await fs.writeFile(textFilePath, wrapText(cleanText));
+
+  try {
+    const drawText = buildDrawTextFilter(textFilePath, style, overlayFontSize(cleanText, style));
+    await execAsync(`"${ffmpegPath}" -y -f lavfi -i "color=c=black@0.0:s=${FRAME_SIZE},format=rgba" -vf "${drawText}" -frames:v 1 "${tempPath}"`);
+    await fs.move(tempPath, overlayPath, { overwrite: true });
+  } finally {
+    await fs.remove(textFilePath);
+    await fs.remove(tempPath);
+  }
+
+  await registerArtifact(overlayPath, 'overlay');
+  console.log(`🔤 Rasterized text overlay: ${overlayPath}`);
+  return overlayPath;
+}
+
+/**
+ * Pick this video's style and rasterize its verse overlay.
+ * Cheap enough to start before narration, so it is ready by render time.
+ * A failed rasterization renders the video without text rather than failing it
+ * @returns {Object} { style, overlayPath }
+ */
+export async function createVerseOverlay(verse) {
+  const style = await generateRandomStyle();
+
+  let overlayPath = null;
+  try {
+    overlayPath = await prepareTextOverlay(verse, style);
+  } catch (error) {
+    console.log('⚠️  Text overlay failed, rendering without text:', error.message);
+  }
+
+  return { style, overlayPath };
+}
+
+/**
+ * Filter chain for the overlay input: alpha fades from the style
+ * @param {string} input - Overlay input label, e.g. "2:v"
+ * @param {Object} options - fadeIn (fade in from t=0), fadeOutEnd (text fully gone at this time)
+ */
+export function buildOverlayFilter(input, style, { fadeIn = true, fadeOutEnd = null } = {}) {
+  const filters = ['format=rgba'];
+
+  if (style.useFade && style.fadeTime > 0) {
+    if (fadeIn) {
+      filters.push(`fade=t=in:st=0:d=${style.fadeTime}:alpha=1`);
+    }
+    if (fadeOutEnd !== null) {
+      const fadeOutStart = Math.max(0, fadeOutEnd - style.fadeTime);
+      filters.push(`fade=t=out:st=${fadeOutStart.toFixed(3)}:d=${style.fadeTime}:alpha=1`);
+    }
+  }
+
+  return `[${input}]${filters.join(',')}[text]`;
+}
@@ -2,29 +2,50 @@
 // Provides randomized fonts, colors, positions, and effects for unique videos
 
 import fs from 'fs-extra';
+import os from 'os';
 import path from 'path';
+import { MetricsStore, increment } from '../utils/metricsStore.mjs';
 
-// 🔤 Font Selection - Your Complete Windows Font Collection
-const FONTS = [
-    "C:\\Windows\\Fonts\\arial.ttf",          // Safe fallback
-    "C:\\Windows\\Fonts\\arialbd.ttf",        // Bold classic
-    "C:\\Windows\\Fonts\\Amiri-Bold.ttf",     // Elegant Arabic-style
-    "C:\\Windows\\Fonts\\calibri.ttf",        // Modern clean
-    "C:\\Windows\\Fonts\\calibrib.ttf",       // Bold modern
-    "C:\\Windows\\Fonts\\Candara.ttf",        // Smooth curves
-    "C:\\Windows\\Fonts\\comic.ttf",          // Playful
-    "C:\\Windows\\Fonts\\courbd.ttf",         // Bold monospace
-    "C:\\Windows\\Fonts\\DejaVuSans.ttf",     // Open source
-    "C:\\Windows\\Fonts\\georgia.ttf",        // Elegant serif
-    "C:\\Windows\\Fonts\\impact.ttf",         // High impact
-    "C:\\Windows\\Fonts\\lucida.ttf",         // Highly readable
-    "C:\\Windows\\Fonts\\Rubik-Bold.ttf",     // Geometric modern
-    "C:\\Windows\\Fonts\\segoeui.ttf",        // Windows UI
-    "C:\\Windows\\Fonts\\tahoma.ttf",         // Clean sans
-    "C:\\Windows\\Fonts\\times.ttf",          // Classic serif
-    "C:\\Windows\\Fonts\\verdana.ttf",        // Web optimized
+// 🔤 Font Selection - Looked up by file name in the platform font folders
+const FONT_FILES = [
+    "arial.ttf",          // Safe fallback
+    "arialbd.ttf",        // Bold classic
+    "Amiri-Bold.ttf",     // Elegant Arabic-style
+    "calibri.ttf",        // Modern clean
+    "calibrib.ttf",       // Bold modern
+    "Candara.ttf",        // Smooth curves
+    "comic.ttf",          // Playful
+    "courbd.ttf",         // Bold monospace
+    "DejaVuSans.ttf",     // Open source
+    "DejaVuSans-Bold.ttf",        // Open source bold (Linux default)
+    "LiberationSans-Regular.ttf", // Arial metrics (Linux)
+    "LiberationSans-Bold.ttf",    // Bold Arial metrics (Linux)
+    "georgia.ttf",        // Elegant serif
+    "impact.ttf",         // High impact
+    "lucida.ttf",         // Highly readable
+    "Rubik-Bold.ttf",     // Geometric modern
+    "segoeui.ttf",        // Windows UI
+    "tahoma.ttf",         // Clean sans
+    "times.ttf",          // Classic serif
+    "verdana.ttf",        // Web optimized
 ];
 
+// 📂 Font folders per platform (FONT_DIR and ./fonts are searched first)
+const FONT_DIRS = [
+    process.env.FONT_DIR,
+    path.join(process.cwd(), 'fonts'),
+    ...({
+        win32: [path.join(process.env.WINDIR || 'C:\\Windows', 'Fonts')],
+        darwin: ['/System/Library/Fonts/Supplemental', '/Library/Fonts', path.join(os.homedir(), 'Library', 'Fonts')],
+    }[process.platform] || [
+        '/usr/share/fonts/truetype/msttcorefonts',
+        '/usr/share/fonts/truetype/dejavu',
+        '/usr/share/fonts/truetype/liberation',
+        '/usr/share/fonts/TTF',
+        path.join(os.homedir(), '.local', 'share', 'fonts')
+    ])
+].filter(Boolean);
+
 // 🎨 Color Palette - Appealing YouTube Shorts Colors
 const COLORS = [
     "white",      // High contrast, always readable
@@ -55,29 +76,30 @@ let fontCache = null;
 
 /**
  * Check which fonts are actually available on the system
- * @returns {Array} Array of available font paths
+ * File names match case-insensitively (Linux core fonts ship as Arial.ttf)
+ * @returns {Array} Array of available font paths (empty: FFmpeg's default font is used)
  */
 async function getAvailableFonts() {
     if (fontCache) return fontCache;
     
     console.log('🔍 Checking font availability...');
-    const availableFonts = [];
+    const wanted = new Set(FONT_FILES.map(name => name.toLowerCase()));
+    const found = new Map();
     
-    for (const font of FONTS) {
+    for (const dir of FONT_DIRS) {
         try {
-            if (await fs.pathExists(font)) {
-                availableFonts.push(font);
+            for (const file of await fs.readdir(dir)) {
+                const name = file.toLowerCase();
+                if (wanted.has(name) && !found.has(name)) {
+                    found.set(name, path.join(dir, file));
+                }
             }
         } catch (error) {
-            // Skip fonts that can't be checked
+            // Skip folders that don't exist on this platform
         }
     }
     
-    // Always ensure arial.ttf is available as fallback
-    if (!availableFonts.includes("C:\\Windows\\Fonts\\arial.ttf")) {
-        availableFonts.push("C:\\Windows\\Fonts\\arial.ttf");
-    }
-    
+    const availableFonts = [...found.values()];
     console.log(`✅ Found ${availableFonts.length} available fonts`);
     fontCache = availableFonts;
     return availableFonts;
@@ -91,7 +113,7 @@ export async function generateRandomStyle() {
     const availableFonts = await getAvailableFonts();
     
     // Random selections
-    const font = availableFonts[Math.floor(Math.random() * availableFonts.length)];
+    const font = availableFonts.length > 0 ? availableFonts[Math.floor(Math.random() * availableFonts.length)] : null;
     const color = COLORS[Math.floor(Math.random() * COLORS.length)];
     const position = POSITIONS[Math.floor(Math.random() * POSITIONS.length)];
     const fontSize = FONT_SIZES[Math.floor(Math.random() * FONT_SIZES.length)];
@@ -102,7 +124,7 @@ export async function generateRandomStyle() {
     
     const style = {
         fontPath: font,
-        fontFamily: path.basename(font, '.ttf'),
+        fontFamily: font ? path.basename(font, '.ttf') : 'Sans',
         textColor: color,
         backgroundColor: 'black@0.7',  // Semi-transparent black background
         position: position,
@@ -129,7 +151,7 @@ export function getFFmpegPosition(position, width = 1080, height = 1920) {
     const positions = {
         center: '(w-text_w)/2:(h-text_h)/2',
         top: '(w-text_w)/2:100',
-        bottom: '(w-text_w)/2:h-150',
+        bottom: '(w-text_w)/2:h-text_h-150',
         left: '50:(h-text_h)/2',
         right: 'w-text_w-50:(h-text_h)/2'
     };
@@ -139,99 +161,76 @@ export function getFFmpegPosition(position, width = 1080, height = 1920) {
 
 /**
  * Build FFmpeg drawtext filter with dynamic styling
- * @param {string} text - Text to display
+ * Used once per overlay image (render/textOverlay.mjs); fades are applied to the image when compositing
+ * @param {string} textFilePath - File holding the (already wrapped) text, so nothing needs escaping
  * @param {Object} style - Style configuration
- * @param {number} videoDuration - Video duration for text timing
+ * @param {number} fontSize - Font size to draw at
  * @returns {string} FFmpeg drawtext filter string
  */
-export function buildDrawTextFilter(text, style, videoDuration) {
-    const position = getFFmpegPosition(style.position);
-    
-    let filter = `drawtext=text='${text.replace(/'/g, "\\'")}':` +
-        `fontfile='${style.font}':` +
-        `fontsize=${style.fontSize}:` +
-        `fontcolor=${style.color}:` +
-        `x=${position.split(':')[0]}:` +
-        `y=${position.split(':')[1]}:` +
-        `shadowcolor=${style.strokeColor}:` +
-        `shadowx=${style.strokeWidth}:` +
-        `shadowy=${style.strokeWidth}`;
+export function buildDrawTextFilter(textFilePath, style, fontSize = style.fontSize) {
+    const [x, y] = getFFmpegPosition(style.position).split(':');
+    const quote = filePath => `'${filePath.replace(/\\/g, '/').replace(/:/g, '\\:')}'`;
     
-    // Add fade effects if enabled
-    if (style.useFade && style.fadeTime > 0) {
-        const fadeInEnd = style.fadeTime;
-        const fadeOutStart = videoDuration - style.fadeTime;
-        
-        filter += `:enable='between(t,0,${videoDuration})'`;
-        
-        // Add alpha fading
-        if (fadeInEnd > 0 && fadeOutStart > fadeInEnd) {
-            filter += `:alpha='if(lt(t,${fadeInEnd}),t/${fadeInEnd},if(gt(t,${fadeOutStart}),(${videoDuration}-t)/${style.fadeTime},1))'`;
-        }
-    }
-    
-    return filter;
+    return `drawtext=textfile=${quote(textFilePath)}:` +
+        (style.fontPath ? `fontfile=${quote(style.fontPath)}:` : 'font=Sans:') +
+        `fontsize=${fontSize}:` +
+        `fontcolor=${style.textColor}:` +
+        `x=${x}:` +
+        `y=${y}:` +
+        `line_spacing=12:` +
+        `borderw=${style.strokeWidth}:` +
+        `bordercolor=${style.strokeColor}`;
 }
 
+// 📈 Style usage stream - counts are kept up to date on every render
+// (history from the old logs/style_usage.json array is imported on first use)
+const styleMetrics = new MetricsStore('style_usage', {
+    legacyFile: path.join('logs', 'style_usage.json'),
+    initial: () => ({
+        totalVideos: 0,
+        fontUsage: {},
+        colorUsage: {},
+        positionUsage: {},
+        fadeUsage: { with: 0, without: 0 }
+    }),
+    reduce: (stats, log) => {
+        stats.totalVideos++;
+        increment(stats.fontUsage, log.font);
+        increment(stats.colorUsage, log.color);
+        increment(stats.positionUsage, log.position);
+        if (log.useFade) stats.fadeUsage.with++; else stats.fadeUsage.without++;
+        return stats;
+    }
+});
+
 /**
  * Log style usage for analytics
  * @param {Object} style - Style configuration
- * @param {string} videoId - Video identifier
+ * @param {Object} videoId - Video identifier / render details
  */
-export function logStyleUsage(style, videoId) {
-    const logEntry = {
-        timestamp: new Date().toISOString(),
+export async function logStyleUsage(style, videoId) {
+    await styleMetrics.append({
         videoId: videoId,
-        font: style.fontName,
-        color: style.color,
+        font: style.fontFamily,
+        color: style.textColor,
         position: style.position,
         fontSize: style.fontSize,
         useFade: style.useFade,
         fadeTime: style.fadeTime
-    };
-    
-    // Append to style usage log
-    const logFile = './logs/style_usage.json';
-    try {
-        fs.ensureDirSync('./logs');
-        const existingLogs = fs.existsSync(logFile) ? JSON.parse(fs.readFileSync(logFile, 'utf8')) : [];
-        existingLogs.push(logEntry);
-        fs.writeFileSync(logFile, JSON.stringify(existingLogs, null, 2));
-    } catch (error) {
-        console.log('⚠️  Could not log style usage:', error.message);
-    }
+    });
 }
 
 /**
  * Get style statistics from usage logs
  * @returns {Object} Style usage statistics
  */
-export function getStyleStats() {
-    const logFile = './logs/style_usage.json';
+export async function getStyleStats() {
     try {
-        if (!fs.existsSync(logFile)) return null;
-        
-        const logs = JSON.parse(fs.readFileSync(logFile, 'utf8'));
-        const stats = {
-            totalVideos: logs.length,
-            fontUsage: {},
-            colorUsage: {},
-            positionUsage: {},
-            fadeUsage: { with: 0, without: 0 }
-        };
-        
-        logs.forEach(log => {
-            stats.fontUsage[log.font] = (stats.fontUsage[log.font] || 0) + 1;
-            stats.colorUsage[log.color] = (stats.colorUsage[log.color] || 0) + 1;
-            stats.positionUsage[log.position] = (stats.positionUsage[log.position] || 0) + 1;
-            if (log.useFade) stats.fadeUsage.with++; else stats.fadeUsage.without++;
-        });
-        
-        return stats;
+        return await styleMetrics.getAggregates();
     } catch (error) {
         return null;
     }
 }
 
 // Export font list for external use
-export { FONTS, COLORS, POSITIONS, FONT_SIZES, FADE_DURATIONS };
+export { FONT_FILES, FONT_DIRS, COLORS, POSITIONS, FONT_SIZES, FADE_DURATIONS };
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Rotation Schedule - Precomputed order in which unused scripts are published
+Keeps the same verse out of any K-day window and spreads styles, maintained
+incrementally as scripts are added or claimed so each pick costs O(log n)
+"""
+
+import heapq
+import os
+import random
+from datetime import date, datetime
+
+SCHEDULE_VERSION = 1
+VERSE_COOLDOWN_DAYS = int(os.getenv("VERSE_COOLDOWN_DAYS", "7"))
+STYLE_SPREAD = int(os.getenv("STYLE_SPREAD", "2"))  # A style never repeats within this many picks
+DEFAULT_VIDEOS_PER_DAY = 2
+# Only an explicit DAILY_VIDEO_COUNT (the pipeline passes its .env value) changes a persisted schedule
+VIDEOS_PER_DAY = int(os.getenv("DAILY_VIDEO_COUNT")) if os.getenv("DAILY_VIDEO_COUNT") else None
+HORIZON = 30  # Slots kept precomputed
+STYLE_LOOKAHEAD = 8  # Eligible verses examined per slot while looking for a fresh style
+
+
+def _day_of(timestamp):
+    """Day ordinal of an ISO timestamp"""
+    return datetime.fromisoformat(timestamp).date().toordinal()
+
+
+class RotationSchedule:
+    """
+    Persistent state (stored under "rotation" in the scripts file):
+      buckets:     verse -> style -> unscheduled script ids
+      heap:        [available_day, tiebreak, verse] for every verse with a non-empty bucket
+      last_day:    verse -> day ordinal of its latest (planned) use
+      recent:      styles of the latest STYLE_SPREAD planned picks
+      upcoming:    planned slots [{id, verse, style, day}] in publishing order
+      next_day / slots_left: where the next planned slot goes
+    """
+
+    def __init__(self, state):
+        self.state = state
+
+    @classmethod
+    def build(cls, scripts, today=None):
+        """Build a fresh schedule from the full script list"""
+        today = (today or date.today()).toordinal()
+        state = {
+            "version": SCHEDULE_VERSION,
+            "verse_cooldown_days": VERSE_COOLDOWN_DAYS,
+            "style_spread": STYLE_SPREAD,
+            "videos_per_day": VIDEOS_PER_DAY or DEFAULT_VIDEOS_PER_DAY,
+            "buckets": {},
+            "heap": [],
+            "last_day": {},
+            "recent": [],
+            "upcoming": [],
+            "next_day": today,
+            "slots_left": VIDEOS_PER_DAY or DEFAULT_VIDEOS_PER_DAY,
+        }
+        schedule = cls(state)
+
+        # History seeds the cooldowns: latest use per verse, latest styles
+        used = sorted((s for s in scripts if s.get("used") and s.get("used_at")), key=lambda s: s["used_at"])
+        for script in used:
+            state["last_day"][script["verse"]] = _day_of(script["used_at"])
+        state["recent"] = [s.get("style", "") for s in used[-STYLE_SPREAD:]] if STYLE_SPREAD else []
+
+        for script in scripts:
+            if not script.get("used"):
+                schedule._bucket_add(script)
+
+        for verse in state["buckets"]:
+            state["heap"].append([schedule._available_day(verse), random.random(), verse])
+        heapq.heapify(state["heap"])
+
+        return schedule
+
+    @classmethod
+    def load(cls, state):
+        """Schedule from persisted state, or None if it must be rebuilt"""
+        if not state or state.get("version") != SCHEDULE_VERSION:
+            return None
+        if (state.get("verse_cooldown_days"), state.get("style_spread")) != (VERSE_COOLDOWN_DAYS, STYLE_SPREAD):
+            return None
+        # A new daily count applies to days not planned yet; the planned slots and cooldowns stay
+        if VIDEOS_PER_DAY and state.get("videos_per_day") != VIDEOS_PER_DAY:
+            state["videos_per_day"] = VIDEOS_PER_DAY
+        return cls(state)
+
+    def _available_day(self, verse):
+        last = self.state["last_day"].get(verse)
+        return last + self.state["verse_cooldown_days"] if last is not None else 0
+
+    def _bucket_add(self, script):
+        """Add a script to its verse/style bucket; True if the verse bucket was empty"""
+        styles = self.state["buckets"].setdefault(script["verse"], {})
+        was_empty = not styles
+        styles.setdefault(script.get("style", ""), []).append(script["id"])
+        return was_empty
+
+    def add(self, script):
+        """New unused script - O(log n)"""
+        if self._bucket_add(script):
+            verse = script["verse"]
+            heapq.heappush(self.state["heap"], [self._available_day(verse), random.random(), verse])
+
+    def _take_from_bucket(self, verse, is_available):
+        """Take the best-spread script for a verse: a style outside the recent window, most stock first"""
+        styles = self.state["buckets"][verse]
+        recent = set(self.state["recent"])
+
+        order = sorted(styles, key=lambda style: (style in recent, -len(styles[style])))
+        for style in order:
+            ids = styles[style]
+            while ids:
+                script_id = ids.pop()
+                if is_available(script_id):
+                    if not ids:
+                        del styles[style]
+                    return script_id, style
+            del styles[style]
+        return None, None
+
+    def _has_fresh_style(self, verse):
+        recent = set(self.state["recent"])
+        return any(style not in recent for style in self.state["buckets"][verse])
+
+    def _next_slot_day(self, today):
+        state = self.state
+        if state["next_day"] < today:
+            state["next_day"], state["slots_left"] = today, state["videos_per_day"]
+        if state["slots_left"] == 0:
+            state["next_day"] += 1
+            state["slots_left"] = state["videos_per_day"]
+        return state["next_day"]
+
+    def _plan_slot(self, is_available, today):
+        """Append one slot to the schedule - O(log n). False when the inventory is exhausted."""
+        state = self.state
+        heap = state["heap"]
+        day = self._next_slot_day(today)
+
+        while heap:
+            # Among verses out of cooldown, prefer one that still has a style not used recently
+            popped = []
+            while heap and len(popped) < STYLE_LOOKAHEAD and (heap[0][0] <= day or not popped):
+                popped.append(heapq.heappop(heap))
+
+            eligible = [entry for entry in popped if entry[0] <= day] or popped[:1]  # Cooldown relaxed only if nothing else is left
+            chosen = next((entry for entry in eligible if self._has_fresh_style(entry[2])), eligible[0])
+            for entry in popped:
+                if entry is not chosen:
+                    heapq.heappush(heap, entry)
+
+            verse = chosen[2]
+            script_id, style = self._take_from_bucket(verse, is_available)
+
+            if script_id is None:
+                del state["buckets"][verse]  # Every id in that bucket was claimed elsewhere
+                continue
+
+            if state["buckets"][verse]:
+                chosen[0] = day + state["verse_cooldown_days"]
+                heapq.heappush(heap, chosen)
+            else:
+                del state["buckets"][verse]
+
+            state["last_day"][verse] = day
+            state["recent"] = (state["recent"] + [style])[-state["style_spread"]:] if state["style_spread"] else []
+            state["upcoming"].append({
+                "id": script_id,
+                "verse": verse,
+                "style": style,
+                "day": date.fromordinal(day).isoformat(),
+            })
+            state["slots_left"] -= 1
+            return True
+
+        return False
+
+    def fill(self, is_available, count=HORIZON, today=None):
+        """Extend the precomputed schedule to `count` slots"""
+        today = (today or date.today()).toordinal()
+        while len(self.state["upcoming"]) < count:
+            if not self._plan_slot(is_available, today):
+                break
+
+    def pop_next(self, is_available, today=None):
+        """Claim the next scheduled script id (stale entries are skipped), topping the schedule up"""
+        upcoming = self.state["upcoming"]
+        while True:
+            if not upcoming:
+                self.fill(is_available, today=today)
+                if not upcoming:
+                    return None
+            entry = upcoming.pop(0)
+            if is_available(entry["id"]):
+                self.fill(is_available, today=today)
+                return entry["id"]
+
+    def claim(self, script_id):
+        """A script was used outside the schedule order"""
+        self.state["upcoming"] = [entry for entry in self.state["upcoming"] if entry["id"] != script_id]
+
+    def preview(self, count, is_available, today=None):
+        """Next `count` planned slots, read from the schedule"""
+        self.fill(is_available, max(count, HORIZON), today=today)
+        return self.state["upcoming"][:count]
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Script Client - Thin client for script_service.py
+Falls back to an in-process ScriptManager when the service is not running,
+or when SCRIPTS_FILE points at another inventory than the one the service holds
+"""
+
+import json
+import os
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+DEFAULT_SCRIPTS_FILE = "data/bible_scripts.json"  # The inventory script_service.py serves
+SERVICE_URL = f"http://127.0.0.1:{os.getenv('SCRIPT_SERVICE_PORT', '8765')}"
+TIMEOUT_SECONDS = 2
+
+
+def _uses_service_inventory():
+    scripts_file = os.getenv("SCRIPTS_FILE", DEFAULT_SCRIPTS_FILE)
+    return Path(scripts_file).resolve() == Path(DEFAULT_SCRIPTS_FILE).resolve()
+
+
+def _request(method, path, payload=None):
+    """
+    JSON response from the service, or None if it is not running (connection refused).
+    Any other failure raises: the service may hold changes a local fallback would overwrite
+    """
+    # The service only holds the default inventory
+    if not _uses_service_inventory():
+        return None
+
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(
+        SERVICE_URL + path,
+        data=data,
+        method=method,
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=TIMEOUT_SECONDS) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(f"Script service {method} {path} failed with HTTP {e.code}: {e.read().decode('utf-8', 'replace')}") from e
+    except urllib.error.URLError as e:
+        if isinstance(e.reason, ConnectionRefusedError):
+            return None
+        raise RuntimeError(f"Script service {method} {path} failed: {e.reason}") from e
+    except ConnectionRefusedError:
+        return None
+
+
+def _local_manager():
+    from script_manager import ScriptManager
+    return ScriptManager()
+
+
+def claim_script(mark_used=True):
+    """Next scheduled script plus inventory stats: {"script": ..., "stats": ...}"""
+    result = _request("POST", "/claim", {"mark_used": mark_used})
+    if result is not None:
+        return result
+
+    manager = _local_manager()
+    script = manager.get_next_script(mark_used=mark_used)
+    return {"script": script, "stats": manager.get_script_stats()}
+
+
+def script_stats():
+    result = _request("GET", "/stats")
+    return result if result is not None else _local_manager().get_script_stats()
+
+
+def preview_scripts(count=5):
+    """Next `count` scheduled slots, each with its script"""
+    result = _request("GET", f"/preview?count={count}")
+    if result is not None:
+        return result["upcoming"]
+
+    manager = _local_manager()
+    upcoming = manager.rotation.preview(count, manager.is_available)
+    return [dict(entry, script=manager.by_id[entry["id"]]) for entry in upcoming]
+
+
+def insert_scripts(scripts):
+    result = _request("POST", "/insert", {"scripts": scripts})
+    return result["added"] if result is not None else _local_manager().add_scripts(scripts)
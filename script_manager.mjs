@@ -64,18 +64,42 @@ async function cleanupOldScripts() {
 
 async function resetAllUsage() {
   console.log('🔄 RESET: Marking all scripts as unused...');
-  
+
+  // A running script service owns the inventory - writing the file underneath it would be overwritten
+  if (await scriptManager.serviceRequest('POST', '/reset')) {
+    const stats = await scriptManager.getScriptStats();
+    console.log(`✅ Reset complete! All ${stats.total} scripts are now available for use.`);
+    return;
+  }
+
   const data = await scriptManager.loadScripts();
   data.scripts.forEach(script => {
     script.used = false;
     delete script.used_at;
     delete script.usage_count;
   });
+  delete data.rotation; // Replanned from scratch below
   
   await scriptManager.saveScripts(data);
+  await scriptManager.refreshSchedule();
   console.log(`✅ Reset complete! All ${data.scripts.length} scripts are now available for use.`);
 }
 
+async function previewSchedule(count = 5) {
+  console.log(`📋 NEXT ${count} SCHEDULED SCRIPTS`);
+  console.log('='.repeat(50));
+  
+  const upcoming = await scriptManager.previewNextScripts(count);
+  if (upcoming.length === 0) {
+    console.log('❌ Nothing scheduled - run: python script_manager.py schedule');
+    return;
+  }
+  
+  upcoming.forEach((entry, i) => {
+    console.log(`${i+1}. [${entry.day}] ${entry.verse.substring(0, 40)}... (${entry.style})`);
+  });
+}
+
 async function generateNewScripts() {
   console.log('🤖 GENERATE: Starting new script generation...');
   console.log('💡 TIP: This would typically call your batch_script_generator.py');
@@ -97,6 +121,9 @@ async function handleCLI() {
     case 'reset':
       await resetAllUsage();
       break;
+    case 'preview':
+      await previewSchedule(parseInt(process.argv[3]) || 5);
+      break;
     case 'generate':
       await generateNewScripts();
       break;
@@ -108,6 +135,7 @@ async function handleCLI() {
       console.log('  status    - Show detailed script usage report');
       console.log('  cleanup   - Find scripts used multiple times');
       console.log('  reset     - Mark all scripts as unused (fresh start)');
+      console.log('  preview   - Show the next scheduled scripts (preview [count])');
       console.log('  generate  - Generate new scripts (calls Python generator)');
       console.log('');
       console.log('Examples:');
@@ -5,16 +5,25 @@ Provides scripts to the video pipeline without API calls
 """
 
 import json
-import random
+import os
+import sys
 from datetime import datetime
 from pathlib import Path
 
-SCRIPTS_FILE = Path("data/bible_scripts.json")
+from rotation_schedule import RotationSchedule
+from script_client import claim_script, script_stats
+from speech_normalizer import prepare_script, normalize_for_speech
+
+SCRIPTS_FILE = Path(os.getenv("SCRIPTS_FILE", "data/bible_scripts.json"))  # Per-channel inventories set SCRIPTS_FILE
 
 class ScriptManager:
-    def __init__(self):
+    def __init__(self, autosave=True):
         self.scripts_file = SCRIPTS_FILE
+        self.autosave = autosave  # False: changes are only marked dirty (script_service.py batches the writes)
+        self.dirty = False
         self.data = self.load_scripts()
+        self.prepare_speech()
+        self.load_rotation()
     
     def load_scripts(self):
         """Load scripts from database file"""
@@ -28,30 +37,75 @@ class ScriptManager:
         return {"scripts": [], "generated_at": datetime.now().isoformat()}
     
     def save_scripts(self):
-        """Save scripts back to database"""
-        with open(self.scripts_file, 'w', encoding='utf-8') as f:
+        """Save scripts back to database (write-then-rename so readers never see a torn file)"""
+        temp_file = self.scripts_file.with_suffix(".json.tmp")
+        self.scripts_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_file, 'w', encoding='utf-8') as f:
             json.dump(self.data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_file, self.scripts_file)
+        self.dirty = False
+    
+    def commit(self):
+        """Persist a change now, or leave it for the next batched save"""
+        if self.autosave:
+            self.save_scripts()
+        else:
+            self.dirty = True
+    
+    def prepare_speech(self):
+        """Attach precomputed speech fields to any script missing them"""
+        return sum(1 for script in self.data["scripts"] if prepare_script(script))
+    
+    def load_rotation(self):
+        """Index scripts by id and load (or rebuild) the rotation schedule"""
+        self.by_id = {script["id"]: script for script in self.data["scripts"]}
+        self.rotation = RotationSchedule.load(self.data.get("rotation"))
+        rebuilt = self.rotation is None
+        
+        if rebuilt:
+            self.rotation = RotationSchedule.build(self.data["scripts"])
+            self.data["rotation"] = self.rotation.state
+        
+        planned = len(self.rotation.state["upcoming"])
+        self.rotation.fill(self.is_available)
+        
+        # Persist right away so a preview and the following pick agree
+        if rebuilt or len(self.rotation.state["upcoming"]) != planned:
+            self.commit()
+    
+    def is_available(self, script_id):
+        """Whether a script exists and has not been used"""
+        script = self.by_id.get(script_id)
+        return script is not None and not script.get("used", False)
+    
+    def add_scripts(self, scripts):
+        """Add new scripts to the database, normalizing them for speech on the way in"""
+        for script in scripts:
+            prepare_script(script)
+            self.data["scripts"].append(script)
+            self.by_id[script["id"]] = script
+            self.rotation.add(script)
+        
+        self.rotation.fill(self.is_available)
+        self.commit()
+        return len(scripts)
     
     def get_next_script(self, mark_used=True):
-        """Get the next unused script"""
-        unused_scripts = [s for s in self.data["scripts"] if not s.get("used", False)]
+        """Get the next script from the rotation schedule"""
+        if not mark_used:
+            upcoming = self.rotation.preview(1, self.is_available)
+            return self.by_id[upcoming[0]["id"]] if upcoming else None
         
-        if not unused_scripts:
+        script_id = self.rotation.pop_next(self.is_available)
+        if script_id is None:
             return None
         
-        # Get random unused script for variety
-        script = random.choice(unused_scripts)
-        
-        if mark_used:
-            # Mark as used
-            for i, s in enumerate(self.data["scripts"]):
-                if s["id"] == script["id"]:
-                    self.data["scripts"][i]["used"] = True
-                    self.data["scripts"][i]["used_at"] = datetime.now().isoformat()
-                    break
-            
-            self.save_scripts()
+        script = self.by_id[script_id]
+        script["used"] = True
+        script["used_at"] = datetime.now().isoformat()
+        script["usage_count"] = script.get("usage_count", 0) + 1
         
+        self.commit()
         return script
     
     def get_script_stats(self):
@@ -59,65 +113,74 @@ class ScriptManager:
         total = len(self.data["scripts"])
         used = len([s for s in self.data["scripts"] if s.get("used", False)])
         unused = total - used
+        usages = [s["usage_count"] for s in self.data["scripts"] if s.get("usage_count")]
         
         return {
             "total": total,
             "used": used,
             "unused": unused,
-            "usage_percentage": (used / total * 100) if total > 0 else 0
+            "usage_percentage": (used / total * 100) if total > 0 else 0,
+            "average_uses_per_script": (sum(usages) / used) if used > 0 else 0,
+            "scripts_used_multiple_times": len([count for count in usages if count > 1])
         }
     
     def reset_usage(self):
-        """Reset all scripts to unused (for testing)"""
+        """Reset all scripts to unused, usage counts included (for testing)"""
         for script in self.data["scripts"]:
             script["used"] = False
-            if "used_at" in script:
-                del script["used_at"]
+            script.pop("used_at", None)
+            script.pop("usage_count", None)
         
-        self.save_scripts()
+        self.data.pop("rotation", None)
+        self.load_rotation()
+        self.commit()
         print("✅ All scripts reset to unused")
     
     def preview_next_scripts(self, count=5):
-        """Preview upcoming unused scripts"""
-        unused_scripts = [s for s in self.data["scripts"] if not s.get("used", False)]
+        """Preview upcoming scripts in publishing order, read from the rotation schedule"""
+        planned = len(self.rotation.state["upcoming"])
+        upcoming = self.rotation.preview(count, self.is_available)
+        if len(self.rotation.state["upcoming"]) != planned:
+            self.commit()
         
-        if not unused_scripts:
+        if not upcoming:
             print("❌ No unused scripts available!")
             return
         
-        print(f"📋 Next {min(count, len(unused_scripts))} unused scripts:")
+        print(f"📋 Next {len(upcoming)} scheduled scripts:")
         print("=" * 60)
         
-        for i, script in enumerate(unused_scripts[:count]):
-            print(f"\n🎬 Script {i+1} (ID: {script['id']}):")
+        for i, entry in enumerate(upcoming):
+            script = self.by_id[entry["id"]]
+            print(f"\n🎬 Script {i+1} (ID: {script['id']}) - planned for {entry['day']}:")
             print(f"Style: {script.get('style', 'Unknown')}")
             print(f"Verse: {script.get('verse', 'Unknown')[:50]}...")
             print("Script Preview:")
             print(script['script'][:200] + ("..." if len(script['script']) > 200 else ""))
             print("-" * 40)
 
-def get_script_for_pipeline():
-    """
-    Simple function for pipeline integration
-    Returns just the script text, ready to use
-    """
-    manager = ScriptManager()
-    script_data = manager.get_next_script()
-    
-    if not script_data:
-        # Fallback script if database is empty
-        return """HOOK: This Bible verse will inspire you today!
+FALLBACK_SCRIPT = """HOOK: This Bible verse will inspire you today!
 VERSE: Trust in the Lord with all your heart.
 MEANING: Complete faith brings peace and direction.
 APPLICATION: Choose trust over worry in every situation.
 CTA: Share your testimony! #Bible #Faith #Trust #Inspiration"""
-    
-    return script_data["script"]
 
-def check_script_supply():
+def speech_text_for(script_data):
+    """Speech-ready text of a claimed script (fallback script if the database is empty)"""
+    if not script_data:
+        return normalize_for_speech(FALLBACK_SCRIPT)
+    return script_data["speech"]["text"]
+
+def get_script_for_pipeline():
+    """
+    Simple function for pipeline integration
+    Returns just the speech-ready script text, ready to use
+    """
+    return speech_text_for(claim_script()["script"])
+
+def check_script_supply(stats=None):
     """Check if we need to generate more scripts"""
-    manager = ScriptManager()
-    stats = manager.get_script_stats()
+    stats = stats or script_stats()
     
     print(f"📊 Script Supply Status:")
     print(f"   Total scripts: {stats['total']}")
@@ -137,6 +200,13 @@ def check_script_supply():
         return True
 
 if __name__ == "__main__":
+    if sys.argv[1:] == ["schedule"]:
+        # Non-interactive: top up the rotation schedule (used by pipeline_integration.mjs)
+        manager = ScriptManager()
+        manager.save_scripts()
+        print(f"✅ Rotation schedule: {len(manager.rotation.state['upcoming'])} slot(s) planned")
+        sys.exit(0)
+    
     print("🎬 Bible Script Manager")
     print("=" * 30)
     
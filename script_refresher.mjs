@@ -6,26 +6,30 @@ import { spawn } from 'child_process';
 import fs from 'fs-extra';
 import path from 'path';
 
-const scriptManager = new ScriptManager();
+const defaultScriptManager = new ScriptManager();
 
-export async function checkAndRefreshScripts() {
-  console.log('🔍 Checking script supply...');
+/**
+ * @param {Object} channel - Optional channel (utils/channels.mjs); defaults to the single-channel inventory
+ */
+export async function checkAndRefreshScripts(channel = null) {
+  console.log(`🔍 Checking script supply${channel ? ` for ${channel.name}` : ''}...`);
   
+  const scriptManager = channel ? ScriptManager.forChannel(channel) : defaultScriptManager;
   const supplyCheck = await scriptManager.checkScriptSupply();
   
   if (supplyCheck.critical) {
     console.log('🚨 CRITICAL: Only ' + supplyCheck.unused + ' scripts left! Generating immediately...');
-    return await generateNewScripts(50); // Generate 50 new scripts urgently
+    return await generateNewScripts(50, scriptManager); // Generate 50 new scripts urgently
   } else if (supplyCheck.needsRefresh) {
     console.log('⚠️  LOW: Only ' + supplyCheck.unused + ' scripts left. Generating new batch...');
-    return await generateNewScripts(30); // Generate 30 new scripts
+    return await generateNewScripts(30, scriptManager); // Generate 30 new scripts
   } else {
     console.log('✅ Script supply is good (' + supplyCheck.unused + ' unused scripts)');
     return { generated: false, reason: 'Supply sufficient' };
   }
 }
 
-async function generateNewScripts(count = 50) {
+async function generateNewScripts(count = 50, scriptManager = defaultScriptManager) {
   console.log(`🤖 Generating ${count} new Bible scripts...`);
   
   try {
@@ -42,7 +46,7 @@ async function generateNewScripts(count = 50) {
     console.log('🐍 Running Python script generator...');
     
     // Run the Python script generator
-    const result = await runPythonGenerator(count);
+    const result = await runPythonGenerator(count, scriptManager.env);
     
     if (result.success) {
       // Check script count after generation
@@ -70,7 +74,7 @@ async function generateNewScripts(count = 50) {
   }
 }
 
-function runPythonGenerator(count) {
+function runPythonGenerator(count, env = {}) {
   return new Promise((resolve) => {
     // Check if we have a Python environment configured
     const pythonCmd = process.platform === 'win32' ? 'python' : 'python3';
@@ -79,7 +83,8 @@ function runPythonGenerator(count) {
     
     const pythonProcess = spawn(pythonCmd, ['batch_script_generator.py'], {
       stdio: ['pipe', 'pipe', 'pipe'],
-      cwd: process.cwd()
+      cwd: process.cwd(),
+      env: { ...process.env, ...env }
     });
     
     let output = '';
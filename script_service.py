@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Script Service - Long-lived local server that keeps the script inventory in memory
+Serves claim/stats/preview/insert to the Node pipeline and Python tools over
+localhost HTTP, and batches writes to data/bible_scripts.json
+"""
+
+import json
+import os
+import signal
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from script_manager import ScriptManager
+
+HOST = "127.0.0.1"
+PORT = int(os.getenv("SCRIPT_SERVICE_PORT", "8765"))
+FLUSH_SECONDS = float(os.getenv("SCRIPT_SERVICE_FLUSH_SECONDS", "2"))
+
+
+class ScriptService:
+    """In-memory inventory guarded by one lock, flushed to disk on a timer"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.manager = ScriptManager(autosave=False)
+        self.file_mtime = self._mtime()
+        self.stop_event = threading.Event()
+
+    def _mtime(self):
+        try:
+            return self.manager.scripts_file.stat().st_mtime
+        except OSError:
+            return None
+
+    def _sync_from_disk(self):
+        """Pick up edits made to the file by tools that bypass the service"""
+        if self._mtime() == self.file_mtime:
+            return
+        if self.manager.dirty:
+            # Unsaved claims on both sides: fold the file's usage in, then save the union right away
+            self._merge_disk_usage()
+            self.manager.save_scripts()
+            self.file_mtime = self._mtime()
+            return
+        self.manager = ScriptManager(autosave=False)
+        self.file_mtime = self._mtime()
+        print(f"🔄 Reloaded {len(self.manager.data['scripts'])} script(s) from disk")
+
+    def _merge_disk_usage(self):
+        """Keep scripts claimed through the file fallback used, and adopt scripts added there"""
+        merged = 0
+        added = []
+        for disk_script in self.manager.load_scripts()["scripts"]:
+            script = self.manager.by_id.get(disk_script["id"])
+            if script is None:
+                added.append(disk_script)
+                continue
+
+            if disk_script.get("used") and not script.get("used"):
+                script["used"] = True
+                merged += 1
+            if disk_script.get("used_at", "") > script.get("used_at", ""):
+                script["used_at"] = disk_script["used_at"]
+            if disk_script.get("usage_count", 0) > script.get("usage_count", 0):
+                script["usage_count"] = disk_script["usage_count"]
+
+        if added:
+            self.manager.add_scripts(added)
+        print(f"🔀 Merged scripts file changes: {merged} claimed, {len(added)} added outside the service")
+
+    def flush(self):
+        with self.lock:
+            self._sync_from_disk()
+            if self.manager.dirty:
+                self.manager.save_scripts()
+                self.file_mtime = self._mtime()
+
+    def flush_loop(self):
+        while not self.stop_event.wait(FLUSH_SECONDS):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Could not save scripts: {e}")
+
+    def claim(self, mark_used=True):
+        with self.lock:
+            self._sync_from_disk()
+            script = self.manager.get_next_script(mark_used=mark_used)
+            return {"script": script, "stats": self.manager.get_script_stats()}
+
+    def stats(self):
+        with self.lock:
+            self._sync_from_disk()
+            return self.manager.get_script_stats()
+
+    def preview(self, count):
+        with self.lock:
+            self._sync_from_disk()
+            upcoming = self.manager.rotation.preview(count, self.manager.is_available)
+            return {"upcoming": [dict(entry, script=self.manager.by_id[entry["id"]]) for entry in upcoming]}
+
+    def insert(self, scripts):
+        with self.lock:
+            self._sync_from_disk()
+            return {"added": self.manager.add_scripts(scripts)}
+
+    def reset(self):
+        with self.lock:
+            self.manager.reset_usage()
+            # Saved now, so the old usage in the file is never merged back in
+            self.manager.save_scripts()
+            self.file_mtime = self._mtime()
+            return {"reset": True}
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+        def do_GET(self):
+            self._handle(self._get)
+
+        def do_POST(self):
+            self._handle(self._post)
+
+        def _handle(self, route):
+            """Answer a failing endpoint with a 500 instead of dropping the connection"""
+            try:
+                route()
+            except Exception as e:
+                print(f"❌ {self.command} {self.path} failed: {e}")
+                self._send(500, {"error": str(e)})
+
+        def _get(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+
+            if url.path == "/health":
+                self._send(200, {"ok": True, "scripts": len(service.manager.data["scripts"])})
+            elif url.path == "/stats":
+                self._send(200, service.stats())
+            elif url.path == "/preview":
+                self._send(200, service.preview(int(query.get("count", ["5"])[0])))
+            else:
+                self._send(404, {"error": f"Unknown endpoint {url.path}"})
+
+        def _post(self):
+            try:
+                payload = self._body()
+            except ValueError as e:
+                self._send(400, {"error": f"Invalid JSON: {e}"})
+                return
+
+            if self.path == "/claim":
+                self._send(200, service.claim(payload.get("mark_used", True)))
+            elif self.path == "/insert":
+                self._send(200, service.insert(payload.get("scripts", [])))
+            elif self.path == "/reset":
+                self._send(200, service.reset())
+            elif self.path == "/flush":
+                service.flush()
+                self._send(200, {"flushed": True})
+            else:
+                self._send(404, {"error": f"Unknown endpoint {self.path}"})
+
+        def log_message(self, format, *args):
+            pass  # Keep the console for inventory events
+
+    return Handler
+
+
+def main():
+    service = ScriptService()
+    server = ThreadingHTTPServer((HOST, PORT), make_handler(service))
+
+    flusher = threading.Thread(target=service.flush_loop, daemon=True)
+    flusher.start()
+
+    def shutdown(signum, frame):
+        # serve_forever must be stopped from another thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+
+    stats = service.stats()
+    print(f"📚 Script service on http://{HOST}:{PORT} ({stats['unused']} unused of {stats['total']})")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop_event.set()
+        service.flush()
+        server.server_close()
+        print("💾 Script service stopped, inventory saved")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Speech Normalizer - Prepares scripts for TTS when they enter the database
+Stores speech-ready text, sentences and the TTS chunk plan next to each script
+so the video pipeline does no text processing at run time
+"""
+
+import re
+
+from tts_profiler import DEFAULT_CHUNK_SIZE
+
+NORMALIZER_VERSION = 1
+# Maximum characters per stored TTS chunk. Fixed so every host writes the same plan to the shared
+# scripts file; hosts profiled for another size re-split at synthesis (tasks/generateVoice.mjs)
+MAX_CHUNK_SIZE = DEFAULT_CHUNK_SIZE
+
+CTA_TEXT = "If this encouraged you, hit that like button and subscribe for daily Bible wisdom!"
+
+ONES = ['', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine',
+        'ten', 'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen',
+        'seventeen', 'eighteen', 'nineteen']
+TENS = ['', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+
+# Every cleanup rule from cleanScriptForSpeech folded into one alternation,
+# so the text is scanned once instead of once per rule
+_SPEECH_PATTERN = re.compile(
+    r"(?P<meta>"
+    r"Here is a compelling YouTube Shorts script for the Bible verse?[^.]*\.?\s*"
+    r"|Here's a compelling YouTube Shorts script for[^.]*\.?\s*"
+    r"|Here is a YouTube Shorts script based on[^.]*\.?\s*"
+    r"|Here's a YouTube Shorts script based on[^.]*\.?\s*"
+    r"|This is a compelling script for[^.]*\.?\s*"
+    r"|Here's a script for[^.]*\.?\s*"
+    r"|Here is a script for[^.]*\.?\s*"
+    r"|\AHere is[^:]*:\s*"
+    r"|\AHere's[^:]*:\s*)"
+    r"|(?P<marker>(?:HOOK|VERSE|MEANING|APPLICATION|CTA):\s*)"
+    r"|(?P<note>\[.*?\]|\(.*?\)|\{.*?\})"
+    r"|(?P<hashtag>#\w+)"
+    r"|(?P<ref>(?P<book>\w+)\s+(?P<chapter>\d+):(?P<verse>\d+)(?:-(?P<end>\d+))?)"
+    r"|(?P<quote>[\"“”'‘’])"
+    r"|(?P<space>\s+)",
+    re.IGNORECASE
+)
+
+_SENTENCE_GAP = re.compile(r"([.!?])\s*([A-Z])")
+_SENTENCE = re.compile(r"[^.!?]+[.!?]*")
+
+
+def number_to_words(num):
+    """Convert a chapter/verse number to spoken words (up to 999)"""
+    if num < 20:
+        return ONES[num]
+    if num < 100:
+        ten_digit, one_digit = divmod(num, 10)
+        return TENS[ten_digit] + (' ' + ONES[one_digit] if one_digit else '')
+    if num < 1000:
+        hundred, remainder = divmod(num, 100)
+        return ONES[hundred] + ' hundred' + (' ' + number_to_words(remainder) if remainder else '')
+    return str(num)
+
+
+def _replace_token(match):
+    kind = match.lastgroup
+    if kind == 'space':
+        return ' '
+    if match.group('ref') is not None:
+        spoken = f"{match.group('book')} {number_to_words(int(match.group('chapter')))} {number_to_words(int(match.group('verse')))}"
+        if match.group('end'):
+            spoken += f" to {number_to_words(int(match.group('end')))}"
+        return spoken
+    return ''
+
+
+def normalize_for_speech(text):
+    """
+    Python port of cleanScriptForSpeech in tasks/generateScript.mjs
+    Returns speech-ready text with markers, hashtags and quotes removed
+    """
+    cleaned = _SPEECH_PATTERN.sub(_replace_token, text)
+    cleaned = ' '.join(cleaned.split())
+    cleaned = _SENTENCE_GAP.sub(r'\1 \2', cleaned)
+
+    # Add call-to-action for likes and subscribes
+    lowered = cleaned.lower()
+    if 'like' not in lowered and 'subscribe' not in lowered:
+        if not cleaned.endswith(('.', '!', '?')):
+            cleaned += '.'
+        cleaned += ' ' + CTA_TEXT
+
+    return cleaned
+
+
+def split_sentences(text):
+    """Split speech text into sentences, keeping their punctuation"""
+    return [s.strip() for s in _SENTENCE.findall(text) if s.strip()]
+
+
+def plan_chunks(sentences, max_chunk_size=MAX_CHUNK_SIZE):
+    """Pack sentences into TTS chunks of at most max_chunk_size characters"""
+    chunks = []
+    current = ''
+
+    for sentence in sentences:
+        if not current:
+            current = sentence
+        elif len(current) + len(sentence) + 1 <= max_chunk_size:
+            current += ' ' + sentence
+        else:
+            chunks.append(current)
+            current = sentence
+
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def build_speech_fields(script_text, max_chunk_size=MAX_CHUNK_SIZE):
+    """Build the precomputed speech block stored alongside a raw script"""
+    text = normalize_for_speech(script_text)
+    sentences = split_sentences(text)
+
+    return {
+        "version": NORMALIZER_VERSION,
+        "text": text,
+        "sentences": sentences,
+        "chunks": plan_chunks(sentences, max_chunk_size),
+        "max_chunk_size": max_chunk_size
+    }
+
+
+def needs_speech_fields(script):
+    """Check if a script entry is missing (or has stale) speech fields"""
+    speech = script.get("speech")
+    return (not speech
+            or speech.get("version") != NORMALIZER_VERSION
+            or speech.get("max_chunk_size") != MAX_CHUNK_SIZE)
+
+
+def prepare_script(script):
+    """Attach speech fields to a script entry in place. Returns True if updated."""
+    if not needs_speech_fields(script):
+        return False
+    script["speech"] = build_speech_fields(script.get("script", ""))
+    return True
+
+
+if __name__ == "__main__":
+    from script_manager import ScriptManager
+
+    print("🗣️  Speech Normalizer")
+    print("=" * 30)
+
+    # Loading the manager attaches speech fields to any script missing them
+    manager = ScriptManager()
+    manager.save_scripts()
+    print(f"✅ Speech fields ready for {len(manager.data['scripts'])} script(s)")
@@ -0,0 +1,109 @@
+// 📺 Channel Scheduler - Plans and interleaves production across channels
+// Shared budgets (fresh footage, ElevenLabs characters, the run's time budget) are split by channel share;
+// jobs then run one at a time in fair-share order so no channel waits behind another's whole day
+
+import { forecastVideos, planDay } from '../utils/quotaService.mjs';
+
+/**
+ * Split `total` whole units across channels in proportion to their share (largest remainder)
+ * @returns {Object} channel id -> units
+ */
+export function apportion(total, channels) {
+    const result = {};
+    if (!Number.isFinite(total)) {
+        for (const channel of channels) result[channel.id] = Infinity;
+        return result;
+    }
+
+    const totalShare = channels.reduce((sum, channel) => sum + channel.share, 0);
+    const exact = channels.map(channel => ({ id: channel.id, units: total * channel.share / totalShare }));
+
+    let assigned = 0;
+    for (const { id, units } of exact) {
+        result[id] = Math.floor(units);
+        assigned += result[id];
+    }
+
+    // Hand out what flooring left over, largest fractions first
+    exact.sort((a, b) => (b.units % 1) - (a.units % 1));
+    for (let i = 0; i < total - assigned; i++) {
+        result[exact[i % exact.length].id]++;
+    }
+
+    return result;
+}
+
+/**
+ * Day plan for every channel: each plans against its own YouTube quota and its
+ * slice of the shared budgets
+ * @param {Array} channels - Resolved channels (utils/channels.mjs)
+ * @param {Object} options - planDay options shared by all channels (upload, stockAvailable, ...)
+ * @returns {Array} [{ channel, plan }]
+ */
+export async function planChannels(channels, options = {}) {
+    const shared = await forecastVideos(options);
+    const fresh = apportion(shared.freshVideos, channels);
+    const elevenLabs = apportion(shared.elevenLabsVideos, channels);
+
+    const timeBudgetMinutes = options.timeBudgetMinutes ?? (parseFloat(process.env.RUN_TIME_BUDGET_MINUTES) || Infinity);
+    const totalShare = channels.reduce((sum, channel) => sum + channel.share, 0);
+
+    const plans = [];
+    for (const channel of channels) {
+        const plan = await planDay(channel.dailyVideoCount, {
+            ...options,
+            channel,
+            timeBudgetMinutes: timeBudgetMinutes * channel.share / totalShare,
+            allowance: { freshVideos: fresh[channel.id], elevenLabsVideos: elevenLabs[channel.id] }
+        });
+        plans.push({ channel, plan });
+    }
+
+    return plans;
+}
+
+/**
+ * Fair-Share Scheduler - Picks the channel furthest behind its share for the next job
+ */
+export class FairShareScheduler {
+    constructor(plans) {
+        this.lanes = plans.map(({ channel, plan }) => ({
+            channel,
+            jobs: [...plan.videos],
+            served: 0
+        }));
+    }
+
+    /**
+     * Next { channel, job } to produce, or null when every channel is done.
+     * The lane with the lowest (served + 1) / share goes next; ties go to the larger share
+     */
+    next() {
+        let best = null;
+        for (const lane of this.lanes) {
+            if (lane.jobs.length === 0) continue;
+
+            const pass = (lane.served + 1) / lane.channel.share;
+            const bestPass = best && (best.served + 1) / best.channel.share;
+            if (!best || pass < bestPass || (pass === bestPass && lane.channel.share > best.channel.share)) {
+                best = lane;
+            }
+        }
+
+        if (!best) return null;
+        best.served++;
+        return { channel: best.channel, job: best.jobs.shift() };
+    }
+
+    /**
+     * Jobs served and still pending per channel
+     */
+    summary() {
+        return this.lanes.map(lane => ({
+            id: lane.channel.id,
+            name: lane.channel.name,
+            served: lane.served,
+            pending: lane.jobs.length
+        }));
+    }
+}
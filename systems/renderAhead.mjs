@@ -0,0 +1,274 @@
+// 📦 Render-Ahead Buffer
+// Keeps N fully rendered, validated videos ready so upload slots only dequeue and upload
+
+import fs from 'fs-extra';
+import { withFileLock } from '../utils/fileLock.mjs';
+
+const READY_QUEUE_FILE = './logs/ready_queue.json';
+
+// Buffer settings
+const DEFAULT_TARGET = parseInt(process.env.RENDER_AHEAD_TARGET) || 2;
+const DEFAULT_DISK_BUDGET_MB = parseInt(process.env.RENDER_AHEAD_DISK_BUDGET_MB) || 2048;
+const DEFAULT_VIDEO_SIZE_MB = 25; // Size estimate until we have rendered videos to average
+
+// Off-peak render windows (hours, end exclusive): the quiet hours before the 6 AM / 6 PM upload slots
+const DEFAULT_WINDOWS = process.env.RENDER_AHEAD_WINDOWS || '0-5,12-17';
+
+/**
+ * Parse "0-5,12-17" into [[0, 5], [12, 17]]
+ */
+function parseWindows(spec) {
+    return spec.split(',')
+        .map(range => range.trim().split('-').map(hour => parseInt(hour)))
+        .filter(([start, end]) => !isNaN(start) && !isNaN(end));
+}
+
+/**
+ * Render-Ahead System - Manages the persistent ready queue
+ */
+class RenderAheadSystem {
+    constructor() {
+        this.readyQueue = [];
+        this.target = DEFAULT_TARGET;
+        this.diskBudgetBytes = DEFAULT_DISK_BUDGET_MB * 1024 * 1024;
+        this.windows = parseWindows(DEFAULT_WINDOWS);
+        this.producing = false;
+    }
+
+    async initialize() {
+        await fs.ensureDir('./logs');
+        await this.loadReadyQueue();
+        await this.pruneMissingVideos();
+    }
+
+    /**
+     * Whether the given time falls in an off-peak render window
+     */
+    isOffPeak(time = new Date()) {
+        const hour = time.getHours();
+        return this.windows.some(([start, end]) => start <= end
+            ? hour >= start && hour < end
+            : hour >= start || hour < end); // Window wrapping midnight, e.g. 22-4
+    }
+
+    /**
+     * Bytes used by videos waiting in the queue
+     */
+    getQueueBytes() {
+        return this.readyQueue.reduce((total, item) => total + (item.sizeBytes || 0), 0);
+    }
+
+    /**
+     * Expected size of the next rendered video
+     */
+    estimateNextVideoBytes() {
+        if (this.readyQueue.length === 0) {
+            return DEFAULT_VIDEO_SIZE_MB * 1024 * 1024;
+        }
+        return this.getQueueBytes() / this.readyQueue.length;
+    }
+
+    /**
+     * Check whether another video should be rendered now, and why not if not
+     */
+    canProduce({ ignoreWindow = false } = {}) {
+        if (this.readyQueue.length >= this.target) {
+            return { ok: false, reason: `Ready queue full (${this.readyQueue.length}/${this.target})` };
+        }
+        if (this.getQueueBytes() + this.estimateNextVideoBytes() > this.diskBudgetBytes) {
+            return { ok: false, reason: 'Disk budget reached' };
+        }
+        if (!ignoreWindow && !this.isOffPeak()) {
+            return { ok: false, reason: 'Outside off-peak render window' };
+        }
+        return { ok: true };
+    }
+
+    /**
+     * Render videos until the queue is full, the disk budget is reached or the window closes
+     * @param {Function} produceVideo - Async function returning { scriptData, voiceData, assetData, videoResult }
+     * @param {Function} validateVideo - Async function returning true if the video file is usable
+     */
+    async fillReadyQueue(produceVideo, validateVideo, options = {}) {
+        if (this.producing) {
+            console.log('⏳ Render-ahead already running');
+            return 0;
+        }
+
+        this.producing = true;
+        let produced = 0;
+
+        try {
+            while (true) {
+                await this.loadReadyQueue(); // Uploads may have taken videos since the last pass
+                const check = this.canProduce(options);
+                if (!check.ok) {
+                    console.log(`📦 Render-ahead idle: ${check.reason}`);
+                    break;
+                }
+
+                console.log(`📦 Rendering ahead (${this.readyQueue.length + 1}/${this.target})...`);
+                const result = await produceVideo();
+
+                if (!(await validateVideo(result.videoResult.videoPath))) {
+                    console.log(`⚠️  Rendered video failed validation, deleting: ${result.videoResult.videoPath}`);
+                    await fs.remove(result.videoResult.videoPath);
+                    break;
+                }
+
+                await this.enqueue(result);
+                produced++;
+            }
+        } finally {
+            this.producing = false;
+        }
+
+        return produced;
+    }
+
+    /**
+     * Add a rendered video (with everything needed to upload it) to the ready queue
+     */
+    async enqueue({ scriptData, voiceData, assetData, videoResult }) {
+        const stats = await fs.stat(videoResult.videoPath);
+        const item = {
+            id: `ready_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+            renderedAt: new Date().toISOString(),
+            sizeBytes: stats.size,
+            verse: scriptData.verse,
+            scriptData,
+            voiceData,
+            assetData,
+            videoResult
+        };
+
+        // The upload process may have dequeued while we rendered: change the file's queue, not our copy
+        await withFileLock(READY_QUEUE_FILE, async () => {
+            await this.loadReadyQueue();
+            this.readyQueue.push(item);
+            await this.saveReadyQueue();
+        });
+
+        console.log(`✅ Added to ready queue: ${item.id} (${this.readyQueue.length}/${this.target} ready)`);
+        return item.id;
+    }
+
+    /**
+     * Take the oldest ready video off the queue, skipping any whose file disappeared
+     */
+    async dequeue() {
+        while (true) {
+            const item = await withFileLock(READY_QUEUE_FILE, async () => {
+                await this.loadReadyQueue();
+                const next = this.readyQueue.shift();
+                if (next) await this.saveReadyQueue();
+                return next;
+            });
+            if (!item) break;
+
+            if (await fs.pathExists(item.videoResult.videoPath)) {
+                console.log(`📦 Dequeued ready video: ${item.id} (${this.readyQueue.length} left)`);
+                return item;
+            }
+            console.log(`⚠️  Ready video missing on disk, skipping: ${item.videoResult.videoPath}`);
+        }
+        return null;
+    }
+
+    /**
+     * Drop queue entries whose video file no longer exists
+     */
+    async pruneMissingVideos() {
+        await withFileLock(READY_QUEUE_FILE, async () => {
+            await this.loadReadyQueue();
+            const before = this.readyQueue.length;
+            const present = [];
+
+            for (const item of this.readyQueue) {
+                if (await fs.pathExists(item.videoResult.videoPath)) {
+                    present.push(item);
+                }
+            }
+
+            this.readyQueue = present;
+            if (present.length !== before) {
+                console.log(`🧹 Removed ${before - present.length} missing video(s) from ready queue`);
+                await this.saveReadyQueue();
+            }
+        });
+    }
+
+    /**
+     * Get ready queue status
+     */
+    getQueueStatus() {
+        return {
+            ready: this.readyQueue.length,
+            target: this.target,
+            usedMB: Math.round(this.getQueueBytes() / (1024 * 1024)),
+            budgetMB: Math.round(this.diskBudgetBytes / (1024 * 1024)),
+            offPeak: this.isOffPeak(),
+            videoPaths: this.readyQueue.map(item => item.videoResult.videoPath)
+        };
+    }
+
+    /**
+     * Load ready queue from disk
+     */
+    async loadReadyQueue() {
+        try {
+            this.readyQueue = [];
+            if (await fs.pathExists(READY_QUEUE_FILE)) {
+                const data = await fs.readJson(READY_QUEUE_FILE);
+                this.readyQueue = data.readyQueue || [];
+            }
+        } catch (error) {
+            console.log('⚠️  Could not load ready queue, starting fresh');
+            this.readyQueue = [];
+        }
+    }
+
+    /**
+     * Save ready queue to disk (write-then-rename so a crash never leaves a torn file)
+     */
+    async saveReadyQueue() {
+        try {
+            const data = {
+                readyQueue: this.readyQueue,
+                lastUpdated: new Date().toISOString()
+            };
+            const tempFile = `${READY_QUEUE_FILE}.tmp`;
+            await fs.writeJson(tempFile, data, { spaces: 2 });
+            await fs.move(tempFile, READY_QUEUE_FILE, { overwrite: true });
+        } catch (error) {
+            console.error('❌ Could not save ready queue:', error.message);
+        }
+    }
+}
+
+// Global instance for easy access
+const renderAheadSystem = new RenderAheadSystem();
+
+// Export individual functions for easy use
+export async function fillReadyQueue(produceVideo, validateVideo, options = {}) {
+    await renderAheadSystem.initialize();
+    return await renderAheadSystem.fillReadyQueue(produceVideo, validateVideo, options);
+}
+
+export async function takeReadyVideo() {
+    await renderAheadSystem.initialize();
+    return await renderAheadSystem.dequeue();
+}
+
+export async function getReadyQueueStatus() {
+    await renderAheadSystem.initialize();
+    return renderAheadSystem.getQueueStatus();
+}
+
+export async function showReadyQueueStats() {
+    const status = await getReadyQueueStatus();
+
+    console.log(`📦 Ready videos: ${status.ready}/${status.target}`);
+    console.log(`💾 Disk used: ${status.usedMB}/${status.budgetMB} MB`);
+    console.log(`🌙 Off-peak window: ${status.offPeak ? 'open' : 'closed'}`);
+}
@@ -5,6 +5,7 @@ import fs from 'fs-extra';
 import path from 'path';
 import { exec } from 'child_process';
 import { promisify } from 'util';
+import { MetricsStore, increment } from '../utils/metricsStore.mjs';
 
 const execAsync = promisify(exec);
 
@@ -14,6 +15,16 @@ const SCHEDULE_LOG_FILE = './logs/upload_schedule.json';
 // Default upload schedule (6 AM and 6 PM)
 const DEFAULT_SCHEDULE = [6, 18]; // Hours in 24-hour format
 
+// Recovery history (queued/missed/attempt/succeeded/failed events); the queue file only holds pending items
+const recoveryMetrics = new MetricsStore('upload_recovery', {
+    initial: () => ({ events: {}, lastEventAt: null }),
+    reduce: (stats, event) => {
+        increment(stats.events, event.event);
+        stats.lastEventAt = event.timestamp;
+        return stats;
+    }
+});
+
 /**
  * Recovery System - Manages missed uploads and retry logic
  */
@@ -112,6 +123,7 @@ class UploadRecoverySystem {
 
         this.retryQueue.push(queueItem);
         await this.saveRetryQueue();
+        await recoveryMetrics.append({ event: 'queued', id: queueItem.id, reason });
         
         console.log(`📝 Added to retry queue: ${queueItem.id} (${reason})`);
         await this.showNotification(`Upload failed: ${reason}. Added to retry queue.`, 'warning');
@@ -135,6 +147,7 @@ class UploadRecoverySystem {
 
         this.retryQueue.push(queueItem);
         await this.saveRetryQueue();
+        await recoveryMetrics.append({ event: 'missed', id: queueItem.id, scheduledFor: queueItem.scheduledFor });
         
         console.log(`📋 Added missed upload to queue: ${missedTime.toLocaleString()}`);
         
@@ -167,6 +180,7 @@ class UploadRecoverySystem {
                 item.attempts++;
                 
                 console.log(`🔄 Processing queue item: ${item.id} (attempt ${item.attempts}/${item.maxAttempts})`);
+                await recoveryMetrics.append({ event: 'attempt', id: item.id, attempt: item.attempts });
                 
                 // For now, just mark as processed and remove from queue
                 // TODO: Implement proper retry logic without recursion
@@ -175,6 +189,7 @@ class UploadRecoverySystem {
                 // Remove from queue 
                 this.retryQueue = this.retryQueue.filter(q => q.id !== item.id);
                 successful++;
+                await recoveryMetrics.append({ event: 'succeeded', id: item.id, attempts: item.attempts });
                 console.log(`✅ Queue item removed from retry queue: ${item.id}`);
                 
             } catch (error) {
@@ -182,6 +197,7 @@ class UploadRecoverySystem {
                 
                 if (item.attempts >= item.maxAttempts) {
                     failed++;
+                    await recoveryMetrics.append({ event: 'failed', id: item.id, error: error.message });
                     console.log(`💀 Queue item exceeded max attempts: ${item.id}`);
                     await this.showNotification(`Upload permanently failed after ${item.maxAttempts} attempts.`, 'error');
                     
@@ -296,7 +312,7 @@ class UploadRecoverySystem {
     }
 
     /**
-     * Save retry queue to disk
+     * Save retry queue to disk (write-then-rename so a crash never leaves a torn file)
      */
     async saveRetryQueue() {
         try {
@@ -304,7 +320,9 @@ class UploadRecoverySystem {
                 retryQueue: this.retryQueue,
                 lastUpdated: new Date().toISOString()
             };
-            await fs.writeJson(RECOVERY_LOG_FILE, data, { spaces: 2 });
+            const tempFile = `${RECOVERY_LOG_FILE}.tmp`;
+            await fs.writeJson(tempFile, data, { spaces: 2 });
+            await fs.move(tempFile, RECOVERY_LOG_FILE, { overwrite: true });
         } catch (error) {
             console.error('❌ Could not save retry queue:', error.message);
         }
@@ -396,9 +414,18 @@ export async function cleanupOldRetries() {
     return cleanedCount;
 }
 
+export async function getRecoveryStats() {
+    return await recoveryMetrics.getAggregates();
+}
+
 export async function showRetryStats() {
     await recoverySystem.initialize();
     const status = recoverySystem.getQueueStatus();
+    const history = await getRecoveryStats();
+    
+    const events = history.events;
+    console.log(`📜 Recovery history: ${events.queued || 0} queued, ${events.missed || 0} missed, ` +
+        `${events.succeeded || 0} recovered, ${events.failed || 0} permanently failed`);
     
     if (status.total === 0) {
         console.log('📭 Retry queue is empty');
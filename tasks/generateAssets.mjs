@@ -6,6 +6,8 @@ import fs from 'fs-extra';
 import path from 'path';
 import dotenv from 'dotenv';
 import { DailyUsageTracker, getRandomExistingStockVideo } from '../utils/dailyUsageTracker.mjs';
+import { getArtifactStats, registerArtifact } from '../utils/artifactStore.mjs';
+import { acquireQuota } from '../utils/quotaService.mjs';
 
 dotenv.config();
 
@@ -29,12 +31,17 @@ const VIDEO_CATEGORIES = {
   urban: ['city', 'architecture', 'modern', 'lifestyle', 'journey', 'path', 'street']
 };
 
-export async function generateAssets(contentIdea, scriptData) {
+/**
+ * @param {Object} options - footage: 'fresh' | 'reused' from the day plan (omit to decide here)
+ */
+export async function generateAssets(contentIdea, scriptData, options = {}) {
   try {
     const usageTracker = new DailyUsageTracker();
     
-    // Check if we should use Pixabay or reuse existing videos
-    const canUsePixabay = await usageTracker.canUsePixabay();
+    // Follow the day plan when there is one, otherwise check if we should use Pixabay or reuse existing videos
+    const canUsePixabay = options.footage
+      ? options.footage === 'fresh'
+      : await usageTracker.canUsePixabay();
     
     if (!canUsePixabay) {
       // Try to reuse existing stock video
@@ -120,9 +127,8 @@ export async function generateAssets(contentIdea, scriptData) {
 
 async function getStockVideoCount() {
   try {
-    const outputDir = path.join(process.cwd(), 'output');
-    const files = await fs.readdir(outputDir);
-    return files.filter(file => file.startsWith('stock_') && file.endsWith('.mp4')).length;
+    const stats = await getArtifactStats();
+    return stats.stockCount;
   } catch (error) {
     return 0;
   }
@@ -216,6 +222,9 @@ async function searchPixabayVideos(searchTerms) {
   
   for (const term of searchTerms) {
     try {
+      // Waits for the Pixabay rate-limit bucket instead of a fixed delay
+      await acquireQuota('pixabay_requests', 1);
+      
       const response = await axios.get('https://pixabay.com/api/videos/', {
         params: {
           key: apiKey,
@@ -235,9 +244,6 @@ async function searchPixabayVideos(searchTerms) {
         videos.push(...response.data.hits);
       }
       
-      // Small delay to respect rate limits
-      await new Promise(resolve => setTimeout(resolve, 500));
-      
     } catch (error) {
       console.warn(`⚠️  Failed to search for "${term}":`, error.message);
     }
@@ -327,7 +333,7 @@ async function downloadVideo(video) {
     writer.on('finish', () => {
       console.log('✅ Video downloaded successfully');
       console.log('💾 Saved to:', videoPath);
-      resolve(videoPath);
+      registerArtifact(videoPath, 'stock').then(() => resolve(videoPath));
     });
     writer.on('error', reject);
   });
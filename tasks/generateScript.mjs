@@ -5,6 +5,7 @@ import fs from 'fs-extra';
 import path from 'path';
 import dotenv from 'dotenv';
 import { ScriptManager } from '../pipeline_integration.mjs';
+import { registerArtifact } from '../utils/artifactStore.mjs';
 
 dotenv.config();
 
@@ -175,9 +176,12 @@ function convertNumberToWords(num) {
   return num.toString(); // Fallback for larger numbers
 }
 
-export async function generateScript(contentIdea) {
+/**
+ * @param {Object} options - channel: draw from that channel's inventory (utils/channels.mjs)
+ */
+export async function generateScript(contentIdea, { channel = null } = {}) {
   // Initialize script manager
-  const scriptManager = new ScriptManager();
+  const scriptManager = ScriptManager.forChannel(channel);
   
   // Check script supply status
   const supplyCheck = await scriptManager.checkScriptSupply();
@@ -195,8 +199,8 @@ export async function generateScript(contentIdea) {
     const script = await scriptManager.getNextScript(true); // Mark as used
     
     if (script) {
-      // Clean the script - remove formatting markers
-      const cleanScript = cleanScriptForSpeech(script.script);
+      // Use speech text precomputed at ingestion (speech_normalizer.py), clean on the fly for older entries
+      const cleanScript = script.speech?.text || cleanScriptForSpeech(script.script);
       
       // Save script to output directory for compatibility
       const outputDir = path.join(process.cwd(), 'output');
@@ -204,6 +208,7 @@ export async function generateScript(contentIdea) {
       const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
       const scriptPath = path.join(outputDir, `script_${timestamp}.txt`);
       await fs.writeFile(scriptPath, cleanScript, 'utf8');
+      await registerArtifact(scriptPath, 'script');
       
       console.log('✅ Using pre-generated script from database');
       console.log('📝 Script ID:', script.id);
@@ -217,6 +222,8 @@ export async function generateScript(contentIdea) {
         angle: 'Pre-generated content',
         keywords: script.keywords || [],
         scriptId: script.id,
+        ttsChunks: script.speech?.chunks || null,
+        ttsChunkSize: script.speech?.max_chunk_size || null,
         supplyStatus: supplyCheck
       };
     }
@@ -249,6 +256,7 @@ export async function generateScript(contentIdea) {
     const scriptPath = path.join(outputDir, `script_${timestamp}.txt`);
     
     await fs.writeFile(scriptPath, cleanScript, 'utf8');
+    await registerArtifact(scriptPath, 'script');
     
     console.log('✅ Fallback script created');
     console.log('📝 Preview:', cleanScript.substring(0, 100) + '...');
@@ -298,6 +306,7 @@ export async function generateScript(contentIdea) {
     await fs.ensureDir(outputDir);
     const scriptPath = path.join(outputDir, 'script_fallback.txt');
     await fs.writeFile(scriptPath, fallbackScript, 'utf8');
+    await registerArtifact(scriptPath, 'script');
     
     return {
       script: fallbackScript,
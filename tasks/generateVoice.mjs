@@ -3,26 +3,76 @@
 
 import axios from 'axios';
 import fs from 'fs-extra';
+import os from 'os';
 import path from 'path';
 import FormData from 'form-data';
 import { spawn } from 'child_process';
 import dotenv from 'dotenv';
+import { registerArtifact } from '../utils/artifactStore.mjs';
+import { narrationKey, getCachedNarration, cacheNarration } from '../utils/audioCache.mjs';
+import { canSpendQuota, spendQuota } from '../utils/quotaService.mjs';
 
 dotenv.config();
 
-export async function generateVoice(scriptData) {
-  const { script, scriptPath } = scriptData;
+// Python executable with Chatterbox installed (e.g. the project's .venv interpreter)
+const PYTHON_EXE = process.env.PYTHON_EXE || 'python';
+
+// Host calibration written by tts_profiler.py; without it the old fixed chunk size and timeout apply
+const TTS_PROFILE_FILE = path.join(process.cwd(), 'logs', 'tts_profile.json');
+const DEFAULT_MAX_CHUNK_SIZE = 200;
+const DEFAULT_TIMEOUT_MS = 900000; // 15 minutes
+const MIN_TIMEOUT_MS = 120000;
+const TTS_TIMEOUT_FACTOR = parseFloat(process.env.TTS_TIMEOUT_FACTOR || '3'); // Timeout = expected synthesis time x factor
+
+let ttsProfile;
+
+// Python runs in their own process group miss the terminal's Ctrl-C, so they go down with us
+const runningPython = new Set();
+process.on('exit', () => runningPython.forEach(killProcessTree));
+
+export async function generateVoice(scriptData, options = {}) {
   const outputDir = path.join(process.cwd(), 'output');
   await fs.ensureDir(outputDir);
   
   const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
   const audioPath = path.join(outputDir, `narration_${timestamp}.wav`);
   
+  // Channels sharing a verse (or a re-run of one) reuse the narration instead of synthesizing it again
+  const cacheKey = narrationKey(scriptData.script, { voice: options.voice, voicePath: getCustomVoicePath() });
+  let result = await getCachedNarration(cacheKey, audioPath);
+  if (result) {
+    console.log('🎙️ Using cached narration');
+  } else {
+    result = await synthesizeVoice(scriptData, audioPath, options);
+    // The key stands for the planned engine; audio from a fallback engine must not be served under it
+    const plannedEngine = options.voice === 'elevenlabs' && process.env.ELEVENLABS_API_KEY ? 'elevenlabs' : 'chatterbox-python';
+    if (result.method.startsWith(plannedEngine)) {
+      await cacheNarration(cacheKey, result);
+    }
+  }
+  
+  await registerArtifact(result.audioPath, 'narration');
+  return result;
+}
+
+async function synthesizeVoice(scriptData, audioPath, options = {}) {
+  const { script, scriptPath, ttsChunks, ttsChunkSize } = scriptData;
+  
+  // The day plan sends overflow videos straight to ElevenLabs when Chatterbox would not finish in time
+  if (options.voice === 'elevenlabs' && process.env.ELEVENLABS_API_KEY) {
+    try {
+      console.log('🔊 Using ElevenLabs (planned)...');
+      return await generateWithElevenLabs(script, audioPath);
+    } catch (error) {
+      console.log('❌ Planned ElevenLabs voice failed, trying Chatterbox:', error.message);
+    }
+  }
+  
   // Try Chatterbox Python library first (primary method)
   try {
     console.log('🔊 Using Chatterbox Python library...');
     console.log('⏳ This may take 5-15 minutes for AI voice generation on laptop...');
-    const result = await generateWithChatterboxPython(script, audioPath);
+    const result = await generateWithChatterboxPython(script, audioPath, ttsChunks, ttsChunkSize, options.onChunk);
     if (result) return result;
   } catch (error) {
     console.log('❌ Chatterbox Python failed:', error.message);
@@ -54,17 +104,68 @@ export async function generateVoice(scriptData) {
   return createPlaceholderAudio(audioPath);
 }
 
-async function generateWithChatterboxPython(script, audioPath) {
+/**
+ * Saved TTS profile for this host, or null (missing, outdated or taken on another machine)
+ */
+async function loadTtsProfile() {
+  if (ttsProfile === undefined) {
+    ttsProfile = null;
+    try {
+      const profile = await fs.readJson(TTS_PROFILE_FILE);
+      if (profile.version === 1 && profile.host === os.hostname() && profile.cpu_count === os.cpus().length) {
+        ttsProfile = profile;
+      }
+    } catch {
+      // Host not profiled yet
+    }
+  }
+  return ttsProfile;
+}
+
+/**
+ * Expected wall-clock seconds to synthesize chunks, model load included
+ */
+function estimateSynthesisSeconds(profile, chunks, workers = 1) {
+  const threads = workers > 1 ? profile.recommended.threads_per_worker : profile.cpu_count;
+  const stats = profile.threads[threads] || profile.threads[profile.recommended.threads_per_worker];
+  const costs = chunks.map(chunk => stats.fixed_seconds + stats.seconds_per_char * chunk.length);
+  const total = costs.reduce((sum, cost) => sum + cost, 0);
+  
+  // Balanced shards finish together, but never before the longest chunk
+  return profile.model_load_seconds + Math.max(Math.max(...costs), total / Math.max(1, workers));
+}
+
+/**
+ * Per-job timeout proportional to the expected synthesis time on this host
+ */
+function synthesisTimeoutMs(profile, chunks, workers = 1) {
+  if (!profile) {
+    return DEFAULT_TIMEOUT_MS;
+  }
+  return Math.max(MIN_TIMEOUT_MS, Math.round(estimateSynthesisSeconds(profile, chunks, workers) * TTS_TIMEOUT_FACTOR * 1000));
+}
+
+async function generateWithChatterboxPython(script, audioPath, ttsChunks = null, ttsChunkSize = null, onChunk = null) {
   try {
-    // Check script length and use chunking for longer texts
-    const MAX_CHUNK_SIZE = 200; // Maximum characters per chunk
+    // Chunk size comes from the host profile so per-chunk overhead stays small relative to synthesis
+    const profile = await loadTtsProfile();
+    const maxChunkSize = profile?.recommended.max_chunk_size || DEFAULT_MAX_CHUNK_SIZE;
+    
+    if (profile) {
+      const expectedMinutes = estimateSynthesisSeconds(profile, [script], 1) / 60;
+      console.log(`⏳ Expected ~${expectedMinutes.toFixed(1)} minutes on this host (tts_profile.json)`);
+    }
     
-    if (script.length <= MAX_CHUNK_SIZE) {
+    if (script.length <= maxChunkSize) {
       console.log(`📝 Script is ${script.length} chars - processing as single chunk`);
-      return await generateSingleChunk(script, audioPath);
+      const result = await generateSingleChunk(script, audioPath, synthesisTimeoutMs(profile, [script]));
+      if (onChunk) {
+        await onChunk({ index: 0, audioPath, total: 1 });
+      }
+      return result;
     } else {
       console.log(`📝 Script is ${script.length} chars - using chunking approach`);
-      return await generateChunkedScript(script, audioPath);
+      return await generateChunkedScript(script, audioPath, { ttsChunks, ttsChunkSize, onChunk, profile, maxChunkSize });
     }
     
   } catch (error) {
@@ -73,7 +174,7 @@ async function generateWithChatterboxPython(script, audioPath) {
   }
 }
 
-async function generateSingleChunk(script, audioPath) {
+async function generateSingleChunk(script, audioPath, timeoutMs = DEFAULT_TIMEOUT_MS, postProcess = true) {
   try {
     // Create a temporary Python script to run Chatterbox
     const tempDir = path.join(process.cwd(), 'temp');
@@ -83,6 +184,7 @@ async function generateSingleChunk(script, audioPath) {
 import sys
 import os
 sys.path.append('${path.join(process.cwd(), 'chatterbox', 'src').replace(/\\/g, '\\\\')}')
+sys.path.append('${process.cwd().replace(/\\/g, '\\\\')}')
 
 import torchaudio as ta
 from chatterbox.tts import ChatterboxTTS
@@ -110,11 +212,15 @@ def generate_speech():
             print("Custom voice not found, using default voice")
             wav = model.generate(text)
         
-        # Save audio
+        # Save audio (trimmed, normalized and faded in memory unless it is one chunk of several)
         output_path = "${audioPath.replace(/\\/g, '\\\\')}"
-        ta.save(output_path, wav, model.sr)
-        
-        print(f"SUCCESS:{model.sr}:{len(wav[0]) / model.sr:.2f}")
+        if ${postProcess ? 'True' : 'False'}:
+            from audio_postprocess import postprocess_to_file
+            sample_rate, report = postprocess_to_file(wav.mean(dim=0).numpy(), model.sr, output_path)
+            print(f"SUCCESS:{sample_rate}:{report['duration']:.2f}")
+        else:
+            ta.save(output_path, wav, model.sr)
+            print(f"SUCCESS:{model.sr}:{len(wav[0]) / model.sr:.2f}")
         
     except Exception as e:
         print(f"ERROR:{str(e)}")
@@ -127,11 +233,8 @@ if __name__ == "__main__":
     const scriptPath = path.join(tempDir, `chatterbox_gen_${Date.now()}.py`);
     await fs.writeFile(scriptPath, pythonScript);
     
-    // Get Python executable path
-    const pythonExe = "C:/Users/mrtig/Desktop/Bible Shorts AutoUploader/.venv/Scripts/python.exe";
-    
     // Run the Python script
-    const result = await runPythonScript(pythonExe, scriptPath);
+    const result = await runPythonScript(PYTHON_EXE, scriptPath, [], null, timeoutMs);
     
     // Cleanup
     await fs.remove(scriptPath);
@@ -144,7 +247,8 @@ if __name__ == "__main__":
         audioPath,
         duration: result.duration,
         sampleRate: result.sampleRate,
-        method: 'chatterbox-python'
+        method: 'chatterbox-python',
+        postProcess: result.postProcess
       };
     } else {
       throw new Error(result.error);
@@ -156,72 +260,49 @@ if __name__ == "__main__":
   }
 }
 
-async function generateChunkedScript(script, audioPath) {
+async function generateChunkedScript(script, audioPath, { ttsChunks = null, ttsChunkSize = null, onChunk = null, profile = null, maxChunkSize = DEFAULT_MAX_CHUNK_SIZE } = {}) {
   try {
-    // Split script into sentences
-    const sentences = script.split(/[.!?]+/).filter(s => s.trim().length > 0);
-    const chunks = [];
-    let currentChunk = '';
-    
-    for (const sentence of sentences) {
-      const trimmedSentence = sentence.trim();
-      if (currentChunk.length + trimmedSentence.length + 1 <= 200) {
-        currentChunk += (currentChunk ? '. ' : '') + trimmedSentence;
-      } else {
-        if (currentChunk) {
-          chunks.push(currentChunk + '.');
-        }
-        currentChunk = trimmedSentence;
-      }
-    }
-    
-    if (currentChunk) {
-      chunks.push(currentChunk + '.');
-    }
+    // Prefer the chunk plan precomputed at ingestion time, unless it was planned for another chunk size
+    const precomputed = ttsChunks?.length && ttsChunkSize === maxChunkSize;
+    const chunks = precomputed ? ttsChunks : splitIntoChunks(script, maxChunkSize);
     
     console.log(`📝 Split into ${chunks.length} chunks:`);
     chunks.forEach((chunk, i) => console.log(`   ${i + 1}: "${chunk.substring(0, 50)}..."`));
     
-    // Generate audio for each chunk
-    const tempDir = path.join(process.cwd(), 'temp');
-    await fs.ensureDir(tempDir);
-    const chunkFiles = [];
-    
-    for (let i = 0; i < chunks.length; i++) {
-      console.log(`🔊 Processing chunk ${i + 1}/${chunks.length}...`);
-      
-      const chunkPath = path.join(tempDir, `chunk_${Date.now()}_${i}.wav`);
-      await generateSingleChunk(chunks[i], chunkPath);
-      chunkFiles.push(chunkPath);
-      
-      // Small delay between chunks
-      await new Promise(resolve => setTimeout(resolve, 1000));
+    // Hand each finished chunk to the caller (incremental render) without waiting on it
+    const chunkConsumers = [];
+    const notifyChunk = onChunk
+      ? (index, chunkPath) => chunkConsumers.push(Promise.resolve(onChunk({ index, audioPath: chunkPath, total: chunks.length })))
+      : null;
+    
+    // Shard chunks across a process pool unless disabled, falling back to sequential synthesis.
+    // Either way the joined audio is trimmed, normalized and faded by audio_postprocess.py.
+    let result = null;
+    if (process.env.TTS_POOL !== 'false') {
+      try {
+        result = await generateChunksWithPool(chunks, audioPath, notifyChunk, chunkConsumers, profile);
+      } catch (error) {
+        console.log('⚠️  TTS worker pool failed, synthesizing chunks sequentially:', error.message);
+      }
     }
     
-    // Concatenate audio files using FFmpeg
-    console.log('🔗 Concatenating audio chunks...');
-    await concatenateAudioFiles(chunkFiles, audioPath);
-    
-    // Cleanup chunk files
-    for (const chunkFile of chunkFiles) {
-      await fs.remove(chunkFile);
+    if (!result) {
+      result = await generateChunksSequentially(chunks, audioPath, notifyChunk, chunkConsumers, profile);
     }
     
-    // Get audio info
-    const duration = await getAudioDuration(audioPath);
-    
-    // Remove silence and get final duration
-    const cleanedPath = await removeSilenceFromAudio(audioPath);
-    const finalDuration = await getAudioDuration(cleanedPath);
-    
     console.log('✅ Chunked voice generation complete');
-    console.log('💾 Saved to:', cleanedPath);
+    console.log('💾 Saved to:', audioPath);
+    if (result.postProcess) {
+      const { trim_start, trim_end, loudness_before, gain_db } = result.postProcess;
+      console.log(`🔇 Trimmed ${trim_start}s + ${trim_end}s of silence, ${loudness_before} LUFS ${gain_db >= 0 ? '+' : ''}${gain_db} dB`);
+    }
     
     return {
-      audioPath: cleanedPath,
-      duration: finalDuration,
-      sampleRate: 24000, // Chatterbox default
-      method: 'chatterbox-python-chunked'
+      audioPath,
+      duration: result.duration,
+      sampleRate: result.sampleRate,
+      method: 'chatterbox-python-chunked',
+      postProcess: result.postProcess
     };
     
   } catch (error) {
@@ -230,34 +311,167 @@ async function generateChunkedScript(script, audioPath) {
   }
 }
 
-function runPythonScript(pythonExe, scriptPath) {
-  return new Promise((resolve, reject) => {
-    // Create the command string with proper quoting
-    const command = `"${pythonExe}" "${scriptPath}"`;
+async function generateChunksWithPool(chunks, audioPath, notifyChunk = null, chunkConsumers = [], profile = null) {
+  console.log(`🧵 Synthesizing ${chunks.length} chunks with TTS worker pool...`);
+  
+  const tempDir = path.join(process.cwd(), 'temp');
+  await fs.ensureDir(tempDir);
+  const timestamp = Date.now();
+  const chunksFile = path.join(tempDir, `chunks_${timestamp}.json`);
+  await fs.writeJson(chunksFile, chunks);
+  
+  const poolScript = path.join(process.cwd(), 'tts_worker_pool.py');
+  const args = ['--chunks-file', chunksFile, '--output', audioPath, '--voice', getCustomVoicePath()];
+  
+  // Workers publish each chunk as "CHUNK:<index>:<path>" when a consumer is waiting for them
+  let chunkDir = null;
+  let onLine = null;
+  if (notifyChunk) {
+    chunkDir = path.join(tempDir, `pool_chunks_${timestamp}`);
+    await fs.ensureDir(chunkDir);
+    args.push('--chunk-dir', chunkDir);
+    onLine = (line) => {
+      if (line.startsWith('CHUNK:')) {
+        const [, index, ...chunkPath] = line.split(':');
+        notifyChunk(parseInt(index), chunkPath.join(':'));
+      }
+    };
+  }
+  
+  try {
+    // tts_worker_pool.py plans workers from the same profile (fewer if memory is short - the timeout factor covers that)
+    const workers = profile ? Math.min(profile.recommended.workers, chunks.length) : 1;
+    const result = await runPythonScript(PYTHON_EXE, poolScript, args, onLine, synthesisTimeoutMs(profile, chunks, workers));
+    if (!result.success) {
+      throw new Error(result.error);
+    }
+    console.log(`✅ Worker pool synthesized ${result.duration}s of audio`);
+    return result;
+  } finally {
+    await Promise.allSettled(chunkConsumers);
+    await fs.remove(chunksFile);
+    if (chunkDir) {
+      await fs.remove(chunkDir);
+    }
+  }
+}
+
+async function generateChunksSequentially(chunks, audioPath, notifyChunk = null, chunkConsumers = [], profile = null) {
+  // Generate audio for each chunk
+  const tempDir = path.join(process.cwd(), 'temp');
+  await fs.ensureDir(tempDir);
+  const chunkFiles = [];
+  
+  for (let i = 0; i < chunks.length; i++) {
+    console.log(`🔊 Processing chunk ${i + 1}/${chunks.length}...`);
+    
+    const chunkPath = path.join(tempDir, `chunk_${Date.now()}_${i}.wav`);
+    await generateSingleChunk(chunks[i], chunkPath, synthesisTimeoutMs(profile, [chunks[i]]), false);
+    chunkFiles.push(chunkPath);
+    notifyChunk?.(i, chunkPath);
     
-    const process = spawn(command, [], {
+    // Small delay between chunks
+    await new Promise(resolve => setTimeout(resolve, 1000));
+  }
+  
+  // Concatenate audio files using FFmpeg
+  console.log('🔗 Concatenating audio chunks...');
+  await concatenateAudioFiles(chunkFiles, audioPath);
+  
+  // Cleanup chunk files once any consumer has finished with them
+  await Promise.allSettled(chunkConsumers);
+  for (const chunkFile of chunkFiles) {
+    await fs.remove(chunkFile);
+  }
+  
+  // One in-memory pass over the joined audio: trim, normalize, fade
+  const result = await runPythonScript(PYTHON_EXE, path.join(process.cwd(), 'audio_postprocess.py'), ['--input', audioPath]);
+  if (result.success) {
+    return result;
+  }
+  
+  console.log('⚠️  Audio post-processing failed, using raw audio:', result.error);
+  return {
+    duration: await getAudioDuration(audioPath),
+    sampleRate: 24000, // Chatterbox default
+    postProcess: null
+  };
+}
+
+function getCustomVoicePath() {
+  // Same resolution as the inline Chatterbox script: env override, else chatterbox/your_voice.wav
+  const customVoiceEnv = process.env.CHATTERBOX_CUSTOM_VOICE_PATH;
+  if (customVoiceEnv) {
+    return path.join(process.cwd(), customVoiceEnv.replace('./', ''));
+  }
+  return path.join(process.cwd(), 'chatterbox', 'your_voice.wav');
+}
+
+function splitIntoChunks(script, maxChunkSize = DEFAULT_MAX_CHUNK_SIZE) {
+  // Split script into sentences
+  const sentences = script.split(/[.!?]+/).filter(s => s.trim().length > 0);
+  const chunks = [];
+  let currentChunk = '';
+  
+  for (const sentence of sentences) {
+    const trimmedSentence = sentence.trim();
+    if (currentChunk.length + trimmedSentence.length + 1 <= maxChunkSize) {
+      currentChunk += (currentChunk ? '. ' : '') + trimmedSentence;
+    } else {
+      if (currentChunk) {
+        chunks.push(currentChunk + '.');
+      }
+      currentChunk = trimmedSentence;
+    }
+  }
+  
+  if (currentChunk) {
+    chunks.push(currentChunk + '.');
+  }
+  
+  return chunks;
+}
+
+function runPythonScript(pythonExe, scriptPath, args = [], onLine = null, timeoutMs = DEFAULT_TIMEOUT_MS) {
+  return new Promise((resolve, reject) => {
+    // No shell in between, so a timeout reaches Python itself. On POSIX it leads its own
+    // process group, which also takes down the worker processes tts_worker_pool.py starts
+    const child = spawn(pythonExe, [scriptPath, ...args], {
       stdio: ['pipe', 'pipe', 'pipe'],
-      shell: true
+      detached: process.platform !== 'win32'
     });
+    runningPython.add(child);
     
     let stdout = '';
     let stderr = '';
+    let pendingLine = '';
     
-    process.stdout.on('data', (data) => {
+    child.stdout.on('data', (data) => {
       stdout += data.toString();
+      
+      if (onLine) {
+        const lines = (pendingLine + data.toString()).split(/\r?\n/);
+        pendingLine = lines.pop();
+        lines.forEach(line => onLine(line.trim()));
+      }
     });
     
-    process.stderr.on('data', (data) => {
+    child.stderr.on('data', (data) => {
       stderr += data.toString();
     });
     
-    process.on('close', (code) => {
+    child.on('close', (code) => {
+      clearTimeout(timer);
+      runningPython.delete(child);
       if (code === 0 && stdout.includes('SUCCESS:')) {
-        const parts = stdout.trim().split('\n').find(line => line.startsWith('SUCCESS:')).split(':');
+        const lines = stdout.trim().split('\n');
+        const parts = lines.find(line => line.startsWith('SUCCESS:')).split(':');
+        const report = lines.find(line => line.startsWith('POSTPROCESS:'));
         resolve({
           success: true,
           sampleRate: parseInt(parts[1]),
-          duration: parseFloat(parts[2])
+          duration: parseFloat(parts[2]),
+          postProcess: report ? JSON.parse(report.slice('POSTPROCESS:'.length)) : null
         });
       } else {
         const error = stderr || stdout || `Process exited with code ${code}`;
@@ -268,24 +482,41 @@ function runPythonScript(pythonExe, scriptPath) {
       }
     });
     
-    process.on('error', (error) => {
+    child.on('error', (error) => {
+      clearTimeout(timer);
+      runningPython.delete(child);
       resolve({
         success: false,
         error: error.message
       });
     });
     
-    // Set timeout - Chatterbox can take 5-15 minutes on laptop hardware
-    setTimeout(() => {
-      process.kill();
+    // Timeout scales with the expected synthesis time (flat 15 minutes on an unprofiled host)
+    const timer = setTimeout(() => {
+      killProcessTree(child);
       resolve({
         success: false,
-        error: 'Python script timeout (15 minutes)'
+        error: `Python script timeout (${(timeoutMs / 60000).toFixed(1)} minutes)`
       });
-    }, 900000); // 15 minutes timeout
+    }, timeoutMs);
   });
 }
 
+/**
+ * Kill a Python run together with any worker processes it started
+ */
+function killProcessTree(child) {
+  try {
+    if (process.platform === 'win32') {
+      spawn('taskkill', ['/pid', String(child.pid), '/T', '/F']);
+    } else {
+      process.kill(-child.pid, 'SIGKILL');
+    }
+  } catch {
+    child.kill('SIGKILL'); // Group already gone - make sure the leader is too
+  }
+}
+
 async function generateWithChatterboxHTTP(script, audioPath) {
   try {
     console.log('🔊 Generating voice with Chatterbox HTTP...');
@@ -321,6 +552,10 @@ async function generateWithElevenLabs(script, audioPath) {
   try {
     console.log('🔊 Generating voice with ElevenLabs...');
     
+    if (!(await canSpendQuota('elevenlabs_chars', script.length))) {
+      throw new Error('ElevenLabs character quota exhausted for this month');
+    }
+    
     const voiceId = process.env.ELEVENLABS_VOICE_ID || 'pNInz6obpgDQGcFmaJgB'; // Adam voice
     
     const response = await axios.post(
@@ -346,6 +581,8 @@ async function generateWithElevenLabs(script, audioPath) {
       }
     );
     
+    await spendQuota('elevenlabs_chars', script.length);
+    
     // Convert MP3 to WAV if needed
     const tempMp3Path = audioPath.replace('.wav', '.mp3');
     await fs.writeFile(tempMp3Path, response.data);
@@ -381,56 +618,6 @@ async function convertAudioFormat(inputPath, outputPath) {
   console.log('📄 Audio format conversion skipped');
 }
 
-async function removeSilenceFromAudio(audioPath) {
-  try {
-    const [{ default: ffmpeg }, { default: ffmpegStatic }] = await Promise.all([
-      import('fluent-ffmpeg'),
-      import('ffmpeg-static')
-    ]);
-    
-    ffmpeg.setFfmpegPath(ffmpegStatic);
-    
-    const outputPath = audioPath.replace('.wav', '_clean.wav');
-    
-    return new Promise((resolve, reject) => {
-      console.log('🔇 Removing silence from audio...');
-      
-      ffmpeg()
-        .input(audioPath)
-        .audioFilters([
-          // Remove silence from start and end
-          'silenceremove=start_periods=1:start_duration=0.1:start_threshold=-50dB:detection=peak',
-          'areverse',
-          'silenceremove=start_periods=1:start_duration=0.1:start_threshold=-50dB:detection=peak',
-          'areverse'
-        ])
-        .audioCodec('pcm_s16le')
-        .audioChannels(1)
-        .audioFrequency(24000)
-        .output(outputPath)
-        .on('end', () => {
-          console.log('✅ Silence removal complete');
-          // Replace original file
-          fs.remove(audioPath)
-            .then(() => fs.move(outputPath, audioPath))
-            .then(() => resolve(audioPath))
-            .catch(err => {
-              console.log('⚠️  File replacement failed, using cleaned version:', err.message);
-              resolve(outputPath); // Return cleaned version if move fails
-            });
-        })
-        .on('error', (err) => {
-          console.log('⚠️  Silence removal failed, using original:', err.message);
-          resolve(audioPath); // Return original if cleanup fails
-        })
-        .run();
-    });
-  } catch (error) {
-    console.log('⚠️  Silence removal not available, using original audio');
-    return audioPath;
-  }
-}
-
 async function getAudioDuration(audioPath) {
   // Try to get actual duration using FFprobe
   try {
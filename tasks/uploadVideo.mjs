@@ -6,30 +6,50 @@ import fs from 'fs-extra';
 import path from 'path';
 import { OAuth2Client } from 'google-auth-library';
 import dotenv from 'dotenv';
+import { canSpendQuota, spendQuota, quotaBudgetName, YOUTUBE_COSTS } from '../utils/quotaService.mjs';
 
 dotenv.config();
 
 const SCOPES = ['https://www.googleapis.com/auth/youtube.upload'];
-const TOKEN_PATH = path.join(process.cwd(), 'auth', 'token.json');
-const CREDENTIALS_PATH = path.join(process.cwd(), 'auth', 'client_secret.json');
+const AUTH_DIR = path.join(process.cwd(), 'auth');
 
-export async function uploadToYouTube(videoResult, contentIdea, scriptData) {
+/**
+ * OAuth files for a channel (auth/ for the single-channel setup)
+ */
+function authPaths(channel = null) {
+  const authDir = channel?.authDir || AUTH_DIR;
+  return {
+    tokenPath: path.join(authDir, 'token.json'),
+    credentialsPath: path.join(authDir, 'client_secret.json')
+  };
+}
+
+/**
+ * @param {Object} options - channel: upload with that channel's credentials and quota (utils/channels.mjs)
+ */
+export async function uploadToYouTube(videoResult, contentIdea, scriptData, { channel = null } = {}) {
   try {
-    console.log('📤 Starting YouTube upload...');
+    console.log(`📤 Starting YouTube upload${channel ? ` to ${channel.name}` : ''}...`);
+    
+    // Fail fast (into the retry queue) instead of burning a request the API will reject
+    const quota = quotaBudgetName('youtube_units', channel);
+    if (!(await canSpendQuota(quota, YOUTUBE_COSTS['videos.insert']))) {
+      throw new Error('YouTube Data API daily quota exhausted');
+    }
     
     // Authenticate with YouTube API
-    const auth = await authenticateYouTube();
+    const auth = await authenticateYouTube(channel);
     const youtube = google.youtube({ version: 'v3', auth });
     
     // Generate video metadata
-    const metadata = generateVideoMetadata(contentIdea, scriptData);
+    const metadata = generateVideoMetadata(contentIdea, scriptData, channel);
     
     // Upload the video
-    const uploadResult = await uploadVideo(youtube, videoResult.videoPath, metadata);
+    const uploadResult = await uploadVideo(youtube, videoResult.videoPath, metadata, quota);
     
     // Upload thumbnail if available
     if (metadata.thumbnailPath && await fs.pathExists(metadata.thumbnailPath)) {
-      await uploadThumbnail(youtube, uploadResult.id, metadata.thumbnailPath);
+      await uploadThumbnail(youtube, uploadResult.id, metadata.thumbnailPath, quota);
     }
     
     console.log('✅ Video uploaded successfully!');
@@ -51,17 +71,19 @@ export async function uploadToYouTube(videoResult, contentIdea, scriptData) {
   }
 }
 
-async function authenticateYouTube() {
+async function authenticateYouTube(channel = null) {
   try {
+    const { tokenPath, credentialsPath } = authPaths(channel);
+    
     // Load client credentials
-    const credentials = await fs.readJson(CREDENTIALS_PATH);
+    const credentials = await fs.readJson(credentialsPath);
     const { client_secret, client_id, redirect_uris } = credentials.installed || credentials.web;
     
     const oAuth2Client = new OAuth2Client(client_id, client_secret, redirect_uris[0]);
     
     // Check if we have a stored token
-    if (await fs.pathExists(TOKEN_PATH)) {
-      const token = await fs.readJson(TOKEN_PATH);
+    if (await fs.pathExists(tokenPath)) {
+      const token = await fs.readJson(tokenPath);
       oAuth2Client.setCredentials(token);
       
       // Check if token is still valid
@@ -76,7 +98,7 @@ async function authenticateYouTube() {
           try {
             const { tokens } = await oAuth2Client.refreshAccessToken();
             oAuth2Client.setCredentials(tokens);
-            await fs.writeJson(TOKEN_PATH, tokens, { spaces: 2 });
+            await fs.writeJson(tokenPath, tokens, { spaces: 2 });
             console.log('✅ Token refreshed successfully');
             return oAuth2Client;
           } catch (refreshError) {
@@ -95,7 +117,7 @@ async function authenticateYouTube() {
   }
 }
 
-function generateVideoMetadata(contentIdea, scriptData) {
+function generateVideoMetadata(contentIdea, scriptData, channel = null) {
   // Parse content idea
   const lines = contentIdea.split('\n');
   const verse = lines.find(line => line.startsWith('VERSE:'))?.replace('VERSE:', '').trim();
@@ -120,7 +142,7 @@ function generateVideoMetadata(contentIdea, scriptData) {
     tags,
     thumbnailPath,
     categoryId: '22', // People & Blogs
-    privacyStatus: process.env.PRIVACY_STATUS || 'public',
+    privacyStatus: channel?.privacyStatus || process.env.PRIVACY_STATUS || 'public',
     verse,
     angle
   };
@@ -224,7 +246,7 @@ function generateTags(keywords, verse) {
   return uniqueTags.slice(0, 15);
 }
 
-async function uploadVideo(youtube, videoPath, metadata) {
+async function uploadVideo(youtube, videoPath, metadata, quota = 'youtube_units') {
   console.log('📹 Uploading video file...');
   console.log('📋 Title:', metadata.title);
   console.log('🏷️  Tags:', metadata.tags.join(', '));
@@ -257,6 +279,7 @@ async function uploadVideo(youtube, videoPath, metadata) {
       requestBody,
       media
     });
+    await spendQuota(quota, YOUTUBE_COSTS['videos.insert']);
     
     console.log('✅ Video uploaded with ID:', response.data.id);
     return response.data;
@@ -267,7 +290,7 @@ async function uploadVideo(youtube, videoPath, metadata) {
   }
 }
 
-async function uploadThumbnail(youtube, videoId, thumbnailPath) {
+async function uploadThumbnail(youtube, videoId, thumbnailPath, quota = 'youtube_units') {
   try {
     console.log('📸 Uploading thumbnail...');
     
@@ -280,6 +303,7 @@ async function uploadThumbnail(youtube, videoId, thumbnailPath) {
       videoId,
       media
     });
+    await spendQuota(quota, YOUTUBE_COSTS['thumbnails.set']);
     
     console.log('✅ Thumbnail uploaded successfully');
     
@@ -296,9 +320,9 @@ export async function scheduleUpload(videoResult, contentIdea, scriptData, sched
   return await uploadToYouTube(videoResult, contentIdea, scriptData);
 }
 
-export async function updateVideoMetadata(videoId, newMetadata) {
+export async function updateVideoMetadata(videoId, newMetadata, channel = null) {
   try {
-    const auth = await authenticateYouTube();
+    const auth = await authenticateYouTube(channel);
     const youtube = google.youtube({ version: 'v3', auth });
     
     const response = await youtube.videos.update({
@@ -308,6 +332,7 @@ export async function updateVideoMetadata(videoId, newMetadata) {
         snippet: newMetadata
       }
     });
+    await spendQuota(quotaBudgetName('youtube_units', channel), YOUTUBE_COSTS['videos.update']);
     
     console.log('✅ Video metadata updated');
     return response.data;
@@ -318,15 +343,16 @@ export async function updateVideoMetadata(videoId, newMetadata) {
   }
 }
 
-export async function getVideoAnalytics(videoId) {
+export async function getVideoAnalytics(videoId, channel = null) {
   try {
-    const auth = await authenticateYouTube();
+    const auth = await authenticateYouTube(channel);
     const youtube = google.youtube({ version: 'v3', auth });
     
     const response = await youtube.videos.list({
       part: ['statistics', 'snippet'],
       id: [videoId]
     });
+    await spendQuota(quotaBudgetName('youtube_units', channel), YOUTUBE_COSTS['videos.list']);
     
     if (response.data.items.length > 0) {
       const video = response.data.items[0];
@@ -348,9 +374,9 @@ export async function getVideoAnalytics(videoId) {
 }
 
 // Setup OAuth credentials
-export async function setupOAuth() {
+export async function setupOAuth(channel = null) {
   try {
-    const authDir = path.join(process.cwd(), 'auth');
+    const authDir = channel?.authDir || AUTH_DIR;
     await fs.ensureDir(authDir);
     
     console.log('🔐 OAuth Setup Instructions:');
@@ -2,6 +2,7 @@
 // Standalone tool for pre-generating scripts
 
 import { ScriptDatabase } from '../database/scriptDatabase.mjs';
+import { acquireQuota } from '../utils/quotaService.mjs';
 import dotenv from 'dotenv';
 
 dotenv.config();
@@ -26,7 +27,8 @@ Make it punchy and engaging for young adults!`;
   try {
     console.log(`🎭 Starting HuggingFace generation for ${book} ${chapter}:${verse}...`);
     
-    // Step 1: Start the prediction
+    // Step 1: Start the prediction (waits if the hourly Space budget is used up)
+    await acquireQuota('hf_space', 1, { maxWaitMs: 60 * 60 * 1000 });
     const startResponse = await fetch('https://dim-lizard-dim-gpt.hf.space/gradio_api/call/analyze_verse_for_script', {
       method: 'POST',
       headers: {
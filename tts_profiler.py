@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+TTS Profiler - Calibrates Chatterbox synthesis on this host
+Measures model load time, seconds per character at several torch thread counts
+and worker memory, then saves a host profile (logs/tts_profile.json) that the
+voice pipeline uses to choose chunk size, worker count and per-job timeouts
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_FILE = Path(__file__).parent / "logs" / "tts_profile.json"
+PROFILE_VERSION = 1
+CHATTERBOX_SRC = Path(__file__).parent / "chatterbox" / "src"
+
+DEFAULT_CHUNK_SIZE = 200  # Used when the host has not been profiled
+MIN_CHUNK_SIZE = 100
+MAX_CHUNK_SIZE = 300  # Chatterbox output drifts on longer inputs
+CHUNK_OVERHEAD_SHARE = 0.25  # Largest share of a chunk's synthesis time the fixed per-chunk cost may take
+
+SAMPLE_TEXTS = [
+    "Trust in the Lord with all your heart.",
+    "Be strong and courageous. Do not be afraid, for the Lord your God goes with you wherever you go.",
+    "Come to me, all you who are weary and burdened, and I will give you rest. Take my yoke upon you "
+    "and learn from me, for I am gentle and humble in heart, and you will find rest for your souls.",
+]
+
+
+def _rss_bytes():
+    """Current resident memory of this process; None if it cannot be determined"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _peak_rss_bytes():
+    """Peak resident memory of this process (falls back to the current value)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # kB on Linux
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        return getattr(psutil.Process().memory_info(), "peak_wset", None) or _rss_bytes()
+    except ImportError:
+        return _rss_bytes()
+
+
+def default_thread_counts(cpu_count=None):
+    """Powers of two up to the core count, plus the core count itself"""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    counts = {cpu_count}
+    threads = 1
+    while threads < cpu_count:
+        counts.add(threads)
+        threads *= 2
+    return sorted(counts)
+
+
+def fit_cost(samples):
+    """
+    Least-squares fit of seconds = fixed + per_char * chars over (chars, seconds) samples
+    Returns (fixed_seconds, seconds_per_char)
+    """
+    xs = [chars for chars, _ in samples]
+    ys = [seconds for _, seconds in samples]
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+
+    per_char = sum((x - mean_x) * (y - mean_y) for x, y in samples) / spread if spread else mean_y / mean_x
+    per_char = max(per_char, 1e-6)
+    fixed = max(0.0, mean_y - per_char * mean_x)
+    return fixed, per_char
+
+
+def recommend(profile, cpu_count=None, memory_bytes=None):
+    """
+    Plan with the highest expected throughput on this host
+    Returns {workers, threads_per_worker, max_chunk_size}
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    worker_memory = profile.get("worker_memory_bytes")
+
+    best = None
+    for threads, stats in profile["threads"].items():
+        threads = int(threads)
+        workers = max(1, cpu_count // threads)
+        if memory_bytes and worker_memory:
+            workers = min(workers, max(1, memory_bytes // worker_memory))
+
+        chars_per_second = workers / stats["seconds_per_char"]
+        if best is None or chars_per_second > best[0]:
+            best = (chars_per_second, workers, threads, stats)
+
+    _, workers, threads, stats = best
+
+    # Smallest chunk whose fixed cost stays under CHUNK_OVERHEAD_SHARE of its synthesis time
+    overhead_chars = stats["fixed_seconds"] / stats["seconds_per_char"]
+    chunk_size = overhead_chars * (1 - CHUNK_OVERHEAD_SHARE) / CHUNK_OVERHEAD_SHARE
+    chunk_size = int(min(MAX_CHUNK_SIZE, max(MIN_CHUNK_SIZE, chunk_size)))
+
+    return {"workers": workers, "threads_per_worker": threads, "max_chunk_size": chunk_size}
+
+
+def load_profile():
+    """Saved profile for this host, or None if there is none (or it was taken on another machine)"""
+    try:
+        with open(PROFILE_FILE, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if profile.get("version") != PROFILE_VERSION:
+        return None
+    if profile.get("host") != socket.gethostname() or profile.get("cpu_count") != os.cpu_count():
+        return None
+    return profile
+
+
+def save_profile(profile):
+    PROFILE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = PROFILE_FILE.with_suffix(".json.tmp")
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+    os.replace(temp_file, PROFILE_FILE)
+
+
+def profile_host(thread_counts, repeats=1, voice_path=None):
+    """Load the model once, then time every sample text at every thread count"""
+    sys.path.append(str(CHATTERBOX_SRC))
+
+    baseline_memory = _rss_bytes()
+
+    import torch
+    from chatterbox.tts import ChatterboxTTS
+
+    start_time = time.time()
+    model = ChatterboxTTS.from_pretrained(device="cpu")
+    load_seconds = time.time() - start_time
+    model_memory = _rss_bytes()
+    print(f"Model loaded in {load_seconds:.2f} seconds")
+
+    voice_path = voice_path if voice_path and os.path.exists(voice_path) else None
+
+    def generate(text):
+        start = time.time()
+        wav = model.generate(text, audio_prompt_path=voice_path) if voice_path else model.generate(text)
+        return time.time() - start, wav.shape[-1] / model.sr
+
+    generate(SAMPLE_TEXTS[0])  # Warm-up: the first call pays one-off initialization
+
+    torch.set_num_interop_threads(1)
+    threads_stats = {}
+    for threads in thread_counts:
+        torch.set_num_threads(threads)
+        samples = []
+        generated_seconds = audio_seconds = 0.0
+
+        for text in SAMPLE_TEXTS:
+            runs = [generate(text) for _ in range(repeats)]
+            seconds = statistics.median(run[0] for run in runs)
+            samples.append((len(text), seconds))
+            generated_seconds += seconds
+            audio_seconds += statistics.median(run[1] for run in runs)
+
+        fixed, per_char = fit_cost(samples)
+        threads_stats[str(threads)] = {
+            "fixed_seconds": round(fixed, 4),
+            "seconds_per_char": round(per_char, 6),
+            "real_time_factor": round(generated_seconds / audio_seconds, 3) if audio_seconds else None
+        }
+        print(f"  {threads} thread(s): {per_char * 1000:.1f} ms/char + {fixed:.2f}s per chunk, "
+              f"RTF {threads_stats[str(threads)]['real_time_factor']}")
+
+    return {
+        "version": PROFILE_VERSION,
+        "host": socket.gethostname(),
+        "cpu_count": os.cpu_count(),
+        "profiled_at": datetime.now().isoformat(),
+        "model_load_seconds": round(load_seconds, 2),
+        "model_memory_bytes": model_memory - baseline_memory if model_memory and baseline_memory else None,
+        "worker_memory_bytes": _peak_rss_bytes(),
+        "sample_rate": model.sr,
+        "threads": threads_stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate Chatterbox TTS on this host")
+    parser.add_argument("--threads", default=None, help="Comma-separated torch thread counts to measure")
+    parser.add_argument("--repeats", type=int, default=1, help="Runs per sample text (median is kept)")
+    parser.add_argument("--voice", default=None, help="Custom voice sample path")
+    parser.add_argument("--show", action="store_true", help="Print the saved profile and exit")
+    args = parser.parse_args()
+
+    if args.show:
+        profile = load_profile()
+        print(json.dumps(profile, indent=2) if profile else "No TTS profile for this host")
+        return 0
+
+    thread_counts = [int(t) for t in args.threads.split(",")] if args.threads else default_thread_counts()
+    print(f"⏱️  Profiling Chatterbox on {socket.gethostname()} ({os.cpu_count()} cores), threads {thread_counts}")
+
+    try:
+        profile = profile_host(thread_counts, max(1, args.repeats), args.voice)
+    except Exception as e:
+        print(f"ERROR:{str(e)}")
+        return 1
+
+    from tts_worker_pool import available_memory_bytes
+    profile["recommended"] = recommend(profile, memory_bytes=available_memory_bytes())
+    save_profile(profile)
+
+    plan = profile["recommended"]
+    print(f"✅ Saved {PROFILE_FILE}")
+    print(f"   {plan['workers']} worker(s) x {plan['threads_per_worker']} thread(s), "
+          f"chunks up to {plan['max_chunk_size']} chars")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
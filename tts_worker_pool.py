@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+TTS Worker Pool - Shards a script's chunks across CPU worker processes
+Each worker keeps a warm Chatterbox model with pinned torch threads;
+chunks are balanced by expected synthesis cost and reassembled in order
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from audio_postprocess import postprocess_to_file
+from tts_profiler import load_profile, recommend
+
+CHATTERBOX_SRC = Path(__file__).parent / "chatterbox" / "src"
+
+MODEL_MEMORY_BYTES = 3 * 1024 ** 3  # Approximate resident size of one CPU Chatterbox model
+MIN_THREADS_PER_WORKER = 2
+CHUNK_OVERHEAD_CHARS = 20  # Fixed per-chunk cost (prompt conditioning) expressed in characters
+
+# Per-process model, loaded once by the pool initializer
+_model = None
+_voice_path = None
+_chunk_dir = None
+
+
+def available_memory_bytes():
+    """Best-effort available memory; None if it cannot be determined"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def plan_workers(chunk_count, cpu_count=None, memory_bytes=None):
+    """
+    Choose worker count and torch threads per worker from the host
+    Uses the measured host profile (tts_profiler.py) when there is one;
+    TTS_WORKERS / TTS_THREADS_PER_WORKER environment variables override the choice
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    if memory_bytes is None:
+        memory_bytes = available_memory_bytes()
+
+    profile = load_profile()
+    if profile:
+        workers = recommend(profile, cpu_count, memory_bytes)["workers"]
+    else:
+        workers = max(1, cpu_count // MIN_THREADS_PER_WORKER)
+        if memory_bytes:
+            workers = min(workers, max(1, memory_bytes // MODEL_MEMORY_BYTES))
+    workers = min(workers, max(1, chunk_count))
+
+    if os.environ.get("TTS_WORKERS"):
+        workers = max(1, int(os.environ["TTS_WORKERS"]))
+
+    threads = max(1, cpu_count // workers)
+    if os.environ.get("TTS_THREADS_PER_WORKER"):
+        threads = max(1, int(os.environ["TTS_THREADS_PER_WORKER"]))
+
+    return {"workers": workers, "threads_per_worker": threads}
+
+
+def chunk_overhead_chars(threads_per_worker):
+    """Fixed per-chunk cost in characters, measured for this thread count when the host is profiled"""
+    profile = load_profile()
+    stats = profile and profile["threads"].get(str(threads_per_worker))
+    if not stats:
+        return CHUNK_OVERHEAD_CHARS
+    return stats["fixed_seconds"] / stats["seconds_per_char"]
+
+
+def expected_cost(text, overhead_chars=CHUNK_OVERHEAD_CHARS):
+    """Expected synthesis cost of a chunk, proportional to its character count"""
+    return len(text) + overhead_chars
+
+
+def schedule_chunks(chunks, worker_count, overhead_chars=CHUNK_OVERHEAD_CHARS):
+    """
+    Balance chunks across workers (longest processing time first)
+    Returns one shard per worker as a list of (index, text) pairs in chunk order,
+    so early chunks finish first and an incremental render can start on them
+    """
+    shards = [[] for _ in range(worker_count)]
+    loads = [(0, worker) for worker in range(worker_count)]
+
+    ordered = sorted(enumerate(chunks), key=lambda item: expected_cost(item[1], overhead_chars), reverse=True)
+    for index, text in ordered:
+        load, worker = heapq.heappop(loads)
+        shards[worker].append((index, text))
+        heapq.heappush(loads, (load + expected_cost(text, overhead_chars), worker))
+
+    return [sorted(shard) for shard in shards if shard]
+
+
+def _init_worker(threads, voice_path, chunk_dir=None):
+    """Pool initializer: pin torch threads and load the model once per process"""
+    global _model, _voice_path, _chunk_dir
+
+    sys.path.append(str(CHATTERBOX_SRC))
+
+    import torch
+    from chatterbox.tts import ChatterboxTTS
+
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+    _model = ChatterboxTTS.from_pretrained(device="cpu")
+    _voice_path = voice_path if voice_path and os.path.exists(voice_path) else None
+    _chunk_dir = chunk_dir
+
+
+def _synthesize_shard(shard):
+    """Synthesize every chunk in a shard with this process's warm model"""
+    results = []
+    for index, text in shard:
+        if _voice_path:
+            wav = _model.generate(text, audio_prompt_path=_voice_path)
+        else:
+            wav = _model.generate(text)
+        wav = wav.cpu()
+
+        if _chunk_dir:
+            # Publish each chunk as soon as it exists so rendering can start on it
+            import torchaudio as ta
+            chunk_path = os.path.join(_chunk_dir, f"chunk_{index:03d}.wav")
+            ta.save(chunk_path, wav, _model.sr)
+            print(f"CHUNK:{index}:{chunk_path}", flush=True)
+
+        results.append((index, wav))
+    return results, _model.sr
+
+
+def synthesize_chunks(chunks, output_path, voice_path=None, workers=None, threads_per_worker=None, chunk_dir=None):
+    """
+    Synthesize chunks in parallel, join them in order and post-process the result
+    in memory into a single WAV. If chunk_dir is given each raw chunk is also
+    saved there as it completes
+    """
+    import torch
+
+    plan = plan_workers(len(chunks))
+    workers = workers or plan["workers"]
+    threads_per_worker = threads_per_worker or plan["threads_per_worker"]
+
+    shards = schedule_chunks(chunks, workers, chunk_overhead_chars(threads_per_worker))
+    print(f"Sharding {len(chunks)} chunks across {len(shards)} worker(s) x {threads_per_worker} thread(s)")
+
+    ordered = [None] * len(chunks)
+    sample_rate = None
+
+    with ProcessPoolExecutor(
+        max_workers=len(shards),
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(threads_per_worker, voice_path, chunk_dir)
+    ) as pool:
+        for results, sample_rate in pool.map(_synthesize_shard, shards):
+            for index, wav in results:
+                ordered[index] = wav
+
+    wav = torch.cat(ordered, dim=1)
+    sample_rate, report = postprocess_to_file(wav.mean(dim=0).numpy(), sample_rate, output_path)
+
+    return sample_rate, report["duration"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesize TTS chunks across a process pool")
+    parser.add_argument("--chunks-file", required=True, help="JSON file with a list of chunk strings")
+    parser.add_argument("--output", required=True, help="Output WAV path")
+    parser.add_argument("--voice", default=None, help="Custom voice sample path")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads-per-worker", type=int, default=None)
+    parser.add_argument("--chunk-dir", default=None, help="Also save each chunk here as it completes")
+    args = parser.parse_args()
+
+    try:
+        with open(args.chunks_file, "r", encoding="utf-8") as f:
+            chunks = json.load(f)
+
+        start_time = time.time()
+        sample_rate, duration = synthesize_chunks(
+            chunks, args.output, args.voice, args.workers, args.threads_per_worker, args.chunk_dir
+        )
+        print(f"Synthesized in {time.time() - start_time:.2f} seconds")
+        print(f"SUCCESS:{sample_rate}:{duration:.2f}")
+
+    except Exception as e:
+        print(f"ERROR:{str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
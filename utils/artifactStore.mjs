@@ -0,0 +1,376 @@
+// 🗄️ Artifact Store - Manifest-indexed output files with disk-budget LRU eviction
+// Tracks narration, stock footage, scripts and rendered videos without rescanning output/
+
+import fs from 'fs-extra';
+import path from 'path';
+import { withFileLock } from './fileLock.mjs';
+
+const MANIFEST_FILE = path.join('logs', 'artifact_manifest.json');
+const OUTPUT_DIR = 'output';
+
+// Queues whose referenced files must never be evicted
+const PINNING_QUEUE_FILES = [
+  path.join('logs', 'upload_recovery.json'),
+  path.join('logs', 'ready_queue.json')
+];
+
+const DEFAULT_DISK_BUDGET_MB = parseInt(process.env.ARTIFACT_DISK_BUDGET_MB) || 5120;
+
+// One id per process so artifacts can be traced back to the run that created them
+const RUN_ID = process.env.PIPELINE_RUN_ID || `run_${Date.now()}`;
+
+// Filename prefix/extension -> artifact kind
+const KIND_PATTERNS = [
+  { kind: 'narration', prefix: 'narration_', ext: '.wav' },
+  { kind: 'audio_cache', prefix: 'tts_cache_', ext: '.wav' },
+  { kind: 'stock', prefix: 'stock_', ext: '.mp4' },
+  { kind: 'overlay', prefix: 'overlay_', ext: '.png' },
+  { kind: 'fallback', prefix: 'fallback_', ext: '.mp4' },
+  { kind: 'script', prefix: 'script_', ext: '.txt' },
+  { kind: 'video', prefix: 'bible_short_', ext: '.mp4' },
+  { kind: 'video', prefix: 'final_video_', ext: '.mp4' }
+];
+
+export function inferArtifactKind(filePath) {
+  const name = path.basename(filePath);
+  const match = KIND_PATTERNS.find(p => name.startsWith(p.prefix) && name.endsWith(p.ext));
+  return match ? match.kind : 'other';
+}
+
+function emptyManifest() {
+  return {
+    version: 1,
+    artifacts: {},
+    totals: { count: 0, bytes: 0, byKind: {} },
+    updatedAt: new Date().toISOString()
+  };
+}
+
+export class ArtifactStore {
+  constructor(rootDir = process.cwd()) {
+    this.rootDir = rootDir;
+    this.manifestPath = path.join(rootDir, MANIFEST_FILE);
+    this.manifest = null;
+    this.loadedMtime = null;
+  }
+
+  async manifestMtime() {
+    try {
+      return (await fs.stat(this.manifestPath)).mtimeMs;
+    } catch (error) {
+      return null;
+    }
+  }
+
+  /**
+   * Manifest as on disk: re-read whenever another process (pipeline, GUI) has saved it
+   */
+  async load({ fresh = false } = {}) {
+    const mtime = await this.manifestMtime();
+    if (this.manifest && !fresh && mtime === this.loadedMtime) return this.manifest;
+
+    try {
+      if (mtime !== null) {
+        this.manifest = await fs.readJson(this.manifestPath);
+        this.loadedMtime = mtime;
+        return this.manifest;
+      }
+    } catch (error) {
+      console.log('⚠️  Could not read artifact manifest, rebuilding:', error.message);
+    }
+
+    // First run (or unreadable manifest): adopt whatever is already in output/
+    this.manifest = emptyManifest();
+    this.loadedMtime = mtime;
+    await this.scanOutput();
+    return this.manifest;
+  }
+
+  async save() {
+    this.manifest.updatedAt = new Date().toISOString();
+    await fs.ensureDir(path.dirname(this.manifestPath));
+    const tempPath = `${this.manifestPath}.tmp`;
+    await fs.writeJson(tempPath, this.manifest, { spaces: 2 });
+    await fs.move(tempPath, this.manifestPath, { overwrite: true });
+    this.loadedMtime = await this.manifestMtime();
+  }
+
+  /**
+   * Load-modify-save under the manifest lock, starting from the file's current contents
+   * so entries other processes registered meanwhile are never overwritten
+   */
+  async update(change) {
+    return withFileLock(this.manifestPath, async () => {
+      await this.load({ fresh: true });
+      const result = await change(this.manifest);
+      await this.save();
+      return result;
+    });
+  }
+
+  /**
+   * Manifest key for a path: relative to the project root, forward slashes
+   */
+  keyFor(filePath) {
+    return path.relative(this.rootDir, path.resolve(this.rootDir, filePath)).split(path.sep).join('/');
+  }
+
+  absolutePath(key) {
+    return path.join(this.rootDir, key);
+  }
+
+  adjustTotals(kind, count, bytes) {
+    const totals = this.manifest.totals;
+    const kindTotals = totals.byKind[kind] || (totals.byKind[kind] = { count: 0, bytes: 0 });
+    totals.count += count;
+    totals.bytes += bytes;
+    kindTotals.count += count;
+    kindTotals.bytes += bytes;
+  }
+
+  addEntry(key, kind, sizeBytes, runId, createdAt = new Date().toISOString()) {
+    this.manifest.artifacts[key] = {
+      kind,
+      sizeBytes,
+      runId,
+      createdAt,
+      lastAccess: createdAt,
+      refs: []
+    };
+    this.adjustTotals(kind, 1, sizeBytes);
+  }
+
+  dropEntry(key) {
+    const entry = this.manifest.artifacts[key];
+    if (!entry) return;
+    delete this.manifest.artifacts[key];
+    this.adjustTotals(entry.kind, -1, -entry.sizeBytes);
+  }
+
+  /**
+   * Record a newly created artifact
+   */
+  async register(filePath, kind = inferArtifactKind(filePath), { runId = RUN_ID } = {}) {
+    const key = this.keyFor(filePath);
+    const stats = await fs.stat(this.absolutePath(key));
+
+    await this.update(() => {
+      this.dropEntry(key);
+      this.addEntry(key, kind, stats.size, runId);
+    });
+    return key;
+  }
+
+  /**
+   * Mark an artifact as used (moves it to the back of the LRU order)
+   */
+  async touch(filePath) {
+    await this.update(manifest => {
+      const entry = manifest.artifacts[this.keyFor(filePath)];
+      if (entry) entry.lastAccess = new Date().toISOString();
+    });
+  }
+
+  /**
+   * Delete an artifact file and its manifest entry
+   */
+  async remove(filePath) {
+    const key = this.keyFor(filePath);
+    await fs.remove(this.absolutePath(key));
+    await this.update(() => this.dropEntry(key));
+  }
+
+  async addRef(filePath, holder) {
+    await this.update(manifest => {
+      const entry = manifest.artifacts[this.keyFor(filePath)];
+      if (entry && !entry.refs.includes(holder)) entry.refs.push(holder);
+    });
+  }
+
+  async releaseRef(filePath, holder) {
+    await this.update(manifest => {
+      const entry = manifest.artifacts[this.keyFor(filePath)];
+      if (entry) entry.refs = entry.refs.filter(ref => ref !== holder);
+    });
+  }
+
+  /**
+   * Artifacts of one kind, most recently used first
+   */
+  async list(kind) {
+    await this.load();
+    return Object.entries(this.manifest.artifacts)
+      .filter(([, entry]) => entry.kind === kind)
+      .map(([key, entry]) => ({ key, path: this.absolutePath(key), ...entry }))
+      .sort((a, b) => new Date(b.lastAccess) - new Date(a.lastAccess));
+  }
+
+  /**
+   * Storage totals straight from the manifest - no directory scan
+   */
+  async getStats() {
+    await this.load();
+    const { totals } = this.manifest;
+    const countOf = kind => totals.byKind[kind]?.count || 0;
+
+    return {
+      totalBytes: totals.bytes,
+      totalFiles: totals.count,
+      videoCount: countOf('video'),
+      audioCount: countOf('narration'),
+      stockCount: countOf('stock'),
+      scriptCount: countOf('script'),
+      byKind: totals.byKind
+    };
+  }
+
+  /**
+   * Manifest keys referenced anywhere in the retry queue or ready queue
+   */
+  async getPinnedKeys() {
+    const pinned = new Set();
+
+    const collect = (value) => {
+      if (typeof value === 'string') {
+        const key = this.keyFor(value);
+        if (this.manifest.artifacts[key]) pinned.add(key);
+      } else if (Array.isArray(value)) {
+        value.forEach(collect);
+      } else if (value && typeof value === 'object') {
+        Object.values(value).forEach(collect);
+      }
+    };
+
+    for (const queueFile of PINNING_QUEUE_FILES) {
+      try {
+        const queuePath = path.join(this.rootDir, queueFile);
+        if (await fs.pathExists(queuePath)) {
+          collect(await fs.readJson(queuePath));
+        }
+      } catch (error) {
+        // A queue we cannot read might reference anything - refuse to evict at all
+        throw new Error(`Cannot read ${queueFile} to protect queued artifacts: ${error.message}`);
+      }
+    }
+
+    return pinned;
+  }
+
+  /**
+   * Delete least recently used artifacts until total size fits the budget.
+   * Artifacts with refs or referenced by the retry/ready queues are never deleted.
+   */
+  async evict(budgetBytes = DEFAULT_DISK_BUDGET_MB * 1024 * 1024) {
+    return this.update(() => this.evictLocked(budgetBytes));
+  }
+
+  async evictLocked(budgetBytes) {
+    if (this.manifest.totals.bytes <= budgetBytes) {
+      return { deletedCount: 0, freedBytes: 0 };
+    }
+
+    const pinned = await this.getPinnedKeys();
+    const candidates = Object.entries(this.manifest.artifacts)
+      .filter(([key, entry]) => entry.refs.length === 0 && !pinned.has(key))
+      .sort(([, a], [, b]) => new Date(a.lastAccess) - new Date(b.lastAccess));
+
+    let deletedCount = 0;
+    let freedBytes = 0;
+
+    for (const [key, entry] of candidates) {
+      if (this.manifest.totals.bytes <= budgetBytes) break;
+
+      try {
+        await fs.remove(this.absolutePath(key));
+      } catch (error) {
+        console.log(`⚠️  Could not delete ${key}: ${error.message}`);
+        continue;
+      }
+
+      this.dropEntry(key);
+      deletedCount++;
+      freedBytes += entry.sizeBytes;
+    }
+
+    if (deletedCount > 0) {
+      console.log(`🧹 Evicted ${deletedCount} artifact(s), freed ${(freedBytes / 1024 / 1024).toFixed(1)} MB`);
+    }
+    if (this.manifest.totals.bytes > budgetBytes) {
+      console.log('⚠️  Still over disk budget - remaining artifacts are referenced by queues');
+    }
+
+    return { deletedCount, freedBytes };
+  }
+
+  /**
+   * Sync the manifest with output/ (one full scan). Adopts unknown files, drops vanished ones.
+   */
+  async reconcile() {
+    return this.update(() => this.scanOutput());
+  }
+
+  async scanOutput() {
+    const outputDir = path.join(this.rootDir, OUTPUT_DIR);
+    const seen = new Set();
+
+    if (await fs.pathExists(outputDir)) {
+      for (const file of await fs.readdir(outputDir)) {
+        const filePath = path.join(outputDir, file);
+        const stats = await fs.stat(filePath);
+        if (!stats.isFile()) continue;
+
+        const key = this.keyFor(filePath);
+        seen.add(key);
+
+        const existing = this.manifest.artifacts[key];
+        if (!existing) {
+          this.addEntry(key, inferArtifactKind(file), stats.size, 'adopted', stats.mtime.toISOString());
+        } else if (existing.sizeBytes !== stats.size) {
+          this.adjustTotals(existing.kind, 0, stats.size - existing.sizeBytes);
+          existing.sizeBytes = stats.size;
+        }
+      }
+    }
+
+    for (const key of Object.keys(this.manifest.artifacts)) {
+      if (key.startsWith(`${OUTPUT_DIR}/`) && !seen.has(key)) {
+        this.dropEntry(key);
+      }
+    }
+
+    return this.manifest.totals;
+  }
+}
+
+// Global instance for easy access
+const artifactStore = new ArtifactStore();
+
+export async function registerArtifact(filePath, kind, options) {
+  try {
+    return await artifactStore.register(filePath, kind, options);
+  } catch (error) {
+    console.log(`⚠️  Could not register artifact ${filePath}: ${error.message}`);
+    return null;
+  }
+}
+
+export async function touchArtifact(filePath) {
+  return artifactStore.touch(filePath);
+}
+
+export async function listArtifacts(kind) {
+  return artifactStore.list(kind);
+}
+
+export async function getArtifactStats() {
+  return artifactStore.getStats();
+}
+
+export async function enforceDiskBudget(budgetBytes) {
+  return artifactStore.evict(budgetBytes);
+}
+
+export async function reconcileArtifacts() {
+  await artifactStore.load();
+  return artifactStore.reconcile();
+}
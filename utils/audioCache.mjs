@@ -0,0 +1,134 @@
+// 🎙️ Narration Cache - Reuses synthesized narration across videos and channels
+// Keyed by everything that changes the audio: script text, planned engine, voice sample and post-process settings
+
+import crypto from 'crypto';
+import fs from 'fs-extra';
+import path from 'path';
+import { registerArtifact, touchArtifact } from './artifactStore.mjs';
+import { withFileLock } from './fileLock.mjs';
+
+const CACHE_INDEX_FILE = path.join('logs', 'audio_cache.json');
+const CACHE_DIR = 'output';
+const CACHE_ENABLED = process.env.AUDIO_CACHE !== 'false';
+
+// Post-process settings baked into cached audio (see audio_postprocess.py)
+const POSTPROCESS_ENV = ['AUDIO_TARGET_LUFS', 'AUDIO_SILENCE_THRESHOLD_DB', 'AUDIO_SAMPLE_RATE'];
+
+/**
+ * Cache key for a narration request
+ */
+export function narrationKey(script, { voice = null, voicePath = null } = {}) {
+  const settings = Object.fromEntries(POSTPROCESS_ENV.map(name => [name, process.env[name] || null]));
+  return crypto.createHash('sha1')
+    .update(JSON.stringify({ script: script.trim(), voice, voicePath, settings }))
+    .digest('hex');
+}
+
+/**
+ * Audio Cache - Index of cached narration files in output/ (evicted with the other artifacts)
+ */
+class AudioCache {
+  constructor() {
+    this.index = null;
+    this.loadedMtime = null;
+  }
+
+  async indexMtime() {
+    try {
+      return (await fs.stat(CACHE_INDEX_FILE)).mtimeMs;
+    } catch (error) {
+      return null;
+    }
+  }
+
+  /**
+   * Index as on disk: re-read whenever another process (pipeline, render-ahead, channel run) has saved it
+   */
+  async load({ fresh = false } = {}) {
+    const mtime = await this.indexMtime();
+    if (this.index && !fresh && mtime === this.loadedMtime) return this.index;
+
+    this.index = {};
+    this.loadedMtime = mtime;
+    try {
+      if (mtime !== null) {
+        this.index = await fs.readJson(CACHE_INDEX_FILE);
+      }
+    } catch (error) {
+      console.log('⚠️  Could not read audio cache index, starting empty:', error.message);
+    }
+    return this.index;
+  }
+
+  async save() {
+    await fs.ensureDir(path.dirname(CACHE_INDEX_FILE));
+    const tempPath = `${CACHE_INDEX_FILE}.tmp`;
+    await fs.writeJson(tempPath, this.index, { spaces: 2 });
+    await fs.move(tempPath, CACHE_INDEX_FILE, { overwrite: true });
+    this.loadedMtime = await this.indexMtime();
+  }
+
+  /**
+   * Load-modify-save under the index lock, starting from the file's current contents
+   * so entries other processes cached meanwhile are never overwritten
+   */
+  async update(change) {
+    await withFileLock(CACHE_INDEX_FILE, async () => {
+      await this.load({ fresh: true });
+      change(this.index);
+      await this.save();
+    });
+  }
+
+  /**
+   * Copy cached narration to audioPath; returns the cached voice result or null
+   */
+  async lookup(key, audioPath) {
+    if (!CACHE_ENABLED) return null;
+
+    await this.load();
+    const entry = this.index[key];
+    if (!entry) return null;
+
+    if (!(await fs.pathExists(entry.file))) {
+      // Evicted by the disk budget
+      await this.update(index => delete index[key]);
+      return null;
+    }
+
+    await fs.copy(entry.file, audioPath);
+    await touchArtifact(entry.file);
+    return { ...entry.result, audioPath, cached: true };
+  }
+
+  /**
+   * Keep a copy of freshly synthesized narration
+   */
+  async store(key, result) {
+    if (!CACHE_ENABLED || result.method === 'placeholder') return;
+
+    try {
+      const file = path.join(CACHE_DIR, `tts_cache_${key}.wav`);
+      await fs.copy(result.audioPath, file);
+      await registerArtifact(file, 'audio_cache');
+
+      const { audioPath, ...rest } = result;
+      await this.update(index => {
+        index[key] = { file, result: rest, createdAt: new Date().toISOString() };
+      });
+    } catch (error) {
+      console.log('⚠️  Could not cache narration:', error.message);
+    }
+  }
+}
+
+// Global instance
+const audioCache = new AudioCache();
+
+export async function getCachedNarration(key, audioPath) {
+  return await audioCache.lookup(key, audioPath);
+}
+
+export async function cacheNarration(key, result) {
+  return await audioCache.store(key, result);
+}
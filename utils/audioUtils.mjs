@@ -171,3 +171,43 @@ export async function normalizeAudio(inputPath, outputPath) {
     throw error;
   }
 }
+
+/**
+ * Read sample rate, channel count and exact sample count from a WAV header
+ */
+export async function getWavInfo(wavPath) {
+  const buffer = await fs.readFile(wavPath);
+  
+  if (buffer.toString('ascii', 0, 4) !== 'RIFF' || buffer.toString('ascii', 8, 12) !== 'WAVE') {
+    throw new Error(`Not a WAV file: ${wavPath}`);
+  }
+  
+  let offset = 12;
+  let format = null;
+  
+  // Walk the RIFF chunks until the data chunk
+  while (offset + 8 <= buffer.length) {
+    const chunkId = buffer.toString('ascii', offset, offset + 4);
+    const chunkSize = buffer.readUInt32LE(offset + 4);
+    
+    if (chunkId === 'fmt ') {
+      format = {
+        channels: buffer.readUInt16LE(offset + 10),
+        sampleRate: buffer.readUInt32LE(offset + 12),
+        bitsPerSample: buffer.readUInt16LE(offset + 22)
+      };
+    } else if (chunkId === 'data' && format) {
+      const dataSize = Math.min(chunkSize, buffer.length - offset - 8);
+      const samples = Math.floor(dataSize / (format.channels * format.bitsPerSample / 8));
+      return {
+        ...format,
+        samples,
+        duration: samples / format.sampleRate
+      };
+    }
+    
+    offset += 8 + chunkSize + (chunkSize % 2);
+  }
+  
+  throw new Error(`WAV file has no audio data: ${wavPath}`);
+}
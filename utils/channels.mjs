@@ -0,0 +1,87 @@
+// 📺 Channel Registry - Per-channel configuration for multi-channel production
+// Each channel gets its own script inventory, rotation schedule, OAuth credentials, logs and YouTube quota;
+// footage, narration cache, the TTS pool and rendering stay shared
+
+import fs from 'fs-extra';
+import path from 'path';
+
+const CHANNELS_FILE = process.env.CHANNELS_FILE || 'channels.json';
+const CHANNELS_DIR = 'channels';
+
+// The single-channel layout used when no channels file is configured
+export const DEFAULT_CHANNEL = {
+  id: 'default',
+  name: 'Default channel',
+  isDefault: true,
+  scriptsFile: path.join(process.cwd(), 'data', 'bible_scripts.json'),
+  authDir: path.join(process.cwd(), 'auth'),
+  logsDir: path.join(process.cwd(), 'logs'),
+  dailyVideoCount: parseInt(process.env.DAILY_VIDEO_COUNT) || 2,
+  share: 1,
+  privacyStatus: process.env.PRIVACY_STATUS || 'public'
+};
+
+/**
+ * Fill a channel entry from channels.json with defaults.
+ * Paths default to channels/<id>/ ("default" keeps the single-channel data/, auth/ and logs/)
+ */
+export function resolveChannel(config) {
+  if (!config.id || !/^[a-z0-9_-]+$/i.test(config.id)) {
+    throw new Error(`Invalid channel id "${config.id}" (letters, digits, - and _ only)`);
+  }
+
+  if (config.id === DEFAULT_CHANNEL.id) {
+    return { ...DEFAULT_CHANNEL, ...config, isDefault: true };
+  }
+
+  const channelDir = path.join(process.cwd(), CHANNELS_DIR, config.id);
+  return {
+    name: config.id,
+    scriptsFile: path.join(channelDir, 'bible_scripts.json'),
+    authDir: path.join(channelDir, 'auth'),
+    logsDir: path.join(channelDir, 'logs'),
+    dailyVideoCount: DEFAULT_CHANNEL.dailyVideoCount,
+    share: 1,
+    privacyStatus: DEFAULT_CHANNEL.privacyStatus,
+    ...config,
+    isDefault: false
+  };
+}
+
+/**
+ * Channels from channels.json (or CHANNELS_FILE)
+ */
+export async function loadChannels(file = CHANNELS_FILE) {
+  if (!(await fs.pathExists(file))) {
+    throw new Error(`No channels configured: create ${file} (see channels.example.json)`);
+  }
+
+  const { channels = [] } = await fs.readJson(file);
+  const resolved = channels.filter(channel => channel.enabled !== false).map(resolveChannel);
+
+  const ids = new Set();
+  for (const channel of resolved) {
+    if (ids.has(channel.id)) {
+      throw new Error(`Duplicate channel id "${channel.id}" in ${file}`);
+    }
+    if (!(channel.share > 0)) {
+      throw new Error(`Channel "${channel.id}" needs a positive share`);
+    }
+    ids.add(channel.id);
+  }
+
+  if (resolved.length === 0) {
+    throw new Error(`No enabled channels in ${file}`);
+  }
+
+  return resolved;
+}
+
+/**
+ * Environment for Python helpers (script_manager.py) working on this channel's inventory
+ */
+export function channelEnv(channel) {
+  return channel
+    ? { SCRIPTS_FILE: channel.scriptsFile, DAILY_VIDEO_COUNT: String(channel.dailyVideoCount) }
+    : {};
+}
@@ -1,73 +1,42 @@
 // 📊 Daily Usage Tracker - Manages API quotas and stock video reuse
-// Tracks daily Pixabay usage and implements smart reuse strategy
+// Pixabay reuse decisions on top of the quota service and the stock library
 
-import fs from 'fs-extra';
 import path from 'path';
+import { listArtifacts, touchArtifact } from './artifactStore.mjs';
+import { canSpendQuota, spendQuota, getQuotaStatus, forecastVideos } from './quotaService.mjs';
+import { MetricsStore, increment } from './metricsStore.mjs';
 
-const USAGE_FILE = path.join(process.cwd(), 'logs', 'daily_usage.json');
-const DAILY_PIXABAY_LIMIT = 2; // First 2 videos per day use Pixabay
+const VIDEO_HISTORY_DAYS = 90;
 
-export class DailyUsageTracker {
-  constructor() {
-    this.usageData = null;
-  }
+// Local calendar day ("2025-06-01"), the day the statistics page shows
+const localDay = time => time.toLocaleDateString('en-CA');
 
-  async loadUsageData() {
-    try {
-      if (await fs.pathExists(USAGE_FILE)) {
-        this.usageData = await fs.readJson(USAGE_FILE);
-      } else {
-        this.usageData = {
-          date: new Date().toDateString(),
-          pixabayCount: 0,
-          videosGenerated: 0,
-          lastReset: new Date().toISOString()
-        };
-        await this.saveUsageData();
-      }
-    } catch (error) {
-      console.error('❌ Error loading usage data:', error);
-      this.resetUsageData();
-    }
-  }
+// One line per video whose footage was prepared; aggregates keep per-day counts
+const videoMetrics = new MetricsStore('videos_generated', {
+  initial: () => ({ days: {} }),
+  reduce: (stats, video) => {
+    increment(stats.days, localDay(new Date(video.timestamp)));
 
-  async saveUsageData() {
-    try {
-      await fs.ensureDir(path.dirname(USAGE_FILE));
-      await fs.writeJson(USAGE_FILE, this.usageData, { spaces: 2 });
-    } catch (error) {
-      console.error('❌ Error saving usage data:', error);
+    const days = Object.keys(stats.days).sort();
+    for (const expired of days.slice(0, Math.max(0, days.length - VIDEO_HISTORY_DAYS))) {
+      delete stats.days[expired];
     }
+    return stats;
   }
+});
 
-  resetUsageData() {
-    this.usageData = {
-      date: new Date().toDateString(),
-      pixabayCount: 0,
-      videosGenerated: 0,
-      lastReset: new Date().toISOString()
-    };
-  }
-
-  async checkAndResetDaily() {
-    const today = new Date().toDateString();
-    
-    if (!this.usageData || this.usageData.date !== today) {
-      console.log('📅 New day detected, resetting usage counters');
-      this.resetUsageData();
-      await this.saveUsageData();
-      return true;
-    }
-    return false;
-  }
+async function videosGeneratedToday() {
+  const { days } = await videoMetrics.getAggregates();
+  return days[localDay(new Date())] || 0;
+}
 
+// Quota counters live in the quota service (in memory, persisted periodically to logs/quota_state.json)
+export class DailyUsageTracker {
   async canUsePixabay() {
-    await this.loadUsageData();
-    await this.checkAndResetDaily();
+    const canUse = await canSpendQuota('pixabay_fresh', 1);
+    const { pixabay_fresh: pixabay } = await getQuotaStatus();
     
-    const canUse = this.usageData.pixabayCount < DAILY_PIXABAY_LIMIT;
-    
-    console.log(`📊 Pixabay usage: ${this.usageData.pixabayCount}/${DAILY_PIXABAY_LIMIT} today`);
+    console.log(`📊 Pixabay usage: ${pixabay.used}/${pixabay.limit} today`);
     
     if (canUse) {
       console.log('✅ Can use Pixabay API (fresh content)');
@@ -79,46 +48,42 @@ export class DailyUsageTracker {
   }
 
   async recordPixabayUsage() {
-    await this.loadUsageData();
-    this.usageData.pixabayCount++;
-    this.usageData.videosGenerated++;
-    await this.saveUsageData();
+    await spendQuota('pixabay_fresh', 1);
+    await videoMetrics.append({ source: 'pixabay' });
+    const { pixabay_fresh: pixabay } = await getQuotaStatus();
     
-    console.log(`📈 Recorded Pixabay usage: ${this.usageData.pixabayCount}/${DAILY_PIXABAY_LIMIT}`);
+    console.log(`📈 Recorded Pixabay usage: ${pixabay.used}/${pixabay.limit}`);
   }
 
   async recordVideoGeneration() {
-    await this.loadUsageData();
-    this.usageData.videosGenerated++;
-    await this.saveUsageData();
+    await videoMetrics.append({ source: 'reused' });
     
-    console.log(`🎬 Total videos generated today: ${this.usageData.videosGenerated}`);
+    console.log(`🎬 Total videos generated today: ${await videosGeneratedToday()}`);
   }
 
   async getUsageStats() {
-    await this.loadUsageData();
-    await this.checkAndResetDaily();
+    const quotas = await getQuotaStatus();
+    const pixabay = quotas.pixabay_fresh;
+    const forecast = await forecastVideos();
     
     return {
-      date: this.usageData.date,
-      pixabayUsed: this.usageData.pixabayCount,
-      pixabayLimit: DAILY_PIXABAY_LIMIT,
-      pixabayRemaining: Math.max(0, DAILY_PIXABAY_LIMIT - this.usageData.pixabayCount),
-      videosGenerated: this.usageData.videosGenerated,
-      canUsePixabay: this.usageData.pixabayCount < DAILY_PIXABAY_LIMIT
+      date: new Date().toDateString(),
+      pixabayUsed: pixabay.used,
+      pixabayLimit: pixabay.limit,
+      pixabayRemaining: pixabay.remaining,
+      canUsePixabay: pixabay.remaining > 0,
+      videosGenerated: await videosGeneratedToday(),
+      quotas,
+      videosPossible: Number.isFinite(forecast.videos) ? forecast.videos : null,
+      limitedBy: forecast.limitedBy
     };
   }
 }
 
 export async function getRandomExistingStockVideo() {
   try {
-    const outputDir = path.join(process.cwd(), 'output');
-    const files = await fs.readdir(outputDir);
-    
-    // Find all stock video files
-    const stockVideos = files.filter(file => 
-      file.startsWith('stock_') && file.endsWith('.mp4')
-    );
+    // Stock videos come from the artifact manifest instead of a directory scan
+    const stockVideos = await listArtifacts('stock');
     
     if (stockVideos.length === 0) {
       console.log('❌ No existing stock videos found');
@@ -127,12 +92,12 @@ export async function getRandomExistingStockVideo() {
     
     // Randomly select one
     const randomVideo = stockVideos[Math.floor(Math.random() * stockVideos.length)];
-    const videoPath = path.join(outputDir, randomVideo);
+    await touchArtifact(randomVideo.path);
     
-    console.log(`🎲 Selected random stock video: ${randomVideo}`);
+    console.log(`🎲 Selected random stock video: ${path.basename(randomVideo.path)}`);
     console.log(`📁 Available stock videos: ${stockVideos.length}`);
     
-    return videoPath;
+    return randomVideo.path;
     
   } catch (error) {
     console.error('❌ Error getting random stock video:', error);
@@ -142,17 +107,12 @@ export async function getRandomExistingStockVideo() {
 
 export async function listStockVideos() {
   try {
-    const outputDir = path.join(process.cwd(), 'output');
-    const files = await fs.readdir(outputDir);
-    
-    const stockVideos = files.filter(file => 
-      file.startsWith('stock_') && file.endsWith('.mp4')
-    );
+    const stockVideos = await listArtifacts('stock');
     
-    return stockVideos.map(file => ({
-      filename: file,
-      path: path.join(outputDir, file),
-      created: fs.statSync(path.join(outputDir, file)).birthtime
+    return stockVideos.map(video => ({
+      filename: path.basename(video.path),
+      path: video.path,
+      created: new Date(video.createdAt)
     })).sort((a, b) => b.created - a.created); // Newest first
     
   } catch (error) {
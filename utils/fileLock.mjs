@@ -0,0 +1,79 @@
+// 🔒 File Lock - Cross-process lock for read-modify-write of shared state files
+// The pipeline, the render-ahead producer and the GUI all update the same JSON files in logs/
+
+import fs from 'fs-extra';
+import path from 'path';
+
+const STALE_LOCK_MS = 30000; // A holder that crashed never releases; steal its lock after this
+const RETRY_MS = 50;
+const DEFAULT_TIMEOUT_MS = 15000;
+
+function sleep(ms) {
+  return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+/**
+ * Run fn while holding `<file>.lock` (created exclusively, removed afterwards)
+ */
+export async function withFileLock(file, fn, { timeoutMs = DEFAULT_TIMEOUT_MS } = {}) {
+  const lockPath = `${file}.lock`;
+  const deadline = Date.now() + timeoutMs;
+  await fs.ensureDir(path.dirname(lockPath));
+
+  while (true) {
+    try {
+      await fs.writeFile(lockPath, String(process.pid), { flag: 'wx' });
+      break;
+    } catch (error) {
+      if (error.code !== 'EEXIST') throw error;
+    }
+
+    try {
+      const stats = await fs.stat(lockPath);
+      if (Date.now() - stats.mtimeMs > STALE_LOCK_MS) {
+        console.log(`⚠️  Removing stale lock: ${lockPath}`);
+        await fs.remove(lockPath);
+        continue;
+      }
+    } catch (error) {
+      continue; // Released between our attempts
+    }
+
+    if (Date.now() > deadline) {
+      throw new Error(`Timed out waiting for lock on ${file}`);
+    }
+    await sleep(RETRY_MS);
+  }
+
+  try {
+    return await fn();
+  } finally {
+    await fs.remove(lockPath);
+  }
+}
+
+/**
+ * Synchronous variant for process exit hooks. Gives up waiting after timeoutMs and runs fn
+ * unlocked: on the way out, an unlocked write beats losing the update
+ */
+export function withFileLockSync(file, fn, { timeoutMs = 2000 } = {}) {
+  const lockPath = `${file}.lock`;
+  const deadline = Date.now() + timeoutMs;
+  let locked = false;
+
+  while (!locked) {
+    try {
+      fs.writeFileSync(lockPath, String(process.pid), { flag: 'wx' });
+      locked = true;
+    } catch (error) {
+      if (error.code !== 'EEXIST' || Date.now() > deadline) break;
+      Atomics.wait(new Int32Array(new SharedArrayBuffer(4)), 0, 0, RETRY_MS);
+    }
+  }
+
+  try {
+    return fn();
+  } finally {
+    if (locked) fs.rmSync(lockPath, { force: true });
+  }
+}
@@ -0,0 +1,214 @@
+// 📈 Metrics Store - Append-only JSONL logs with incrementally maintained aggregates
+// Each write appends one line (rotated by size); stats come from a compact side file, never from history
+
+import fs from 'fs-extra';
+import path from 'path';
+import { withFileLock } from './fileLock.mjs';
+
+const METRICS_DIR = path.join('logs', 'metrics');
+const DEFAULT_MAX_BYTES = (parseInt(process.env.METRICS_MAX_FILE_MB) || 5) * 1024 * 1024;
+const DEFAULT_MAX_FILES = parseInt(process.env.METRICS_MAX_FILES) || 5;
+
+/**
+ * One named metrics stream: logs/metrics/<name>.jsonl plus <name>.aggregates.json
+ */
+export class MetricsStore {
+  /**
+   * @param {string} name - Stream name (file prefix)
+   * @param {Object} options - initial(): fresh aggregates, reduce(aggregates, entry): fold one entry in,
+   *   legacyFile: old JSON-array log imported into the stream once
+   */
+  constructor(name, { initial, reduce, legacyFile = null, maxBytes = DEFAULT_MAX_BYTES, maxFiles = DEFAULT_MAX_FILES, rootDir = process.cwd() }) {
+    this.name = name;
+    this.initial = initial;
+    this.reduce = reduce;
+    this.maxBytes = maxBytes;
+    this.maxFiles = maxFiles;
+
+    this.dir = path.join(rootDir, METRICS_DIR);
+    this.logPath = path.join(this.dir, `${name}.jsonl`);
+    this.sidePath = path.join(this.dir, `${name}.aggregates.json`);
+    this.legacyPath = legacyFile ? path.join(rootDir, legacyFile) : null;
+
+    this.side = null;
+    this.queue = Promise.resolve();
+  }
+
+  rotatedPath(segment) {
+    return path.join(this.dir, `${this.name}.${segment}.jsonl`);
+  }
+
+  /**
+   * Side file as on disk, caught up with the log file. Call with the stream lock held:
+   * other processes (pipeline, render-ahead loop) append to the same file
+   */
+  async load() {
+    await fs.ensureDir(this.dir);
+
+    this.side = null;
+    try {
+      if (await fs.pathExists(this.sidePath)) {
+        this.side = await fs.readJson(this.sidePath);
+      }
+    } catch (error) {
+      console.log(`⚠️  Could not read ${this.name} aggregates, rebuilding:`, error.message);
+    }
+
+    const size = await this.currentSize();
+    let changed = true;
+
+    if (!this.side) {
+      this.side = { aggregates: this.initial(), segment: 0, bytes: 0 };
+      // Lost or first-time side file: fold in whatever history is still on disk
+      for (const file of await this.historyFiles()) {
+        await this.replay(file, 0);
+      }
+    } else if (size > this.side.bytes) {
+      // Lines appended after the last aggregate save (e.g. a crash in between) are folded in once
+      await this.replay(this.logPath, this.side.bytes);
+    } else if (size < this.side.bytes) {
+      // Rotated without a side save - the new file is all unseen
+      await this.replay(this.logPath, 0);
+    } else {
+      changed = false;
+    }
+    this.side.bytes = size;
+
+    if (await this.importLegacy()) changed = true;
+    if (changed) await this.saveSide();
+
+    return this.side;
+  }
+
+  /**
+   * Append the entries of the pre-stream JSON log once, then set it aside
+   */
+  async importLegacy() {
+    if (!this.legacyPath || !(await fs.pathExists(this.legacyPath))) return false;
+
+    let entries = [];
+    try {
+      entries = await fs.readJson(this.legacyPath);
+    } catch (error) {
+      console.log(`⚠️  Could not import ${this.legacyPath}:`, error.message);
+    }
+
+    if (Array.isArray(entries) && entries.length > 0) {
+      await fs.appendFile(this.logPath, entries.map(entry => JSON.stringify(entry) + '\n').join(''));
+      for (const entry of entries) {
+        this.side.aggregates = this.reduce(this.side.aggregates, entry);
+      }
+      this.side.bytes = await this.currentSize();
+      console.log(`📈 Imported ${entries.length} ${this.name} entries from ${path.basename(this.legacyPath)}`);
+    }
+
+    await fs.move(this.legacyPath, `${this.legacyPath}.migrated`, { overwrite: true });
+    return true;
+  }
+
+  async currentSize() {
+    try {
+      return (await fs.stat(this.logPath)).size;
+    } catch {
+      return 0;
+    }
+  }
+
+  /**
+   * Rotated segments oldest first, then the current file
+   */
+  async historyFiles() {
+    const files = [];
+    const pattern = new RegExp(`^${this.name}\\.(\\d+)\\.jsonl$`);
+
+    for (const file of await fs.readdir(this.dir)) {
+      const match = file.match(pattern);
+      if (match) files.push({ segment: parseInt(match[1]), file: path.join(this.dir, file) });
+    }
+
+    files.sort((a, b) => a.segment - b.segment);
+    if (files.length > 0) {
+      this.side.segment = files[files.length - 1].segment;
+    }
+
+    return [...files.map(f => f.file), this.logPath];
+  }
+
+  async replay(file, fromByte) {
+    if (!(await fs.pathExists(file))) return;
+
+    const content = (await fs.readFile(file)).subarray(fromByte).toString('utf8');
+    for (const line of content.split('\n')) {
+      if (!line.trim()) continue;
+      try {
+        this.side.aggregates = this.reduce(this.side.aggregates, JSON.parse(line));
+      } catch {
+        // Torn last line from a crash mid-write - skip it
+      }
+    }
+  }
+
+  /**
+   * Append one entry and fold it into the aggregates
+   */
+  append(entry) {
+    this.queue = this.queue
+      .then(() => this.write({ timestamp: new Date().toISOString(), ...entry }))
+      .catch(error => console.log(`⚠️  Could not record ${this.name} metric:`, error.message));
+    return this.queue;
+  }
+
+  async write(entry) {
+    await withFileLock(this.logPath, async () => {
+      await this.load();
+
+      await fs.appendFile(this.logPath, JSON.stringify(entry) + '\n');
+
+      this.side.bytes = await this.currentSize();
+      this.side.aggregates = this.reduce(this.side.aggregates, entry);
+
+      if (this.side.bytes >= this.maxBytes) {
+        await this.rotate();
+      }
+
+      await this.saveSide();
+    });
+  }
+
+  /**
+   * Move the current file to <name>.<n>.jsonl and drop segments beyond maxFiles.
+   * Aggregates keep covering the full history.
+   */
+  async rotate() {
+    this.side.segment += 1;
+    await fs.move(this.logPath, this.rotatedPath(this.side.segment), { overwrite: true });
+    this.side.bytes = 0;
+
+    const expired = this.side.segment - this.maxFiles;
+    if (expired > 0) {
+      await fs.remove(this.rotatedPath(expired));
+    }
+  }
+
+  async saveSide() {
+    const tempPath = `${this.sidePath}.tmp`;
+    await fs.writeJson(tempPath, this.side);
+    await fs.move(tempPath, this.sidePath, { overwrite: true });
+  }
+
+  /**
+   * Current aggregates - O(1), no history scan
+   */
+  async getAggregates() {
+    await this.queue;
+    return withFileLock(this.logPath, async () => (await this.load()).aggregates);
+  }
+}
+
+/**
+ * Add `amount` to counter[key]
+ */
+export function increment(counter, key, amount = 1) {
+  counter[key] = (counter[key] || 0) + amount;
+  return counter;
+}
@@ -0,0 +1,554 @@
+// 🎟️ Quota Service - Tracks every external API budget in memory
+// Token buckets for rate limits, rolling windows and calendar periods for daily/monthly quotas.
+// Shared through logs/quota_state.json: re-read when another process saved it, this process's
+// spends merged in as deltas periodically; forecasts how many videos the budgets allow and plans the day
+
+import fs from 'fs-extra';
+import path from 'path';
+import { MetricsStore, increment } from './metricsStore.mjs';
+import { withFileLock, withFileLockSync } from './fileLock.mjs';
+
+const QUOTA_STATE_FILE = path.join(process.cwd(), 'logs', 'quota_state.json');
+const LEGACY_USAGE_FILE = path.join(process.cwd(), 'logs', 'daily_usage.json');
+const FLUSH_INTERVAL_MS = parseInt(process.env.QUOTA_FLUSH_INTERVAL_MS) || 30000;
+
+/**
+ * Budget definitions. Kinds:
+ *  - bucket:  token bucket (capacity refilled evenly over refillMs) for short-term rate limits
+ *  - rolling: at most `limit` units in any `windowMs` span
+ *  - period:  `limit` units per calendar day/month, reset at midnight in `timeZone`
+ */
+export const BUDGETS = {
+  pixabay_requests: {
+    kind: 'bucket',
+    capacity: parseInt(process.env.PIXABAY_RATE_LIMIT) || 100, // Pixabay: 100 requests per 60s
+    refillMs: 60 * 1000,
+    label: 'Pixabay API requests'
+  },
+  pixabay_fresh: {
+    kind: 'period',
+    period: 'day',
+    limit: parseInt(process.env.DAILY_PIXABAY_LIMIT) || 2, // Fresh downloads per day, the rest reuse footage
+    label: 'Fresh Pixabay videos'
+  },
+  youtube_units: {
+    kind: 'period',
+    period: 'day',
+    limit: parseInt(process.env.YOUTUBE_DAILY_QUOTA) || 10000,
+    timeZone: 'America/Los_Angeles', // YouTube quota resets at midnight Pacific
+    label: 'YouTube Data API units'
+  },
+  hf_space: {
+    kind: 'rolling',
+    windowMs: 60 * 60 * 1000,
+    limit: parseInt(process.env.HF_SPACE_HOURLY_LIMIT) || 100,
+    label: 'HF Space requests'
+  },
+  elevenlabs_chars: {
+    kind: 'period',
+    period: 'month',
+    limit: parseInt(process.env.ELEVENLABS_MONTHLY_CHARS) || 30000,
+    label: 'ElevenLabs characters'
+  }
+};
+
+// Budgets each channel gets its own copy of (its own OAuth project); the rest are shared API keys
+const CHANNEL_BUDGETS = {
+  youtube_units: channel => channel.youtubeDailyQuota
+};
+
+// YouTube Data API unit cost per call
+export const YOUTUBE_COSTS = {
+  'videos.insert': 1600,
+  'thumbnails.set': 50,
+  'videos.update': 50,
+  'videos.list': 1
+};
+
+// Per-video estimates used by the forecast and the day planner
+const DEFAULT_SCRIPT_CHARS = parseInt(process.env.AVERAGE_SCRIPT_CHARS) || 700;
+const CHATTERBOX_MINUTES_PER_VIDEO = parseFloat(process.env.CHATTERBOX_MINUTES_PER_VIDEO) || 10;
+
+const USAGE_HISTORY_DAYS = 90;
+
+// Every spend is appended to the usage stream; aggregates keep per-day totals per budget
+const usageMetrics = new MetricsStore('api_usage', {
+  initial: () => ({ days: {} }),
+  reduce: (history, usage) => {
+    const day = usage.timestamp.slice(0, 10);
+    increment(history.days[day] || (history.days[day] = {}), usage.budget, usage.amount);
+
+    const days = Object.keys(history.days).sort();
+    for (const expired of days.slice(0, Math.max(0, days.length - USAGE_HISTORY_DAYS))) {
+      delete history.days[expired];
+    }
+    return history;
+  }
+});
+
+/**
+ * Calendar period key ("2025-06-01" or "2025-06") for a budget at the given time
+ */
+function periodKey(budget, time = new Date()) {
+  const day = time.toLocaleDateString('en-CA', budget.timeZone ? { timeZone: budget.timeZone } : undefined);
+  return budget.period === 'month' ? day.slice(0, 7) : day;
+}
+
+export class QuotaService {
+  constructor(budgets = BUDGETS) {
+    this.budgets = { ...budgets };
+    this.state = null;
+    this.loadedMtime = null;
+    this.pending = []; // Spends not yet merged into the state file: { name, amount, time }
+    this.flushTimer = null;
+    this.exitHookInstalled = false;
+  }
+
+  async stateMtime() {
+    try {
+      return (await fs.stat(QUOTA_STATE_FILE)).mtimeMs;
+    } catch (error) {
+      return null;
+    }
+  }
+
+  /**
+   * Budgets as saved by every process, plus this process's unflushed spends.
+   * Re-read only when another process (pipeline, render-ahead, GUI) has saved the file
+   */
+  async load() {
+    const mtime = await this.stateMtime();
+    if (this.state && mtime === this.loadedMtime) return this.state;
+
+    this.adoptState(await this.readState(), mtime);
+    this.installExitHook();
+    return this.state;
+  }
+
+  adoptState(state, mtime) {
+    for (const { name, amount, time } of this.pending) {
+      this.applySpend(state, name, amount, time);
+    }
+    this.state = state;
+    this.loadedMtime = mtime;
+  }
+
+  async readState() {
+    let state = {};
+    try {
+      if (await fs.pathExists(QUOTA_STATE_FILE)) {
+        state = (await fs.readJson(QUOTA_STATE_FILE)).budgets || {};
+      } else if (await fs.pathExists(LEGACY_USAGE_FILE)) {
+        // Carry today's Pixabay count over from the old usage tracker file
+        const legacy = await fs.readJson(LEGACY_USAGE_FILE);
+        if (legacy.date === new Date().toDateString()) {
+          state.pixabay_fresh = { period: periodKey(this.budgets.pixabay_fresh), used: legacy.pixabayCount || 0 };
+        }
+      }
+    } catch (error) {
+      console.log('⚠️  Could not load quota state, starting fresh:', error.message);
+    }
+    return state;
+  }
+
+  /**
+   * Budget name for a channel: "youtube_units:<id>" for per-channel budgets, registered on first use.
+   * The default channel (or none) uses the plain name.
+   */
+  budgetName(name, channel = null) {
+    if (!channel || channel.isDefault || !CHANNEL_BUDGETS[name]) return name;
+
+    const scoped = `${name}:${channel.id}`;
+    if (!this.budgets[scoped]) {
+      const base = BUDGETS[name];
+      this.budgets[scoped] = {
+        ...base,
+        limit: CHANNEL_BUDGETS[name](channel) || base.limit,
+        label: `${base.label} (${channel.name})`
+      };
+    }
+    return scoped;
+  }
+
+  /**
+   * Current state of one budget, with refill/expiry/period reset applied
+   */
+  current(name, now = Date.now(), state = this.state) {
+    const budget = this.budgets[name];
+    if (!budget) throw new Error(`Unknown quota budget: ${name}`);
+
+    let entry = state[name];
+
+    if (budget.kind === 'bucket') {
+      if (!entry) entry = { tokens: budget.capacity, updatedAt: now };
+      // Another process may have saved a later update than this spend
+      const refilled = Math.max(0, now - entry.updatedAt) * budget.capacity / budget.refillMs;
+      entry.tokens = Math.min(budget.capacity, entry.tokens + refilled);
+      entry.updatedAt = Math.max(entry.updatedAt, now);
+    } else if (budget.kind === 'rolling') {
+      if (!entry) entry = { events: [] };
+      entry.events = entry.events.filter(([time]) => now - time < budget.windowMs);
+    } else {
+      const key = periodKey(budget, new Date(now));
+      if (!entry || entry.period !== key) entry = { period: key, used: 0 };
+    }
+
+    state[name] = entry;
+    return entry;
+  }
+
+  /**
+   * Deduct a spend from a state object (ours, or the file's when merging)
+   */
+  applySpend(state, name, amount, now) {
+    const budget = this.budgets[name];
+    const entry = this.current(name, now, state);
+
+    if (budget.kind === 'bucket') {
+      entry.tokens -= amount;
+    } else if (budget.kind === 'rolling') {
+      entry.events.push([now, amount]);
+    } else {
+      entry.used += amount;
+    }
+  }
+
+  /**
+   * Units still available right now
+   */
+  remaining(name, now = Date.now()) {
+    const budget = this.budgets[name];
+    const entry = this.current(name, now);
+
+    if (budget.kind === 'bucket') return Math.floor(entry.tokens);
+    if (budget.kind === 'rolling') {
+      return budget.limit - entry.events.reduce((total, [, amount]) => total + amount, 0);
+    }
+    return budget.limit - entry.used;
+  }
+
+  async canSpend(name, amount = 1) {
+    await this.load();
+    return this.remaining(name) >= amount;
+  }
+
+  /**
+   * Record usage. Spending past the limit is allowed (the API call already happened) but logged.
+   */
+  async spend(name, amount = 1) {
+    await this.load();
+    const budget = this.budgets[name];
+    const now = Date.now();
+
+    this.applySpend(this.state, name, amount, now);
+    this.pending.push({ name, amount, time: now });
+
+    usageMetrics.append({ budget: name, amount });
+
+    const left = this.remaining(name, now);
+    if (left < 0) {
+      console.log(`⚠️  ${budget.label} over budget by ${-left}`);
+    }
+
+    this.markDirty();
+    return left;
+  }
+
+  /**
+   * Milliseconds until `amount` units are available (Infinity for calendar periods)
+   */
+  waitTime(name, amount = 1, now = Date.now()) {
+    const budget = this.budgets[name];
+    const missing = amount - this.remaining(name, now);
+    if (missing <= 0) return 0;
+
+    if (budget.kind === 'bucket') {
+      return Math.ceil(missing * budget.refillMs / budget.capacity);
+    }
+    if (budget.kind === 'rolling') {
+      // Oldest events expire first
+      let freed = 0;
+      for (const [time, eventAmount] of this.state[name].events) {
+        freed += eventAmount;
+        if (freed >= missing) return time + budget.windowMs - now;
+      }
+    }
+    return Infinity;
+  }
+
+  /**
+   * Wait until the units are available, then spend them. Throws if they cannot become available.
+   */
+  async acquire(name, amount = 1, { maxWaitMs = 5 * 60 * 1000 } = {}) {
+    await this.load();
+    const wait = this.waitTime(name, amount);
+
+    if (wait > maxWaitMs) {
+      throw new Error(`${this.budgets[name].label} exhausted`);
+    }
+    if (wait > 0) {
+      console.log(`⏳ Waiting ${Math.ceil(wait / 1000)}s for ${this.budgets[name].label} quota...`);
+      await new Promise(resolve => setTimeout(resolve, wait));
+    }
+
+    return this.spend(name, amount);
+  }
+
+  /**
+   * Snapshot of every budget
+   */
+  async getStatus() {
+    await this.load();
+    const status = {};
+
+    for (const [name, budget] of Object.entries(this.budgets)) {
+      const limit = budget.kind === 'bucket' ? budget.capacity : budget.limit;
+      const remaining = this.remaining(name);
+      status[name] = {
+        label: budget.label,
+        kind: budget.kind,
+        limit,
+        used: limit - remaining,
+        remaining: Math.max(0, remaining),
+        period: this.state[name]?.period || null
+      };
+    }
+
+    return status;
+  }
+
+  /**
+   * Videos the remaining budgets allow, per budget and overall
+   */
+  async forecast({
+    upload = true,
+    chatterboxAvailable = true,
+    scriptChars = DEFAULT_SCRIPT_CHARS,
+    uploadsWithThumbnail = false,
+    channel = null
+  } = {}) {
+    await this.load();
+
+    const youtubeBudget = this.budgetName('youtube_units', channel);
+    const uploadCost = YOUTUBE_COSTS['videos.insert'] + (uploadsWithThumbnail ? YOUTUBE_COSTS['thumbnails.set'] : 0);
+    const elevenLabsVideos = process.env.ELEVENLABS_API_KEY
+      ? Math.floor(Math.max(0, this.remaining('elevenlabs_chars')) / scriptChars)
+      : 0;
+    const freshVideos = Math.max(0, this.remaining('pixabay_fresh'));
+
+    // Footage never caps output: past the fresh-download policy the stock library is reused
+    const byBudget = {
+      [youtubeBudget]: upload ? Math.floor(Math.max(0, this.remaining(youtubeBudget)) / uploadCost) : Infinity,
+      // Chatterbox is local and unmetered; ElevenLabs only limits output without it
+      elevenlabs_chars: chatterboxAvailable ? Infinity : elevenLabsVideos
+    };
+
+    const videos = Math.min(...Object.values(byBudget));
+    const limitedBy = Number.isFinite(videos)
+      ? Object.keys(byBudget).find(name => byBudget[name] === videos)
+      : null;
+
+    return { videos, limitedBy, byBudget, freshVideos, elevenLabsVideos };
+  }
+
+  /**
+   * Plan up to `count` videos so the run never hits a quota wall partway through.
+   * Each planned video gets a footage source (fresh/reused) and a voice engine (chatterbox/elevenlabs).
+   * @param {number} count - Videos requested
+   * @param {Object} options - upload, stockAvailable, readyVideos, chatterboxAvailable, scriptChars, timeBudgetMinutes,
+   *   channel (its own YouTube budget), allowance ({ freshVideos, elevenLabsVideos }: this channel's fair share of shared budgets)
+   */
+  async planDay(count, options = {}) {
+    const {
+      readyVideos = 0,
+      chatterboxAvailable = true,
+      scriptChars = DEFAULT_SCRIPT_CHARS,
+      timeBudgetMinutes = parseFloat(process.env.RUN_TIME_BUDGET_MINUTES) || Infinity,
+      allowance = {}
+    } = options;
+
+    const forecast = await this.forecast(options);
+    const plannedCount = Math.min(count, forecast.videos);
+
+    let freshLeft = Math.min(forecast.freshVideos, allowance.freshVideos ?? Infinity);
+    let stockLeft = options.stockAvailable || 0;
+    let elevenLabsLeft = Math.min(forecast.elevenLabsVideos, allowance.elevenLabsVideos ?? Infinity);
+    let minutesLeft = timeBudgetMinutes;
+    const videos = [];
+
+    for (let i = 0; i < plannedCount; i++) {
+      // Pre-rendered videos only need an upload slot
+      if (i < readyVideos) {
+        videos.push({ number: i + 1, fromReadyQueue: true });
+        continue;
+      }
+
+      let footage = 'reused';
+      if (freshLeft > 0) {
+        footage = 'fresh';
+        freshLeft--;
+        stockLeft++;
+      } else if (stockLeft === 0) {
+        footage = 'fresh'; // Nothing to reuse - fresh download past the daily policy
+      }
+
+      // Chatterbox while it fits the run's time budget, ElevenLabs characters for the overflow
+      let voice = null;
+      if (chatterboxAvailable && minutesLeft >= CHATTERBOX_MINUTES_PER_VIDEO) {
+        voice = 'chatterbox';
+        minutesLeft -= CHATTERBOX_MINUTES_PER_VIDEO;
+      } else if (elevenLabsLeft > 0) {
+        voice = 'elevenlabs';
+        elevenLabsLeft--;
+      } else if (chatterboxAvailable) {
+        voice = 'chatterbox';
+      } else {
+        break;
+      }
+
+      videos.push({ number: i + 1, footage, voice, scriptChars });
+    }
+
+    return {
+      requested: count,
+      videos,
+      // Without a budget-limited forecast the only way to fall short is running out of voice engines
+      limitedBy: videos.length < count ? (forecast.limitedBy || 'elevenlabs_chars') : null,
+      forecast
+    };
+  }
+
+  markDirty() {
+    if (this.flushTimer) return;
+
+    this.flushTimer = setTimeout(() => {
+      this.flushTimer = null;
+      this.flush().catch(error => console.error('❌ Could not save quota state:', error.message));
+    }, FLUSH_INTERVAL_MS);
+    this.flushTimer.unref(); // Never keep the process alive just to persist counters
+  }
+
+  snapshot(state) {
+    return { budgets: state, lastUpdated: new Date().toISOString() };
+  }
+
+  /**
+   * Merge this process's spends into the state file as it is now, under the file lock
+   * (write-then-rename so a crash never leaves a torn file)
+   */
+  async flush() {
+    if (this.pending.length === 0) return;
+
+    await withFileLock(QUOTA_STATE_FILE, async () => {
+      const merged = this.pending.length;
+      const state = await this.readState();
+      for (const { name, amount, time } of this.pending.slice(0, merged)) {
+        this.applySpend(state, name, amount, time);
+      }
+
+      const tempFile = `${QUOTA_STATE_FILE}.tmp`;
+      await fs.ensureDir(path.dirname(QUOTA_STATE_FILE));
+      await fs.writeJson(tempFile, this.snapshot(state), { spaces: 2 });
+      const { mtimeMs } = await fs.stat(tempFile); // Kept by the rename
+      await fs.move(tempFile, QUOTA_STATE_FILE, { overwrite: true });
+
+      // Spends recorded while we were writing stay pending for the next flush
+      this.pending.splice(0, merged);
+      this.adoptState(state, mtimeMs);
+    });
+  }
+
+  installExitHook() {
+    if (this.exitHookInstalled) return;
+    this.exitHookInstalled = true;
+
+    // process.exit() skips pending timers, so write outstanding usage synchronously
+    process.on('exit', () => {
+      if (this.pending.length === 0) return;
+      try {
+        fs.ensureDirSync(path.dirname(QUOTA_STATE_FILE));
+        withFileLockSync(QUOTA_STATE_FILE, () => {
+          let state = {};
+          if (fs.existsSync(QUOTA_STATE_FILE)) {
+            state = JSON.parse(fs.readFileSync(QUOTA_STATE_FILE, 'utf8')).budgets || {};
+          }
+          for (const { name, amount, time } of this.pending) {
+            this.applySpend(state, name, amount, time);
+          }
+
+          const tempFile = `${QUOTA_STATE_FILE}.tmp`;
+          fs.writeJsonSync(tempFile, this.snapshot(state), { spaces: 2 });
+          fs.moveSync(tempFile, QUOTA_STATE_FILE, { overwrite: true });
+        });
+      } catch (error) {
+        console.error('❌ Could not save quota state:', error.message);
+      }
+    });
+  }
+}
+
+// Global instance for easy access
+const quotaService = new QuotaService();
+
+export async function canSpendQuota(name, amount) {
+  return quotaService.canSpend(name, amount);
+}
+
+export async function spendQuota(name, amount) {
+  return quotaService.spend(name, amount);
+}
+
+export async function acquireQuota(name, amount, options) {
+  return quotaService.acquire(name, amount, options);
+}
+
+export async function getQuotaStatus() {
+  return quotaService.getStatus();
+}
+
+export async function forecastVideos(options) {
+  return quotaService.forecast(options);
+}
+
+export async function planDay(count, options) {
+  return quotaService.planDay(count, options);
+}
+
+export async function flushQuotas() {
+  await usageMetrics.getAggregates(); // Wait for pending usage lines
+  return quotaService.flush();
+}
+
+/**
+ * Per-day usage totals per budget (last 90 days)
+ */
+export async function getUsageHistory() {
+  return (await usageMetrics.getAggregates()).days;
+}
+
+/**
+ * Budget a channel spends from ("youtube_units:<id>" for per-channel budgets)
+ */
+export function quotaBudgetName(name, channel) {
+  return quotaService.budgetName(name, channel);
+}
+
+export function logPlan(plan) {
+  const { forecast } = plan;
+  const show = value => Number.isFinite(value) ? value : '∞';
+  const label = name => quotaService.budgets[name].label;
+
+  console.log(`🎟️  Quota forecast: ${show(forecast.videos)} video(s) possible` +
+    (forecast.limitedBy ? ` (limited by ${label(forecast.limitedBy)})` : ''));
+  console.log(`📋 Day plan: ${plan.videos.length}/${plan.requested} video(s)`);
+
+  for (const video of plan.videos) {
+    console.log(video.fromReadyQueue
+      ? `   ${video.number}. pre-rendered (upload only)`
+      : `   ${video.number}. ${video.footage} footage, ${video.voice} voice`);
+  }
+
+  if (plan.limitedBy) {
+    console.log(`⚠️  Planned fewer videos than requested: ${label(plan.limitedBy)} would run out`);
+  }
+}